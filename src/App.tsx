@@ -1,13 +1,10 @@
+import { lazy } from 'react';
 import { Sparkles, Bot, DollarSign, Mail, Briefcase, LayoutDashboard, HelpCircle, PenLine, ScanLine, UserPlus, Calendar } from 'lucide-react';
 import { NavBar } from './components/ui/tubelight-navbar';
 import Hero from './components/Hero';
 import Features from './components/Features';
 import UseCases from './components/UseCases';
 import LeadCaptureStream from './components/LeadCaptureStream';
-import ProfileEnrichment from './components/ProfileResearch';
-import DashboardPreview from './components/DashboardPreview';
-import BookingsMeeting from './components/BookingsMeeting';
-import EmailDraftAnimation from './components/EmailDraftAnimation';
 import Agents from './components/Agents';
 import Pricing from './components/Pricing';
 import FAQ from './components/FAQ';
@@ -16,6 +13,13 @@ import ScrollProgress from './components/ScrollProgress';
 import ScrollToTop from './components/ScrollToTop';
 import SkipToContent from './components/SkipToContent';
 import CookieConsent from './components/CookieConsent';
+import LazySection from './components/LazySection';
+
+// Below-the-fold demos load as separate chunks when they near the viewport
+const ProfileEnrichment = lazy(() => import('./components/ProfileResearch'));
+const DashboardPreview = lazy(() => import('./components/DashboardPreview'));
+const BookingsMeeting = lazy(() => import('./components/BookingsMeeting'));
+const EmailDraftAnimation = lazy(() => import('./components/EmailDraftAnimation'));
 
 function App() {
   const navItems = [
@@ -47,17 +51,25 @@ function App() {
       <LeadCaptureStream />
 
       {/* 3. Profile Research */}
-      <ProfileEnrichment />
+      <LazySection id="profile-research" placeholderClassName="min-h-[2200px] md:min-h-[1500px] lg:min-h-[1150px]">
+        <ProfileEnrichment />
+      </LazySection>
 
       {/* 4. Dashboard Preview */}
-      <DashboardPreview />
+      <LazySection id="dashboard" placeholderClassName="min-h-[40rem] sm:min-h-[50rem] md:min-h-[70rem]">
+        <DashboardPreview />
+      </LazySection>
 
       {/* 5. Bookings & Meetings */}
-      <BookingsMeeting />
+      <LazySection id="bookings-meeting" placeholderClassName="min-h-[1100px] md:min-h-[1000px]">
+        <BookingsMeeting />
+      </LazySection>
 
       {/* 6. Email Draft Animation */}
       <section id="email-draft">
-        <EmailDraftAnimation />
+        <LazySection placeholderClassName="min-h-[1300px] lg:min-h-[900px]">
+          <EmailDraftAnimation />
+        </LazySection>
       </section>
 
       {/* 7. Features */}
@@ -1,5 +1,5 @@
 import { motion, AnimatePresence } from 'framer-motion';
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import {
   Calendar,
   Mic,
@@ -21,6 +21,7 @@ import {
   Pause,
   RotateCcw
 } from 'lucide-react';
+import { loop, useSectionActive, useStageTimers } from '../lib/animation-scheduler';
 
 type AnimationStage =
   | 'idle'
@@ -43,19 +44,17 @@ interface Meeting {
 }
 
 // Typing indicator component
-const TypingIndicator = () => (
+const TypingIndicator = ({ active = true }: { active?: boolean }) => (
   <div className="flex items-center gap-1">
     {[0, 1, 2].map((i) => (
       <motion.div
         key={i}
         className="w-1.5 h-1.5 bg-cyan-400 rounded-full"
-        animate={{ y: [0, -4, 0] }}
-        transition={{
+        {...loop(active, { y: [0, -4, 0] }, {
           duration: 0.6,
-          repeat: Infinity,
           delay: i * 0.15,
           ease: "easeInOut"
-        }}
+        })}
       />
     ))}
   </div>
@@ -115,6 +114,10 @@ export default function BookingsMeeting() {
   const [dashboardView, setDashboardView] = useState<'upcoming' | 'completed'>('upcoming');
   const [momSections, setMomSections] = useState<string[]>([]);
   const [uploadProgress, setUploadProgress] = useState(0);
+  const sectionRef = useRef<HTMLElement>(null);
+  const active = useSectionActive(sectionRef);
+  // Stage timers freeze while the section is offscreen or the tab is hidden
+  const timers = useStageTimers(active);
 
   const stages: AnimationStage[] = [
     'idle',
@@ -154,6 +157,7 @@ export default function BookingsMeeting() {
   ];
 
   const runAnimation = useCallback(() => {
+    timers.clearAll();
     setIsPlaying(true);
     setStage('idle');
     setTranscriptLines([]);
@@ -171,38 +175,38 @@ export default function BookingsMeeting() {
     ];
 
     timings.forEach(({ stage: s, delay }) => {
-      setTimeout(() => setStage(s), delay);
+      timers.setTimeout(() => setStage(s), delay);
     });
 
     // Transcript lines animation
     transcriptData.forEach((_, index) => {
-      setTimeout(() => {
+      timers.setTimeout(() => {
         setTranscriptLines(prev => [...prev, transcriptData[index].text]);
       }, 10000 + index * 1200);
     });
 
     // Upload progress animation
     for (let i = 0; i <= 100; i += 10) {
-      setTimeout(() => setUploadProgress(i), 19200 + i * 25);
+      timers.setTimeout(() => setUploadProgress(i), 19200 + i * 25);
     }
 
     // MoM sections animation
     momData.forEach((_, index) => {
-      setTimeout(() => {
+      timers.setTimeout(() => {
         setMomSections(prev => [...prev, momData[index]]);
       }, 20500 + index * 500);
     });
 
     // Reset after complete
-    setTimeout(() => {
+    timers.setTimeout(() => {
       setIsPlaying(false);
     }, 28000);
-  }, []);
+  }, [timers]);
 
   // No auto-start - animations are triggered on demand via play button
 
   return (
-    <section id="bookings-meeting" className="relative z-10 py-16 sm:py-20 md:py-24 px-4 bg-white/[0.02]">
+    <section ref={sectionRef} id="bookings-meeting" className="relative z-10 py-16 sm:py-20 md:py-24 px-4 bg-white/[0.02]">
       {/* Background ambient effects */}
       <div className="absolute inset-0 overflow-hidden pointer-events-none">
         <div className="absolute top-1/4 left-1/4 w-96 h-96 bg-cyan-500/10 rounded-full blur-3xl" />
@@ -290,14 +294,13 @@ export default function BookingsMeeting() {
                     className="flex flex-col items-center justify-center h-96"
                   >
                     <motion.div
-                      animate={{ scale: [1, 1.05, 1] }}
-                      transition={{ duration: 2, repeat: Infinity }}
+                      {...loop(active, { scale: [1, 1.05, 1] }, { duration: 2 })}
                       className="mb-4"
                     >
                       <Calendar className="w-16 h-16 text-cyan-400/50" />
                     </motion.div>
                     <p className="text-gray-500">Initializing Meeting Intelligence...</p>
-                    <TypingIndicator />
+                    <TypingIndicator active={active} />
                   </motion.div>
                 )}
 
@@ -593,7 +596,7 @@ export default function BookingsMeeting() {
                       className="flex items-center justify-center gap-1 h-12 mb-4"
                     >
                       {Array.from({ length: 24 }).map((_, i) => (
-                        <WaveformBar key={i} index={i} isActive={true} />
+                        <WaveformBar key={i} index={i} isActive={active} />
                       ))}
                     </motion.div>
 
@@ -627,7 +630,7 @@ export default function BookingsMeeting() {
                           <div className="w-8 h-8 rounded-full bg-gray-700 flex items-center justify-center">
                             <Mic className="w-4 h-4 text-gray-400" />
                           </div>
-                          <TypingIndicator />
+                          <TypingIndicator active={active} />
                         </div>
                       )}
                     </div>
@@ -734,8 +737,7 @@ export default function BookingsMeeting() {
                         <p className="text-sm text-gray-400">Generating Minutes of Meeting</p>
                       </div>
                       <motion.div
-                        animate={{ rotate: 360 }}
-                        transition={{ duration: 2, repeat: Infinity, ease: "linear" }}
+                        {...loop(active, { rotate: [0, 360] }, { duration: 2, ease: "linear" })}
                       >
                         <Sparkles className="w-4 h-4 text-amber-400" />
                       </motion.div>
@@ -764,7 +766,7 @@ export default function BookingsMeeting() {
                         ))}
                         {momSections.length < momData.length && (
                           <div className="flex items-center gap-2">
-                            <TypingIndicator />
+                            <TypingIndicator active={active} />
                             <span className="text-gray-500 text-xs">Generating...</span>
                           </div>
                         )}
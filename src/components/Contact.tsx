@@ -100,6 +100,7 @@ export default function Contact() {
               initial={{ opacity: 0, scale: 0.9 }}
               animate={{ opacity: 1, scale: 1 }}
               className="text-center py-12"
+              data-testid="contact-success"
             >
               <CheckCircle size={64} className="mx-auto mb-4 text-green-400" />
               <h3 className="text-2xl font-bold mb-2 text-white">Message Sent!</h3>
@@ -108,7 +109,7 @@ export default function Contact() {
               </p>
             </motion.div>
           ) : (
-            <form onSubmit={handleSubmit} className="space-y-6">
+            <form onSubmit={handleSubmit} className="space-y-6" data-testid="contact-form">
               <div>
                 <label htmlFor="name" className="block text-sm font-medium text-gray-300 mb-2">
                   Name <span className="text-red-400">*</span>
@@ -116,6 +117,7 @@ export default function Contact() {
                 <input
                   type="text"
                   id="name"
+                  data-testid="contact-name"
                   value={formData.name}
                   onChange={(e) => handleChange('name', e.target.value)}
                   className={`w-full glass px-4 py-3 rounded-lg text-white placeholder-gray-400 focus:outline-none focus:ring-2 transition-all ${errors.name
@@ -141,6 +143,7 @@ export default function Contact() {
                 <input
                   type="email"
                   id="email"
+                  data-testid="contact-email"
                   value={formData.email}
                   onChange={(e) => handleChange('email', e.target.value)}
                   className={`w-full glass px-4 py-3 rounded-lg text-white placeholder-gray-400 focus:outline-none focus:ring-2 transition-all ${errors.email
@@ -166,6 +169,7 @@ export default function Contact() {
                 <input
                   type="text"
                   id="company"
+                  data-testid="contact-company"
                   value={formData.company}
                   onChange={(e) => handleChange('company', e.target.value)}
                   className="w-full glass px-4 py-3 rounded-lg text-white placeholder-gray-400 focus:outline-none focus:ring-2 focus:ring-amber-500 focus:shadow-lg focus:shadow-amber-500/20 transition-all"
@@ -180,6 +184,7 @@ export default function Contact() {
                 </label>
                 <textarea
                   id="message"
+                  data-testid="contact-message"
                   value={formData.message}
                   onChange={(e) => handleChange('message', e.target.value)}
                   rows={5}
@@ -202,6 +207,7 @@ export default function Contact() {
               <motion.button
                 type="submit"
                 disabled={formState === 'sending'}
+                data-testid="contact-submit"
                 whileHover={formState === 'idle' ? { scale: 1.02 } : {}}
                 whileTap={formState === 'idle' ? { scale: 0.98 } : {}}
                 className={`w-full py-4 rounded-lg font-bold text-lg transition-all flex items-center justify-center gap-2 ${formState === 'sending'
@@ -65,6 +65,7 @@ const CookieConsent = () => {
             exit={{ y: 100, opacity: 0 }}
             transition={{ type: 'spring', damping: 25, stiffness: 300 }}
             className="fixed bottom-0 left-0 right-0 z-[101] p-4 md:p-6"
+            data-testid="cookie-banner"
           >
             <div className="max-w-7xl mx-auto">
               <div className="glass-strong rounded-2xl border border-white/20 shadow-2xl p-6 md:p-8">
@@ -96,6 +97,7 @@ const CookieConsent = () => {
                   <div className="flex flex-col sm:flex-row gap-3 w-full md:w-auto">
                     <button
                       onClick={() => setShowPreferences(true)}
+                      data-testid="cookie-preferences"
                       className="glass px-6 py-3 rounded-xl border border-white/10 hover:glass-strong transition-all flex items-center justify-center gap-2 text-sm font-medium"
                     >
                       <Settings size={18} />
@@ -104,6 +106,7 @@ const CookieConsent = () => {
                     
                     <button
                       onClick={handleDecline}
+                      data-testid="cookie-decline"
                       className="glass px-6 py-3 rounded-xl border border-white/10 hover:glass-strong transition-all flex items-center justify-center gap-2 text-sm font-medium text-gray-300 hover:text-white"
                     >
                       <X size={18} />
@@ -112,6 +115,7 @@ const CookieConsent = () => {
                     
                     <button
                       onClick={handleAcceptAll}
+                      data-testid="cookie-accept-all"
                       className="bg-gradient-to-r from-leadq-amber to-leadq-cyan px-6 py-3 rounded-xl font-semibold text-white shadow-glow hover:shadow-glow-strong transition-all flex items-center justify-center gap-2 text-sm"
                     >
                       <CheckCircle size={18} />
@@ -132,6 +136,7 @@ const CookieConsent = () => {
                 exit={{ scale: 0.9, opacity: 0, y: 20 }}
                 transition={{ type: 'spring', damping: 25, stiffness: 300 }}
                 className="fixed top-1/2 left-1/2 -translate-x-1/2 -translate-y-1/2 z-[102] w-[90%] max-w-2xl"
+                data-testid="cookie-preferences-modal"
               >
                 <PreferencesModal
                   onSave={handleSavePreferences}
@@ -187,6 +192,7 @@ const PreferencesModal = ({ onSave, onClose }: PreferencesModalProps) => {
         <h3 className="text-2xl font-display font-bold">Cookie Preferences</h3>
         <button
           onClick={onClose}
+          data-testid="cookie-preferences-close"
           className="glass p-2 rounded-lg hover:glass-strong transition-all"
           aria-label="Close preferences"
         >
@@ -213,6 +219,7 @@ const PreferencesModal = ({ onSave, onClose }: PreferencesModalProps) => {
                   checked={cookie.enabled}
                   onChange={(e) => !cookie.locked && cookie.onChange?.(e.target.checked)}
                   disabled={cookie.locked}
+                  data-testid={`cookie-toggle-${cookie.id}`}
                   className="sr-only peer"
                 />
                 <div className={`w-11 h-6 bg-gray-700 peer-focus:outline-none peer-focus:ring-2 peer-focus:ring-leadq-amber/50 rounded-full peer peer-checked:after:translate-x-full rtl:peer-checked:after:-translate-x-full peer-checked:after:border-white after:content-[''] after:absolute after:top-[2px] after:start-[2px] after:bg-white after:rounded-full after:h-5 after:w-5 after:transition-all peer-checked:bg-gradient-to-r peer-checked:from-leadq-amber peer-checked:to-leadq-cyan ${cookie.locked ? 'opacity-50 cursor-not-allowed' : ''}`}></div>
@@ -225,12 +232,14 @@ const PreferencesModal = ({ onSave, onClose }: PreferencesModalProps) => {
       <div className="flex gap-3">
         <button
           onClick={onClose}
+          data-testid="cookie-preferences-cancel"
           className="flex-1 glass px-6 py-3 rounded-xl border border-white/10 hover:glass-strong transition-all font-medium"
         >
           Cancel
         </button>
         <button
           onClick={() => onSave({ analytics, marketing })}
+          data-testid="cookie-preferences-save"
           className="flex-1 bg-gradient-to-r from-leadq-amber to-leadq-cyan px-6 py-3 rounded-xl font-semibold text-white shadow-glow hover:shadow-glow-strong transition-all"
         >
           Save Preferences
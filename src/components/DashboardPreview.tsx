@@ -1,12 +1,15 @@
-import { useState } from 'react';
+import { useState, useRef } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { LayoutDashboard, Target, Bot, BarChart3, TrendingUp, Calendar, DollarSign, Zap, CheckCircle, Clock, PieChart, ArrowUpRight } from 'lucide-react';
 import { ContainerScroll } from './ui/container-scroll';
+import { loop, useSectionActive } from '../lib/animation-scheduler';
 
 type ViewType = 'Leads' | 'Deals' | 'Agents' | 'Analytics';
 
 export default function DashboardPreview() {
   const [activeView, setActiveView] = useState<ViewType>('Leads');
+  const sectionRef = useRef<HTMLElement>(null);
+  const active = useSectionActive(sectionRef);
 
   // Leads View Data
   const leadsStats = [
@@ -167,7 +170,7 @@ export default function DashboardPreview() {
   const areaPath = `M 0,${svgHeight} L ${points.map(p => `${p.x},${p.y}`).join(' L ')} L ${svgWidth},${svgHeight} Z`;
 
   return (
-    <section id="dashboard" className="relative z-10">
+    <section ref={sectionRef} id="dashboard" className="relative z-10">
       <div className="max-w-7xl mx-auto">
         <ContainerScroll titleComponent={titleComponent}>
           <div className="glass-strong rounded-2xl overflow-hidden border-2 border-white/20 h-full">
@@ -220,15 +223,13 @@ export default function DashboardPreview() {
                       </div>
                       <div className="flex items-center gap-2 glass px-3 py-2 rounded-lg border border-leadq-amber/30">
                         <motion.div
-                          animate={{
+                          {...loop(active, {
                             scale: [1, 1.3, 1],
                             opacity: [0.8, 1, 0.8],
-                          }}
-                          transition={{
+                          }, {
                             duration: 2,
-                            repeat: Infinity,
                             ease: 'easeInOut',
-                          }}
+                          })}
                           className="w-2 h-2 rounded-full bg-leadq-amber glow-amber"
                         />
                         <span className="text-sm font-medium text-white">AI Agent Active</span>
@@ -342,13 +343,11 @@ export default function DashboardPreview() {
                                     }}
                                   >
                                     <motion.div
-                                      animate={{ opacity: [0.3, 0.6, 0.3] }}
-                                      transition={{
+                                      {...loop(active, { opacity: [0.3, 0.6, 0.3] }, {
                                         duration: 2,
-                                        repeat: Infinity,
                                         ease: 'easeInOut',
                                         delay: index * 0.2,
-                                      }}
+                                      })}
                                       className="absolute inset-0 bg-gradient-to-t from-transparent to-white/30"
                                     />
                                   </motion.div>
@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import {
   Play,
@@ -27,6 +27,7 @@ import {
   PenLine,
   Target,
 } from 'lucide-react';
+import { loop, useSectionActive, useStageTimers } from '../lib/animation-scheduler';
 import type { Transition, Variants } from 'framer-motion';
 
 // ==================== TYPES ====================
@@ -128,40 +129,36 @@ const slideInRight: Variants = {
 // ==================== SUB-COMPONENTS ====================
 
 // Typing indicator dots
-const TypingIndicator = () => (
+const TypingIndicator = ({ active = true }: { active?: boolean }) => (
   <div className="flex items-center gap-1 px-3 py-2">
     {[0, 1, 2].map((i) => (
       <motion.div
         key={i}
         className="w-2 h-2 rounded-full bg-amber-500"
-        animate={{
+        {...loop(active, {
           y: [0, -6, 0],
           opacity: [0.5, 1, 0.5],
-        }}
-        transition={{
+        }, {
           duration: 0.6,
-          repeat: Infinity,
           delay: i * 0.15,
           ease: 'easeInOut',
-        }}
+        })}
       />
     ))}
   </div>
 );
 
 // AI sparkle animation
-const AISparkle = () => (
+const AISparkle = ({ active = true }: { active?: boolean }) => (
   <motion.div
     className="absolute -top-1 -right-1"
-    animate={{
+    {...loop(active, {
       rotate: [0, 180, 360],
       scale: [1, 1.2, 1],
-    }}
-    transition={{
+    }, {
       duration: 3,
-      repeat: Infinity,
       ease: 'linear',
-    }}
+    })}
   >
     <Sparkles className="w-4 h-4 text-amber-400" />
   </motion.div>
@@ -180,10 +177,12 @@ const StageIndicator = ({
   stage,
   currentStage,
   stages,
+  active,
 }: {
   stage: WorkflowStage;
   currentStage: WorkflowStage;
   stages: { id: WorkflowStage; label: string; icon: React.ReactNode }[];
+  active: boolean;
 }) => {
   const stageIndex = stages.findIndex((s) => s.id === stage);
   const currentIndex = stages.findIndex((s) => s.id === currentStage);
@@ -198,8 +197,8 @@ const StageIndicator = ({
             ? 'bg-green-500/20 text-green-400 border border-green-500/30'
             : 'bg-white/5 text-gray-500 border border-white/10'
         }`}
-      animate={isActive ? { scale: [1, 1.02, 1] } : {}}
-      transition={{ duration: 1.5, repeat: Infinity }}
+      animate={isActive && active ? { scale: [1, 1.02, 1] } : {}}
+      transition={{ duration: 1.5, repeat: isActive && active ? Infinity : 0 }}
     >
       {stages.find((s) => s.id === stage)?.icon}
       <span className="hidden sm:inline">{stages.find((s) => s.id === stage)?.label}</span>
@@ -311,6 +310,10 @@ export default function EmailDraftAnimation() {
   const [emailSubject, setEmailSubject] = useState('');
   const [showAttachments, setShowAttachments] = useState(false);
   const [sendProgress, setSendProgress] = useState(0);
+  const sectionRef = useRef<HTMLElement>(null);
+  const active = useSectionActive(sectionRef);
+  // Stage timers freeze while the section is offscreen or the tab is hidden
+  const timers = useStageTimers(active);
 
   const stages: { id: WorkflowStage; label: string; icon: React.ReactNode }[] = [
     { id: 'contact', label: 'Contact', icon: <User className="w-3.5 h-3.5" /> },
@@ -333,48 +336,48 @@ export default function EmailDraftAnimation() {
   useEffect(() => {
     if (!isPlaying) return;
 
-    let timeouts: NodeJS.Timeout[] = [];
+    const timeouts: number[] = [];
 
     const runSequence = async () => {
       // Stage 1: Contact Retrieval (2s)
       setCurrentStage('contact');
 
-      timeouts.push(setTimeout(() => {
+      timeouts.push(timers.setTimeout(() => {
         setEmailSubject(`Following Up: ${MOCK_CONTACT.meetingType} Discussion`);
       }, 1000));
 
       // Stage 2: AI Generation (4s)
-      timeouts.push(setTimeout(() => {
+      timeouts.push(timers.setTimeout(() => {
         setCurrentStage('generation');
       }, 2000));
 
       // Reveal sections one by one
       MOCK_EMAIL_SECTIONS.forEach((section, index) => {
-        timeouts.push(setTimeout(() => {
+        timeouts.push(timers.setTimeout(() => {
           setVisibleSections((prev) => [...prev, section.id]);
         }, 2500 + index * 700));
       });
 
       // Stage 3: Customization (3s)
-      timeouts.push(setTimeout(() => {
+      timeouts.push(timers.setTimeout(() => {
         setCurrentStage('customization');
         setShowAttachments(true);
       }, 6500));
 
       // Stage 4: Delivery (2s)
-      timeouts.push(setTimeout(() => {
+      timeouts.push(timers.setTimeout(() => {
         setCurrentStage('delivery');
       }, 9500));
 
       // Animate send progress
       for (let i = 1; i <= 10; i++) {
-        timeouts.push(setTimeout(() => {
+        timeouts.push(timers.setTimeout(() => {
           setSendProgress(i * 10);
         }, 9500 + i * 150));
       }
 
       // Complete
-      timeouts.push(setTimeout(() => {
+      timeouts.push(timers.setTimeout(() => {
         setCurrentStage('complete');
         setIsPlaying(false);
       }, 11500));
@@ -383,21 +386,21 @@ export default function EmailDraftAnimation() {
     runSequence();
 
     return () => {
-      timeouts.forEach(clearTimeout);
+      timeouts.forEach(timers.clearTimeout);
     };
-  }, [isPlaying]);
+  }, [isPlaying, timers]);
 
   const handlePlayPause = () => {
     if (currentStage === 'complete' || currentStage === 'idle') {
       resetAnimation();
-      setTimeout(() => setIsPlaying(true), 100);
+      timers.setTimeout(() => setIsPlaying(true), 100);
     } else {
       setIsPlaying(!isPlaying);
     }
   };
 
   return (
-    <section className="py-16 sm:py-20 px-4 relative overflow-hidden">
+    <section ref={sectionRef} className="py-16 sm:py-20 px-4 relative overflow-hidden">
       {/* Background glow */}
       <div className="absolute inset-0 pointer-events-none">
         <div className="absolute top-1/2 left-1/2 -translate-x-1/2 -translate-y-1/2 w-[600px] h-[600px] bg-amber-500/10 rounded-full blur-[120px]" />
@@ -473,6 +476,7 @@ export default function EmailDraftAnimation() {
                 stage={stage.id}
                 currentStage={currentStage}
                 stages={stages}
+                active={active}
               />
             ))}
           </div>
@@ -531,8 +535,7 @@ export default function EmailDraftAnimation() {
                   >
                     <motion.div
                       className="w-20 h-20 rounded-2xl bg-gradient-to-br from-amber-500/20 to-cyan-500/20 border border-white/10 flex items-center justify-center mb-4"
-                      animate={{ rotate: [0, 5, -5, 0] }}
-                      transition={{ duration: 4, repeat: Infinity, ease: 'easeInOut' }}
+                      {...loop(active, { rotate: [0, 5, -5, 0] }, { duration: 4, ease: 'easeInOut' })}
                     >
                       <Mail className="w-10 h-10 text-amber-400" />
                     </motion.div>
@@ -635,7 +638,7 @@ export default function EmailDraftAnimation() {
                                   </p>
                                 </div>
                                 {index === visibleSections.length - 1 &&
-                                  currentStage === 'generation' && <AISparkle />}
+                                  currentStage === 'generation' && <AISparkle active={active} />}
                               </div>
                             </motion.div>
                           ))}
@@ -652,7 +655,7 @@ export default function EmailDraftAnimation() {
                               <span className="text-xs text-amber-400">
                                 Generating next section
                               </span>
-                              <TypingIndicator />
+                              <TypingIndicator active={active} />
                             </motion.div>
                           )}
                       </div>
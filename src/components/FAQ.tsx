@@ -93,6 +93,7 @@ export default function FAQ() {
                 className="w-full text-left px-6 py-5 flex items-center justify-between gap-4 focus:outline-none focus:ring-2 focus:ring-leadq-amber focus:ring-inset rounded-xl transition-all"
                 aria-expanded={openIndex === index}
                 aria-controls={`faq-answer-${index}`}
+                data-testid={`faq-question-${index}`}
               >
                 <span className="font-semibold text-white text-lg pr-4">
                   {faq.question}
@@ -110,6 +111,7 @@ export default function FAQ() {
                 {openIndex === index && (
                   <motion.div
                     id={`faq-answer-${index}`}
+                    data-testid={`faq-answer-${index}`}
                     initial={{ height: 0, opacity: 0 }}
                     animate={{
                       height: 'auto',
@@ -0,0 +1,64 @@
+import { Suspense, useEffect, useRef, useState } from 'react';
+import type { ReactNode } from 'react';
+
+// Fetch a section's chunk about a screen before it scrolls into view
+const LOAD_MARGIN = '800px 0px';
+
+// Fired once a lazy section replaces its placeholder, so scroll observers
+// keyed on section ids can re-attach to the mounted element
+export const SECTION_MOUNTED_EVENT = 'leadq:section-mounted';
+
+interface LazySectionProps {
+  // Section id, kept on the placeholder so hash links resolve before mount
+  id?: string;
+  // min-h-* classes approximating the mounted section's height
+  placeholderClassName: string;
+  children: ReactNode;
+}
+
+function Mounted({ children }: { children: ReactNode }) {
+  useEffect(() => {
+    window.dispatchEvent(new Event(SECTION_MOUNTED_EVENT));
+  }, []);
+
+  return <>{children}</>;
+}
+
+export default function LazySection({ id, placeholderClassName, children }: LazySectionProps) {
+  const placeholderRef = useRef<HTMLElement>(null);
+  const [isNear, setIsNear] = useState(false);
+
+  useEffect(() => {
+    if (isNear) return;
+    const element = placeholderRef.current;
+    if (!element || typeof IntersectionObserver === 'undefined') {
+      setIsNear(true);
+      return;
+    }
+    const observer = new IntersectionObserver(
+      ([entry]) => {
+        if (entry.isIntersecting) setIsNear(true);
+      },
+      { rootMargin: LOAD_MARGIN }
+    );
+    observer.observe(element);
+    return () => observer.disconnect();
+  }, [isNear]);
+
+  const placeholder = (
+    <section
+      ref={placeholderRef}
+      id={id}
+      aria-busy="true"
+      className={`relative z-10 ${placeholderClassName}`}
+    />
+  );
+
+  if (!isNear) return placeholder;
+
+  return (
+    <Suspense fallback={placeholder}>
+      <Mounted>{children}</Mounted>
+    </Suspense>
+  );
+}
@@ -108,6 +108,7 @@ const Pricing = () => {
             <motion.div
               key={index}
               variants={cardVariants}
+              data-testid={`pricing-plan-${plan.name.toLowerCase()}`}
               whileHover={{ y: plan.popular ? 0 : -8, transition: { duration: 0.3 } }}
               className={`glass rounded-2xl p-6 sm:p-8 relative ${plan.popular ? 'md:scale-105 border-2 border-leadq-amber/30 shadow-[0_0_30px_rgba(245,158,11,0.2)]' : ''
                 }`}
@@ -139,6 +140,7 @@ const Pricing = () => {
               </ul>
 
               <button
+                data-testid={`pricing-cta-${plan.name.toLowerCase()}`}
                 className={`w-full py-3 px-6 rounded-lg font-medium transition-all duration-300 focus:outline-none focus:ring-2 focus:ring-leadq-amber focus:ring-offset-2 focus:ring-offset-leadq-bg active:scale-95 ${plan.ctaStyle}`}
               >
                 {plan.cta}
@@ -160,6 +162,7 @@ const Pricing = () => {
             </p>
             <a
               href="#"
+              data-testid="pricing-details"
               className="text-leadq-amber hover:text-leadq-amber/80 text-sm font-medium inline-flex items-center gap-1 transition-colors"
             >
               View detailed pricing →
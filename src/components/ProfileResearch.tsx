@@ -1,5 +1,5 @@
 import { motion, AnimatePresence, Variants } from 'framer-motion';
-import { useState, useEffect, useCallback, useRef } from 'react';
+import { useState, useCallback, useRef } from 'react';
 import {
   UserPlus,
   Sparkles,
@@ -19,6 +19,7 @@ import {
   Filter,
   FileText,
 } from 'lucide-react';
+import { loop, useSectionActive, useStageTimers } from '../lib/animation-scheduler';
 
 // Types
 type Stage = 'idle' | 'input' | 'researching' | 'disambiguating' | 'enriching' | 'complete';
@@ -112,14 +113,13 @@ const slideInRight: Variants = {
 };
 
 // Sub-components
-const TypingIndicator = () => (
+const TypingIndicator = ({ active = true }: { active?: boolean }) => (
   <div className="flex items-center gap-1 px-3 py-2">
     {[0, 1, 2].map((i) => (
       <motion.div
         key={i}
         className="w-2 h-2 rounded-full bg-amber-500"
-        animate={{ y: [0, -6, 0], opacity: [0.5, 1, 0.5] }}
-        transition={{ duration: 0.6, repeat: Infinity, delay: i * 0.15 }}
+        {...loop(active, { y: [0, -6, 0], opacity: [0.5, 1, 0.5] }, { duration: 0.6, delay: i * 0.15 })}
       />
     ))}
   </div>
@@ -143,17 +143,16 @@ const PulsingDot = ({ color = 'bg-green-500' }: { color?: string }) => (
   </span>
 );
 
-const ScanLine = () => (
+const ScanLine = ({ active = true }: { active?: boolean }) => (
   <motion.div
     className="absolute left-0 right-0 h-0.5 bg-gradient-to-r from-transparent via-amber-400 to-transparent"
     initial={{ top: 0, opacity: 0 }}
-    animate={{ top: ['0%', '100%', '0%'], opacity: [0, 1, 0] }}
-    transition={{ duration: 2, repeat: Infinity, ease: 'linear' }}
+    {...loop(active, { top: ['0%', '100%', '0%'], opacity: [0, 1, 0] }, { duration: 2, ease: 'linear' })}
   />
 );
 
 // Stage indicator component
-const StageIndicator = ({ currentStage, stages }: { currentStage: Stage; stages: { key: Stage; label: string; icon: React.ElementType }[] }) => {
+const StageIndicator = ({ currentStage, stages, active }: { currentStage: Stage; stages: { key: Stage; label: string; icon: React.ElementType }[]; active: boolean }) => {
   const currentIndex = stages.findIndex(s => s.key === currentStage);
 
   return (
@@ -172,8 +171,8 @@ const StageIndicator = ({ currentStage, stages }: { currentStage: Stage; stages:
                   ? 'bg-green-500/20 text-green-400 border border-green-500/40'
                   : 'bg-white/5 text-gray-500 border border-white/10'
                 }`}
-              animate={isActive ? { scale: [1, 1.05, 1] } : {}}
-              transition={{ duration: 1, repeat: isActive ? Infinity : 0 }}
+              animate={isActive && active ? { scale: [1, 1.05, 1] } : {}}
+              transition={{ duration: 1, repeat: isActive && active ? Infinity : 0 }}
             >
               <Icon className="w-3 h-3" />
               <span className="hidden sm:inline">{stage.label}</span>
@@ -189,12 +188,12 @@ const StageIndicator = ({ currentStage, stages }: { currentStage: Stage; stages:
 };
 
 // Input card component
-const InputCard = ({ profile, isActive }: { profile: ProfileData; isActive: boolean }) => (
+const InputCard = ({ profile, isActive, active }: { profile: ProfileData; isActive: boolean; active: boolean }) => (
   <motion.div
     variants={slideInLeft}
     className="glass rounded-xl p-4 md:p-6 relative overflow-hidden"
   >
-    {isActive && <ScanLine />}
+    {isActive && <ScanLine active={active} />}
     <div className="flex items-center gap-2 mb-4">
       <div className="flex gap-1.5">
         <div className="w-2.5 h-2.5 rounded-full bg-red-500/80" />
@@ -230,7 +229,7 @@ const InputCard = ({ profile, isActive }: { profile: ProfileData; isActive: bool
 );
 
 // Research visualization component
-const ResearchVisualization = ({ stage, activeSources }: { stage: Stage; activeSources: string[] }) => {
+const ResearchVisualization = ({ stage, activeSources, active }: { stage: Stage; activeSources: string[]; active: boolean }) => {
   const isResearching = stage === 'researching';
 
   return (
@@ -266,8 +265,8 @@ const ResearchVisualization = ({ stage, activeSources }: { stage: Stage; activeS
               key={source.id}
               className={`flex flex-col items-center gap-2 p-3 rounded-lg transition-all ${isActive ? 'bg-white/10' : 'bg-white/5'
                 }`}
-              animate={isActive ? { scale: [1, 1.1, 1] } : {}}
-              transition={{ duration: 0.5, repeat: isActive ? Infinity : 0, delay: index * 0.2 }}
+              animate={isActive && active ? { scale: [1, 1.1, 1] } : {}}
+              transition={{ duration: 0.5, repeat: isActive && active ? Infinity : 0, delay: index * 0.2 }}
             >
               <div className={`relative ${isActive ? 'opacity-100' : 'opacity-40'}`}>
                 <Icon className={`w-6 h-6 ${source.color}`} />
@@ -291,7 +290,7 @@ const ResearchVisualization = ({ stage, activeSources }: { stage: Stage; activeS
 
       {isResearching && (
         <div className="mt-4">
-          <TypingIndicator />
+          <TypingIndicator active={active} />
         </div>
       )}
     </motion.div>
@@ -512,7 +511,10 @@ export default function ProfileResearch() {
 
   const [visibleFields, setVisibleFields] = useState<string[]>([]);
   const [isAnimating, setIsAnimating] = useState(false);
-  const timeoutsRef = useRef<NodeJS.Timeout[]>([]);
+  const sectionRef = useRef<HTMLElement>(null);
+  const active = useSectionActive(sectionRef);
+  // Stage timers freeze while the section is offscreen or the tab is hidden
+  const timers = useStageTimers(active);
 
   const stages: { key: Stage; label: string; icon: React.ElementType }[] = [
     { key: 'input', label: 'Input', icon: UserPlus },
@@ -522,18 +524,13 @@ export default function ProfileResearch() {
     { key: 'complete', label: 'Complete', icon: CheckCircle2 },
   ];
 
-  const clearTimeouts = useCallback(() => {
-    timeoutsRef.current.forEach(clearTimeout);
-    timeoutsRef.current = [];
-  }, []);
-
   const resetAnimation = useCallback(() => {
-    clearTimeouts();
+    timers.clearAll();
     setStage('idle');
     setActiveSources([]);
     setVisibleFields([]);
     setIsAnimating(false);
-  }, [clearTimeouts]);
+  }, [timers]);
 
   const startAnimation = useCallback(() => {
     if (isAnimating) return;
@@ -541,48 +538,37 @@ export default function ProfileResearch() {
     resetAnimation();
     setIsAnimating(true);
 
-    const timeouts: NodeJS.Timeout[] = [];
-
     // Stage 1: Input (0ms)
-    timeouts.push(setTimeout(() => setStage('input'), 500));
+    timers.setTimeout(() => setStage('input'), 500);
 
     // Stage 2: Researching (1500ms)
-    timeouts.push(setTimeout(() => setStage('researching'), 1500));
-    timeouts.push(setTimeout(() => setActiveSources(['linkedin']), 2000));
-    timeouts.push(setTimeout(() => setActiveSources(['linkedin', 'company']), 2500));
-    timeouts.push(setTimeout(() => setActiveSources(['linkedin', 'company', 'web']), 3000));
+    timers.setTimeout(() => setStage('researching'), 1500);
+    timers.setTimeout(() => setActiveSources(['linkedin']), 2000);
+    timers.setTimeout(() => setActiveSources(['linkedin', 'company']), 2500);
+    timers.setTimeout(() => setActiveSources(['linkedin', 'company', 'web']), 3000);
 
     // Stage 3: Disambiguating (4000ms)
-    timeouts.push(setTimeout(() => setStage('disambiguating'), 4000));
+    timers.setTimeout(() => setStage('disambiguating'), 4000);
 
     // Stage 4: Enriching (6500ms)
-    timeouts.push(setTimeout(() => setStage('enriching'), 6500));
+    timers.setTimeout(() => setStage('enriching'), 6500);
 
     const fieldOrder = ['identity', 'role', 'email', 'location', 'linkedin', 'experience', 'summary'];
     fieldOrder.forEach((field, index) => {
-      timeouts.push(setTimeout(() => {
+      timers.setTimeout(() => {
         setVisibleFields(prev => [...prev, field]);
-      }, 7000 + index * 400));
+      }, 7000 + index * 400);
     });
 
     // Stage 5: Complete (10000ms)
-    timeouts.push(setTimeout(() => {
+    timers.setTimeout(() => {
       setStage('complete');
       setIsAnimating(false);
-    }, 10000));
-
-    timeoutsRef.current = timeouts;
-  }, [isAnimating, resetAnimation]);
-
-  // Cleanup timeouts on unmount
-  useEffect(() => {
-    return () => {
-      clearTimeouts();
-    };
-  }, [clearTimeouts]);
+    }, 10000);
+  }, [isAnimating, resetAnimation, timers]);
 
   return (
-    <section id="profile-research" className="relative z-10 py-16 md:py-24 px-4 overflow-hidden">
+    <section ref={sectionRef} id="profile-research" className="relative z-10 py-16 md:py-24 px-4 overflow-hidden">
       {/* Background effects */}
       <div className="absolute inset-0 pointer-events-none">
         <div className="absolute top-1/2 left-1/2 -translate-x-1/2 -translate-y-1/2 w-[600px] h-[600px] bg-amber-500/10 rounded-full blur-[120px]" />
@@ -628,7 +614,7 @@ export default function ProfileResearch() {
             <motion.button
               onClick={() => {
                 resetAnimation();
-                setTimeout(startAnimation, 100);
+                timers.setTimeout(startAnimation, 100);
               }}
               className="inline-flex items-center gap-2 px-4 py-2 rounded-lg bg-white/5 border border-white/10 text-sm text-gray-400 hover:text-white hover:bg-white/10 transition-all disabled:opacity-50 disabled:cursor-not-allowed"
               whileHover={{ scale: isAnimating ? 1 : 1.05 }}
@@ -642,7 +628,7 @@ export default function ProfileResearch() {
         </motion.div>
 
         {/* Stage indicator */}
-        <StageIndicator currentStage={stage} stages={stages} />
+        <StageIndicator currentStage={stage} stages={stages} active={active} />
 
         {/* Main animation container */}
         <motion.div
@@ -654,7 +640,7 @@ export default function ProfileResearch() {
         >
           {/* Left: Input Card */}
           <div className="lg:col-span-1">
-            <InputCard profile={INPUT_PROFILE} isActive={stage === 'input' || stage === 'researching'} />
+            <InputCard profile={INPUT_PROFILE} isActive={stage === 'input' || stage === 'researching'} active={active} />
           </div>
 
           {/* Center: Research Visualization (always visible) */}
@@ -662,6 +648,7 @@ export default function ProfileResearch() {
             <ResearchVisualization
               stage={stage}
               activeSources={activeSources}
+              active={active}
             />
           </div>
 
@@ -1,9 +1,14 @@
 import { motion } from 'framer-motion';
+import { useRef } from 'react';
 import { Radio, Search, Mail, Calendar, CheckCircle } from 'lucide-react';
+import { loop, useSectionActive } from '../lib/animation-scheduler';
 
 export default function Workflow() {
+  const sectionRef = useRef<HTMLElement>(null);
+  const active = useSectionActive(sectionRef);
+
   return (
-    <section id="workflow" className="relative z-10 py-24 px-4 bg-white/[0.05]">
+    <section ref={sectionRef} id="workflow" className="relative z-10 py-24 px-4 bg-white/[0.05]">
       <div className="max-w-7xl mx-auto">
         <div className="text-center mb-20">
           <motion.h2
@@ -44,15 +49,13 @@ export default function Workflow() {
                       <Radio className="text-white" size={36} strokeWidth={2} />
                     </div>
                     <motion.div
-                      animate={{
+                      {...loop(active, {
                         scale: [1, 1.3, 1],
                         opacity: [0.8, 0, 0.8],
-                      }}
-                      transition={{
+                      }, {
                         duration: 2,
-                        repeat: Infinity,
                         ease: 'easeOut',
-                      }}
+                      })}
                       className="absolute inset-0 rounded-full bg-amber-500"
                     />
                   </div>
@@ -65,14 +68,12 @@ export default function Workflow() {
                 </p>
                 <div className="flex justify-center mt-6">
                   <motion.div
-                    animate={{
+                    {...loop(active, {
                       scale: [1, 1.2, 1],
-                    }}
-                    transition={{
+                    }, {
                       duration: 1.5,
-                      repeat: Infinity,
                       ease: 'easeInOut',
-                    }}
+                    })}
                     className="w-3 h-3 rounded-full bg-amber-500 shadow-[0_0_10px_rgba(217,119,6,0.8)]"
                   />
                 </div>
@@ -93,13 +94,11 @@ export default function Workflow() {
                 }}
               />
               <motion.div
-                animate={{ x: [0, 96, 96], opacity: [0, 1, 0] }}
-                transition={{
+                {...loop(active, { x: [0, 96, 96], opacity: [0, 1, 0] }, {
                   duration: 2,
-                  repeat: Infinity,
                   ease: 'easeInOut',
                   times: [0, 0.5, 1],
-                }}
+                })}
                 className="absolute top-1/2 -mt-1.5 left-0 w-3 h-3 rounded-full bg-amber-500 shadow-[0_0_10px_rgba(217,119,6,0.8)]"
               />
             </div>
@@ -121,12 +120,10 @@ export default function Workflow() {
                   {/* Central Hub */}
                   <div className="absolute top-1/2 left-1/2 -translate-x-1/2 -translate-y-1/2 z-10">
                     <motion.div
-                      animate={{ rotate: 360 }}
-                      transition={{
+                      {...loop(active, { rotate: [0, 360] }, {
                         duration: 20,
-                        repeat: Infinity,
                         ease: 'linear',
-                      }}
+                      })}
                       className="w-16 h-16 rounded-full bg-gradient-to-br from-black to-amber-600 shadow-[0_0_20px_rgba(217,119,6,0.6)] flex items-center justify-center"
                     >
                       <div className="w-12 h-12 rounded-full bg-leadq-bg/90 backdrop-blur-sm" />
@@ -198,19 +195,17 @@ export default function Workflow() {
                           }}
                         >
                           <motion.div
-                            animate={{
+                            {...loop(active, {
                               scale: [1, 1.1, 1],
                               boxShadow: [
                                 `0 0 0 0 rgba(${isAmber ? '245, 158, 11' : '217, 119, 6'}, 0.4)`,
                                 `0 0 0 8px rgba(${isAmber ? '245, 158, 11' : '217, 119, 6'}, 0)`,
                                 `0 0 0 0 rgba(${isAmber ? '245, 158, 11' : '217, 119, 6'}, 0)`,
                               ],
-                            }}
-                            transition={{
+                            }, {
                               duration: 2,
-                              repeat: Infinity,
                               delay: delay + 1,
-                            }}
+                            })}
                             className={isAmber
                               ? "w-12 h-12 rounded-full bg-amber-500/20 backdrop-blur-sm border border-amber-500/40 flex items-center justify-center"
                               : "w-12 h-12 rounded-full bg-amber-600/20 backdrop-blur-sm border border-amber-600/40 flex items-center justify-center"
@@ -249,14 +244,12 @@ export default function Workflow() {
                 }}
               />
               <motion.div
-                animate={{ x: [0, 96, 96], opacity: [0, 1, 0] }}
-                transition={{
+                {...loop(active, { x: [0, 96, 96], opacity: [0, 1, 0] }, {
                   duration: 2,
-                  repeat: Infinity,
                   ease: 'easeInOut',
                   times: [0, 0.5, 1],
                   delay: 0.5,
-                }}
+                })}
                 className="absolute top-1/2 -mt-1.5 left-0 w-3 h-3 rounded-full bg-amber-600 shadow-[0_0_10px_rgba(217,119,6,0.8)]"
               />
             </div>
@@ -329,15 +322,13 @@ export default function Workflow() {
                       <Radio className="text-white" size={28} strokeWidth={2} />
                     </div>
                     <motion.div
-                      animate={{
+                      {...loop(active, {
                         scale: [1, 1.3, 1],
                         opacity: [0.8, 0, 0.8],
-                      }}
-                      transition={{
+                      }, {
                         duration: 2,
-                        repeat: Infinity,
                         ease: 'easeOut',
-                      }}
+                      })}
                       className="absolute inset-0 rounded-full bg-amber-500"
                     />
                   </div>
@@ -84,16 +84,19 @@ export const MenuLink = ({
     icon: Icon,
     children,
     onClick,
+    testId,
 }: {
     href: string;
     icon?: LucideIcon;
     children: React.ReactNode;
     onClick?: () => void;
+    testId?: string;
 }) => {
     return (
         <a
             href={href}
             onClick={onClick}
+            data-testid={testId}
             className="flex items-center gap-3 px-3 py-2.5 rounded-lg text-gray-300 hover:text-white hover:bg-white/10 transition-all group"
         >
             {Icon && (
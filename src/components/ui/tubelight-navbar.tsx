@@ -3,6 +3,7 @@ import { motion, AnimatePresence } from "framer-motion"
 import { LucideIcon, Sparkles, Briefcase, ScanLine, UserPlus, LayoutDashboard, Calendar, PenLine, Bot, DollarSign, HelpCircle, Mail, Menu as MenuIcon, X } from "lucide-react"
 import { cn } from "@/lib/utils"
 import { Menu, MenuItem, MenuLink, MenuSection } from "./navbar-menu"
+import { SECTION_MOUNTED_EVENT } from "../LazySection"
 
 interface NavItem {
   name: string
@@ -82,13 +83,22 @@ export function NavBar({ items, className }: NavBarProps) {
       }
     )
 
-    items.forEach((item) => {
-      const sectionId = item.url.replace("#", "")
-      const section = document.getElementById(sectionId)
-      if (section) observer.observe(section)
-    })
+    const observeSections = () => {
+      items.forEach((item) => {
+        const sectionId = item.url.replace("#", "")
+        const section = document.getElementById(sectionId)
+        if (section) observer.observe(section)
+      })
+    }
+
+    observeSections()
+    // Lazy sections swap their placeholder for the mounted element
+    window.addEventListener(SECTION_MOUNTED_EVENT, observeSections)
 
-    return () => observer.disconnect()
+    return () => {
+      window.removeEventListener(SECTION_MOUNTED_EVENT, observeSections)
+      observer.disconnect()
+    }
   }, [items])
 
   // Handle link click
@@ -152,11 +162,11 @@ export function NavBar({ items, className }: NavBarProps) {
     >
       {/* Login & Sign Up Buttons - Desktop */}
       <div className="hidden lg:flex items-center gap-3 fixed top-4 right-4 z-[101]">
-        <button className="px-5 py-2.5 text-sm text-white underline underline-offset-4 hover:text-leadq-amber transition-colors rounded-lg focus:outline-none focus:ring-2 focus:ring-leadq-amber focus:ring-offset-2 focus:ring-offset-black whitespace-nowrap">
+        <button data-testid="nav-login" className="px-5 py-2.5 text-sm text-white underline underline-offset-4 hover:text-leadq-amber transition-colors rounded-lg focus:outline-none focus:ring-2 focus:ring-leadq-amber focus:ring-offset-2 focus:ring-offset-black whitespace-nowrap">
           Login
         </button>
 
-        <button className="px-6 py-2.5 text-sm rounded-lg font-semibold bg-gradient-to-r from-black to-amber-600 text-white shadow-[0_0_20px_rgba(217,119,6,0.5)] hover:shadow-[0_0_30px_rgba(217,119,6,0.7)] hover:scale-105 transition-all duration-300 focus:outline-none focus:ring-2 focus:ring-amber-500 focus:ring-offset-2 focus:ring-offset-black whitespace-nowrap">
+        <button data-testid="nav-signup" className="px-6 py-2.5 text-sm rounded-lg font-semibold bg-gradient-to-r from-black to-amber-600 text-white shadow-[0_0_20px_rgba(217,119,6,0.5)] hover:shadow-[0_0_30px_rgba(217,119,6,0.7)] hover:scale-105 transition-all duration-300 focus:outline-none focus:ring-2 focus:ring-amber-500 focus:ring-offset-2 focus:ring-offset-black whitespace-nowrap">
           Sign Up
         </button>
       </div>
@@ -170,6 +180,7 @@ export function NavBar({ items, className }: NavBarProps) {
         </a>
         <button
           onClick={toggleMobileMenu}
+          data-testid="nav-mobile-toggle"
           className="p-3 text-white hover:text-leadq-amber transition-colors rounded-lg focus:outline-none focus:ring-2 focus:ring-leadq-amber"
           aria-label={mobileMenuOpen ? 'Close menu' : 'Open menu'}
           aria-expanded={mobileMenuOpen}
@@ -187,6 +198,7 @@ export function NavBar({ items, className }: NavBarProps) {
             exit={{ opacity: 0, y: -20 }}
             transition={{ duration: 0.2 }}
             className="md:hidden fixed inset-0 top-16 bg-black/95 backdrop-blur-xl z-[99] overflow-y-auto"
+            data-testid="nav-mobile-menu"
           >
             <div className="px-4 py-6 space-y-2">
               {/* All Navigation Items */}
@@ -198,6 +210,7 @@ export function NavBar({ items, className }: NavBarProps) {
                     key={item.name}
                     href={item.url}
                     onClick={() => handleLinkClick(item.name)}
+                    data-testid={`nav-mobile-link-${item.url.slice(1)}`}
                     className={cn(
                       "flex items-center gap-4 px-4 py-4 rounded-xl transition-all",
                       isActive
@@ -238,7 +251,7 @@ export function NavBar({ items, className }: NavBarProps) {
 
 
             {/* Solutions Dropdown */}
-            <div className="relative">
+            <div className="relative" data-testid="nav-solutions">
               <MenuItem
                 setActive={setActiveMenu}
                 active={activeMenu}
@@ -255,6 +268,7 @@ export function NavBar({ items, className }: NavBarProps) {
                           href={item.url}
                           icon={item.icon}
                           onClick={() => handleLinkClick(item.name)}
+                          testId={`nav-menu-link-${item.url.slice(1)}`}
                         >
                           {item.name}
                         </MenuLink>
@@ -269,6 +283,7 @@ export function NavBar({ items, className }: NavBarProps) {
                           href={item.url}
                           icon={item.icon}
                           onClick={() => handleLinkClick(item.name)}
+                          testId={`nav-menu-link-${item.url.slice(1)}`}
                         >
                           {item.name}
                         </MenuLink>
@@ -290,6 +305,7 @@ export function NavBar({ items, className }: NavBarProps) {
                   key={item.name}
                   href={item.url}
                   onClick={() => handleLinkClick(item.name)}
+                  data-testid={`nav-link-${item.url.slice(1)}`}
                   className={cn(
                     "relative cursor-pointer text-sm font-semibold px-4 py-2 rounded-full transition-colors whitespace-nowrap flex items-center gap-2",
                     "text-gray-300 hover:text-leadq-amber",
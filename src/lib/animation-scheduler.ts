@@ -0,0 +1,127 @@
+import { useCallback, useEffect, useMemo, useRef, useState } from 'react';
+import type { RefObject } from 'react';
+import type { TargetAndTransition, Transition } from 'framer-motion';
+
+// Sections start animating slightly before they scroll into view
+const DEFAULT_ROOT_MARGIN = '200px 0px';
+
+/**
+ * True while the section behind `ref` is near the viewport and the tab is
+ * visible. Demos gate their stage timers and infinite loops on it so they
+ * cost nothing while offscreen.
+ */
+export function useSectionActive(ref: RefObject<Element>, rootMargin = DEFAULT_ROOT_MARGIN): boolean {
+  const [intersecting, setIntersecting] = useState(false);
+  const [tabVisible, setTabVisible] = useState(() => typeof document === 'undefined' || !document.hidden);
+
+  useEffect(() => {
+    const element = ref.current;
+    if (!element || typeof IntersectionObserver === 'undefined') {
+      setIntersecting(true);
+      return;
+    }
+    const observer = new IntersectionObserver(
+      ([entry]) => setIntersecting(entry.isIntersecting),
+      { rootMargin, threshold: 0 }
+    );
+    observer.observe(element);
+    return () => observer.disconnect();
+  }, [ref, rootMargin]);
+
+  useEffect(() => {
+    const onVisibilityChange = () => setTabVisible(!document.hidden);
+    document.addEventListener('visibilitychange', onVisibilityChange);
+    return () => document.removeEventListener('visibilitychange', onVisibilityChange);
+  }, []);
+
+  return intersecting && tabVisible;
+}
+
+/**
+ * Props for an infinite `motion` loop that only runs while `active`.
+ * Paused loops rest on their first keyframe and restart from it.
+ */
+export function loop(active: boolean, keyframes: TargetAndTransition, transition: Transition = {}) {
+  if (active) {
+    return { animate: keyframes, transition: { ...transition, repeat: Infinity } };
+  }
+  const rest = Object.fromEntries(
+    Object.entries(keyframes).map(([key, frames]) => [key, Array.isArray(frames) ? frames[0] : frames])
+  );
+  return { animate: rest as TargetAndTransition, transition: { duration: 0 } };
+}
+
+interface StageTimer {
+  callback: () => void;
+  remaining: number;
+  startedAt: number;
+  handle?: ReturnType<typeof setTimeout>;
+}
+
+export interface StageTimers {
+  setTimeout: (callback: () => void, delay: number) => number;
+  clearTimeout: (id: number) => void;
+  clearAll: () => void;
+}
+
+/**
+ * `setTimeout` for stage machines that freezes while `active` is false:
+ * pending timers are cleared on pause and re-armed with their remaining
+ * delay on resume, so a demo continues from the stage it was in. All
+ * timers are cleared on unmount.
+ */
+export function useStageTimers(active: boolean): StageTimers {
+  const timers = useRef(new Map<number, StageTimer>());
+  const nextId = useRef(1);
+  const activeRef = useRef(active);
+
+  const arm = useCallback((id: number, timer: StageTimer) => {
+    timer.startedAt = performance.now();
+    timer.handle = setTimeout(() => {
+      timers.current.delete(id);
+      timer.callback();
+    }, timer.remaining);
+  }, []);
+
+  const schedule = useCallback((callback: () => void, delay: number) => {
+    const id = nextId.current++;
+    const timer: StageTimer = { callback, remaining: delay, startedAt: 0 };
+    timers.current.set(id, timer);
+    if (activeRef.current) arm(id, timer);
+    return id;
+  }, [arm]);
+
+  const cancel = useCallback((id: number) => {
+    const timer = timers.current.get(id);
+    if (timer?.handle !== undefined) clearTimeout(timer.handle);
+    timers.current.delete(id);
+  }, []);
+
+  const cancelAll = useCallback(() => {
+    timers.current.forEach((timer) => {
+      if (timer.handle !== undefined) clearTimeout(timer.handle);
+    });
+    timers.current.clear();
+  }, []);
+
+  useEffect(() => {
+    activeRef.current = active;
+    const now = performance.now();
+    timers.current.forEach((timer, id) => {
+      if (active && timer.handle === undefined) {
+        arm(id, timer);
+      } else if (!active && timer.handle !== undefined) {
+        clearTimeout(timer.handle);
+        timer.handle = undefined;
+        timer.remaining = Math.max(0, timer.remaining - (now - timer.startedAt));
+      }
+    });
+  }, [active, arm]);
+
+  useEffect(() => cancelAll, [cancelAll]);
+
+  return useMemo(
+    () => ({ setTimeout: schedule, clearTimeout: cancel, clearAll: cancelAll }),
+    [schedule, cancel, cancelAll]
+  );
+}
@@ -0,0 +1,50 @@
+"""Execution harness for the generated TestSprite TC scripts.
+
+Run from the ``testsprite_tests`` directory::
+
+    python -m harness run              # whole suite against a served dist/
+    python -m harness run --base-url http://localhost:5173  # dev server
+    python -m harness run -j 8 TC017   # selected tests, 8 at a time
+    python -m harness run -w 16 -j 2   # 16 processes, each with a browser
+    python -m harness run --fixed-waits  # keep the recorded 3 s sleeps
+    python -m harness run --trace TC004  # CDP trace + hot-frame summary
+    python -m harness run --timers TC008     # live/orphaned timer census
+    python -m harness run --real-time TC008  # demo timeouts on the wall clock
+    python -m harness run --live TC012   # content tests in the browser, not a snapshot
+    python -m harness run --recorded-steps TC020  # keep the recorded repeats
+    python -m harness compile -v         # optimised scripts + seconds saved
+    python -m harness run --no-flake-policy  # no retries, nothing quarantined
+    python -m harness flaky --top 10     # tests ranked by CI minutes wasted
+    python -m harness run --coverage     # rebuild the test-impact map
+    python -m harness run --changed-since origin/main  # impacted tests only
+    python -m harness impact HEAD~1      # what --changed-since would select
+    python -m harness vitals -n 10       # Core Web Vitals, dev + preview
+    python -m harness startup -n 5       # first-load JS, compile, LCP
+    python -m harness fonts-build        # subsetted WOFF2 into public/fonts
+    python -m harness fonts              # font bytes, swap CLS, LCP
+    python -m harness idle --window 10   # idle CPU ms/s per nav section
+    python -m harness idle --offscreen   # CPU demos still use once scrolled away
+    python -m harness leaks -n 20        # heap/DOM growth per demo replay
+    python -m harness matrix             # TC001/TC003 at every viewport at once
+    python -m harness engines -j 6       # Chromium, Firefox, WebKit side by side
+    python -m harness visual             # section screenshots vs baselines
+    python -m harness visual --update    # accept the current look
+    python -m harness bundle             # dist/ sizes vs budgets and last build
+    python -m harness serve --port 4173  # the build the harness tests
+    python -m harness selectors          # stale data-testid mappings
+"""
+
+from .config import HarnessConfig
+from .loader import LoadedScript, TestCase, discover
+from .report import TestResult
+from .runner import SuiteRunner, run_suite
+
+__all__ = [
+    "HarnessConfig",
+    "LoadedScript",
+    "SuiteRunner",
+    "TestCase",
+    "TestResult",
+    "discover",
+    "run_suite",
+]
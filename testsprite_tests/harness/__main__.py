@@ -0,0 +1,574 @@
+"""Command line entry point: ``python -m harness <command>``."""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import asyncio
+import subprocess
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import replace
+from pathlib import Path
+from typing import Iterator
+
+from .config import HarnessConfig
+from .loader import discover, parse_script, rewrite_navigations
+from . import bundle, compiler, engines, flaky, fonts, idle, impact, leaks, matrix, selectors, server, startup, visual, vitals
+from .history import History
+from .netcache import CacheStats
+from .report import format_summary, write_json, write_junit
+from .runner import run_suite
+from .sharding import run_sharded
+from .steps import LatencyHistogram
+from .tracing import TraceSummary
+
+
+def _add_common_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--base-url", help="landing page URL (default: build dist/ and serve it)")
+    parser.add_argument("--no-build", action="store_true", help="serve dist/ as it is, even if stale")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument("--output-dir", type=str, help="where reports are written")
+
+
+def _add_bench_options(parser: argparse.ArgumentParser, min_change: float = 0.05) -> None:
+    parser.add_argument("--z", type=float, default=1.96, help="significance threshold (z-score)")
+    parser.add_argument("--min-change", type=float, default=min_change, help="minimum relative regression")
+    parser.add_argument("--set-baseline", action="store_true", help="mark this run as the new baseline")
+
+
+def _add_page_load_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--target", action="append", help="name=url to measure, e.g. before=... after=... (default: preview)")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="page loads per target")
+    parser.add_argument("--cpu-slowdown", type=float, default=4, help="CPU throttling rate")
+    parser.add_argument("--settle", type=float, default=3.0, help="seconds at the top of the page after load")
+
+
+def _config_from_args(args: argparse.Namespace, **overrides) -> HarnessConfig:
+    return HarnessConfig.from_env(
+        base_url=args.base_url,
+        build=False if args.no_build else None,
+        headless=False if args.headed else None,
+        output_dir=Path(args.output_dir) if args.output_dir else None,
+        **overrides,
+    )
+
+
+@contextmanager
+def _served(config: HarnessConfig, port: int = 0) -> Iterator[HarnessConfig]:
+    """``server.serve``, exiting with status 2 when the build cannot be served."""
+    with ExitStack() as stack:
+        try:
+            config = stack.enter_context(server.serve(config, port))
+        except (OSError, RuntimeError) as exc:
+            print(exc, file=sys.stderr)
+            raise SystemExit(2)
+        yield config
+
+
+def _print_retries(results) -> None:
+    retried = [result for result in results if result.metrics.get("attempts")]
+    if retried:
+        print("\nretried")
+    for result in retried:
+        first = result.metrics["attempts"][0]
+        outcome = "passed" if result.ok else result.status
+        attempt = len(result.metrics["attempts"]) + 1
+        print(f"  {result.test_id}  {outcome} on attempt {attempt}; first {first['status']}: {first['message'][:100]}")
+
+
+def _print_step_histogram(results) -> None:
+    histogram = LatencyHistogram()
+    skipped_ms = 0.0
+    for result in results:
+        steps = result.metrics.get("steps")
+        if steps:
+            histogram.counts = [a + b for a, b in zip(histogram.counts, steps["histogram"])]
+            skipped_ms += steps["skipped_sleep_ms"]
+    if histogram.total:
+        print(f"\nStep latency ({histogram.total} steps, {skipped_ms / 1000:.0f}s of fixed sleeps skipped)")
+        print(histogram.format())
+
+
+def _print_net_cache(results) -> None:
+    totals = CacheStats()
+    for result in results:
+        stats = result.metrics.get("netcache")
+        if stats:
+            totals.add(CacheStats(**{k: v for k, v in stats.items() if k != "hit_rate"}))
+    if totals.requests:
+        print(f"\nNetwork cache: {totals.describe()}")
+
+
+def _print_traces(results) -> None:
+    for result in results:
+        trace = result.metrics.get("trace")
+        if trace:
+            print(f"\n{result.test_id} trace")
+            print(TraceSummary.from_dict(trace).format())
+
+
+def _print_timers(results) -> None:
+    censuses = [(result.test_id, result.metrics["timers"]) for result in results if result.metrics.get("timers")]
+    if censuses:
+        print("\nTimers alive at the end of each test")
+    for test_id, timers in censuses:
+        owners = ", ".join(f"{owner} {count}" for owner, count in list(timers["by_owner"].items())[:5])
+        print(f"{test_id}: {timers['live']} live ({owners}), {timers['orphans']} orphaned")
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    config = _config_from_args(
+        args,
+        parallelism=args.parallel,
+        auto_wait=False if args.fixed_waits else None,
+        trace=args.trace or None,
+        coverage=args.coverage or None,
+        timer_census=args.timers or None,
+        context_pool=False if args.no_pool else None,
+        net_cache=args.net,
+        virtual_time=() if args.real_time else None,
+        snapshot_tests=() if args.live else None,
+        stable_selectors=False if args.recorded_selectors else None,
+        optimize_steps=False if args.recorded_steps else None,
+        flake_policy=False if args.no_flake_policy else None,
+    )
+    cases = discover(ids=args.ids or None)
+    impact_path = config.output_dir / impact.IMPACT_FILE
+    selective = False
+    if args.changed_since:
+        try:
+            selection = impact.plan(args.changed_since, impact_path, [case.id for case in cases], args.full_every)
+        except subprocess.CalledProcessError as exc:
+            print(exc.stderr.strip() or exc, file=sys.stderr)
+            return 2
+        print(selection.format())
+        if selection.full:
+            # Rebuild the map while every test runs anyway
+            config = replace(config, coverage=True)
+        else:
+            cases = [case for case in cases if case.id in selection.tests]
+            selective = True
+            if not cases:
+                impact.record_selective_run(impact_path)
+                return 0
+    if config.stable_selectors:
+        validation = selectors.validate()
+        if not validation.ok:
+            print(validation.format(), file=sys.stderr)
+    output_dir = config.ensure_output_dir()
+    with _served(config) as config:
+        started_at = time.time()
+        started = time.perf_counter()
+        with History.open(output_dir) as history:
+            quarantined: set[str] = set()
+            if config.flake_policy:
+                flakes = flaky.policy(history, [case.id for case in cases])
+                quarantined = flakes.quarantined
+                config = replace(config, retries=flakes.retries)
+            if args.workers > 1:
+                results = run_sharded(cases, config, args.workers, history.mean_durations())
+            else:
+                results = asyncio.run(run_suite(cases, config))
+            history.record(results, started_at)
+        wall_time = time.perf_counter() - started
+    if config.coverage:
+        if not args.ids and not selective:
+            impact_map = impact.update_map(impact_path, results)
+            print(f"impact map: {len(impact_map.files)} source files covered")
+        else:
+            print("impact map left as it is; only a full run rebuilds it")
+        for result in results:
+            result.metrics.pop("coverage", None)
+    if selective:
+        impact.record_selective_run(impact_path)
+    blocking = [result for result in results if result.test_id not in quarantined]
+    lane = [result for result in results if result.test_id in quarantined]
+    print(format_summary(blocking, wall_time))
+    if lane:
+        print(f"\nquarantined, not blocking\n{format_summary(lane)}")
+    _print_retries(results)
+    _print_step_histogram(results)
+    _print_net_cache(results)
+    _print_traces(results)
+    _print_timers(results)
+    write_json(results, output_dir / "results.json", wall_time=wall_time, quarantined=sorted(quarantined))
+    write_junit(blocking, Path(args.junit) if args.junit else output_dir / "junit.xml")
+    if lane:
+        write_junit(lane, output_dir / "junit-quarantine.xml", suite_name="testsprite-quarantine")
+    return 0 if all(result.ok for result in blocking) else 1
+
+
+def cmd_compile(args: argparse.Namespace) -> int:
+    config = _config_from_args(args)
+    target = config.ensure_output_dir() / "compiled"
+    target.mkdir(exist_ok=True)
+    reports = []
+    for case in discover(ids=args.ids or None):
+        tree = parse_script(case)
+        rewrite_navigations(tree, config.base_url)
+        reports.append(compiler.optimize(tree, case.id))
+        source = ast.unparse(ast.fix_missing_locations(tree))
+        header = f"# Optimised from {case.path.name} by `python -m harness compile`; regenerate, do not edit\n"
+        (target / case.path.name).write_text(header + source + "\n", encoding="utf-8")
+    print(compiler.format_reports(reports, verbose=args.verbose))
+    print(f"optimised scripts written to {target}")
+    return 0
+
+
+def cmd_flaky(args: argparse.Namespace) -> int:
+    config = _config_from_args(args)
+    with History.open(config.ensure_output_dir()) as history:
+        flakes = flaky.policy(history)
+    if not flakes.stats:
+        print("no test runs recorded yet")
+        return 0
+    print(flakes.format(args.top))
+    return 0
+
+
+def cmd_impact(args: argparse.Namespace) -> int:
+    config = _config_from_args(args)
+    cases = discover()
+    try:
+        selection = impact.plan(args.ref, config.output_dir / impact.IMPACT_FILE, [case.id for case in cases], args.full_every)
+    except subprocess.CalledProcessError as exc:
+        print(exc.stderr.strip() or exc, file=sys.stderr)
+        return 2
+    print(selection.format())
+    return 0
+
+
+def _targets(args: argparse.Namespace, default: dict[str, str]) -> dict[str, str]:
+    """``--target name=url`` pairs, or ``default``, without the ones that do not answer."""
+    targets = dict(target.split("=", 1) for target in args.target) if args.target else default
+    for name, url in list(targets.items()):
+        if not vitals.reachable(url):
+            print(f"skipping {name}: {url} is not reachable")
+            del targets[name]
+    return targets
+
+
+def _bench(suite: str, samples: dict[str, dict[str, list[float]]], args: argparse.Namespace, config: HarnessConfig) -> int:
+    """Record ``samples`` in the history and compare them with the baseline run of ``suite``."""
+    with History.open(config.ensure_output_dir()) as history:
+        baseline_id = history.baseline_run(suite)
+        run_id = history.record_bench(suite, samples, baseline=args.set_baseline)
+        if baseline_id is None:
+            print("\nno baseline yet; this run becomes the reference")
+            return 0
+        report = vitals.compare_runs(history.bench_samples(baseline_id), samples, args.z, args.min_change)
+    text, regressed = vitals.summarize_regressions(report)
+    print(f"\nrun {run_id} against baseline run {baseline_id}\n{text}")
+    return 1 if regressed else 0
+
+
+def cmd_vitals(args: argparse.Namespace) -> int:
+    with _served(_config_from_args(args)) as config:
+        targets = _targets(args, vitals.default_targets(config))
+        if not targets:
+            return 2
+        modes = vitals.MODES if args.mode == "both" else (args.mode,)
+        samples = asyncio.run(vitals.collect(config, targets, args.runs, modes))
+        print(vitals.format_samples(samples))
+        return _bench("vitals", samples, args, config)
+
+
+def cmd_startup(args: argparse.Namespace) -> int:
+    with _served(_config_from_args(args)) as config:
+        targets = _targets(args, startup.default_targets(config))
+        if not targets:
+            return 2
+        samples = asyncio.run(startup.collect(config, targets, args.runs, args.cpu_slowdown, args.settle * 1000))
+        print(vitals.format_medians(samples, startup.METRICS))
+        return _bench("startup", samples, args, config)
+
+
+def cmd_fonts(args: argparse.Namespace) -> int:
+    with _served(_config_from_args(args)) as config:
+        targets = _targets(args, startup.default_targets(config))
+        if not targets:
+            return 2
+        samples = asyncio.run(fonts.collect(config, targets, args.runs, args.cpu_slowdown, args.settle * 1000))
+        print(vitals.format_medians(samples, fonts.METRICS))
+        return _bench("fonts", samples, args, config)
+
+
+def cmd_fonts_build(args: argparse.Namespace) -> int:
+    config = _config_from_args(args)
+    try:
+        report = fonts.build(config.ensure_output_dir() / "fonts")
+    except (OSError, RuntimeError, ValueError) as exc:
+        print(exc)
+        return 2
+    print(report.format())
+    for path in report.unused:
+        print(f"unused font file: {path.relative_to(fonts.PROJECT_DIR)}")
+    print(f"\nwrote {fonts.PUBLIC_FONTS_DIR.relative_to(fonts.PROJECT_DIR)}/ and the font block of index.html")
+    return 0
+
+
+def cmd_idle(args: argparse.Namespace) -> int:
+    with _served(_config_from_args(args)) as config:
+        if not vitals.reachable(config.base_url):
+            print(f"{config.base_url} is not reachable")
+            return 2
+        samples, missing = asyncio.run(
+            idle.collect(config, args.sections or None, args.runs, args.window * 1000, args.settle * 1000, args.offscreen)
+        )
+        if args.offscreen:
+            print(idle.format_table(samples, unit="extra ms busy per second while scrolled away"))
+        else:
+            print(idle.format_table(samples))
+        for section in missing:
+            origin = "a demo component" if args.offscreen else "linked from navItems"
+            print(f"no element with id {section!r}; {origin} but not on the page")
+        return _bench("offscreen" if args.offscreen else "idle", samples, args, config)
+
+
+def cmd_leaks(args: argparse.Namespace) -> int:
+    sections = args.sections or list(leaks.REPLAY_SELECTORS)
+    unknown = [section for section in sections if section not in leaks.REPLAY_SELECTORS]
+    if unknown:
+        print(f"no replay demo in section(s): {', '.join(unknown)}")
+        return 2
+    with _served(_config_from_args(args)) as config:
+        if not vitals.reachable(config.base_url):
+            print(f"{config.base_url} is not reachable")
+            return 2
+        reports = asyncio.run(leaks.collect(config, sections, args.cycles, args.warmup))
+        budget = leaks.LeakBudget.load()
+        failed = False
+        for report in reports:
+            print(report.format())
+            for problem in report.violations(budget):
+                print(f"  LEAK {problem}")
+                failed = True
+        with History.open(config.ensure_output_dir()) as history:
+            history.record_bench("leaks", {report.section: report.samples for report in reports})
+        return 1 if failed else 0
+
+
+def cmd_matrix(args: argparse.Namespace) -> int:
+    viewports = {name: matrix.VIEWPORTS[name] for name in args.viewport or matrix.VIEWPORTS}
+    cases = discover(ids=args.ids or list(matrix.DEFAULT_TESTS))
+    # Every run in flight at once unless told otherwise
+    config = _config_from_args(args, parallelism=args.parallel or len(cases) * len(viewports))
+    with _served(config) as config:
+        run = asyncio.run(matrix.run_matrix(cases, config, viewports))
+    print(run.format())
+    run.write(config.ensure_output_dir() / "matrix.json")
+    return 0 if all(result.ok and not run.problems(result) for result in run.results) else 1
+
+
+def cmd_engines(args: argparse.Namespace) -> int:
+    names = args.engine or list(engines.ENGINES)
+    config = _config_from_args(args, parallelism=args.parallel)
+    cases = discover(ids=args.ids or None)
+    with _served(config) as config:
+        run = asyncio.run(engines.run_engines(cases, config, names))
+    print(run.format())
+    run.write(config.ensure_output_dir() / "engines.json")
+    return 0 if all(result.ok for results in run.results.values() for result in results) else 1
+
+
+def cmd_visual(args: argparse.Namespace) -> int:
+    breakpoints = {name: visual.BREAKPOINTS[name] for name in args.viewport or visual.BREAKPOINTS}
+    with _served(_config_from_args(args)) as config:
+        if not vitals.reachable(config.base_url):
+            print(f"{config.base_url} is not reachable")
+            return 2
+        try:
+            visual.require_numpy()
+        except RuntimeError as exc:
+            print(exc)
+            return 2
+        captures, missing = asyncio.run(visual.collect(config, args.sections or None, breakpoints))
+        diff_dir = config.ensure_output_dir() / "visual" / "diffs"
+        results = visual.check(captures, visual.BaselineStore(visual.BASELINE_DIR), diff_dir, args.update)
+    print(visual.format_table(results))
+    for section in missing:
+        print(f"no element with id {section!r}; linked from navItems but not on the page")
+    new = sum(1 for result in results if result.new_baseline)
+    if new:
+        print(f"{new} new baseline(s) stored under {visual.BASELINE_DIR}; commit them")
+    return 0 if all(result.ok for result in results) else 1
+
+
+def cmd_bundle(args: argparse.Namespace) -> int:
+    config = _config_from_args(args)
+    try:
+        if not args.dist and config.build:
+            server.ensure_build()
+        report = bundle.analyze(Path(args.dist) if args.dist else bundle.DIST_DIR)
+    except (FileNotFoundError, RuntimeError) as exc:
+        print(exc)
+        return 2
+    with History.open(config.ensure_output_dir()) as history:
+        previous_id = history.latest_run("bundle")
+        previous = history.bench_samples(previous_id) if previous_id is not None else None
+        history.record_bench("bundle", report.to_samples())
+    print(report.format(previous, args.top))
+    for name in report.unused_dependencies():
+        print(f"unused dependency: {name} is declared in package.json but not in the bundle")
+    problems = report.violations(bundle.BundleBudget.load())
+    for problem in problems:
+        print(f"OVER BUDGET {problem}")
+    return 1 if problems else 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    # Always the harness server, whatever LEADQ_BASE_URL says
+    config = replace(_config_from_args(args), base_url="")
+    with _served(config, args.port) as config:
+        print(f"serving {server.DIST_DIR} at {config.base_url} (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            return 0
+
+
+def cmd_selectors(args: argparse.Namespace) -> int:
+    validation = selectors.validate()
+    mapped = len(selectors.RECORDED_XPATHS) - len(validation.stale)
+    print(f"{mapped} of {len(selectors.RECORDED_XPATHS)} recorded XPaths map to a data-testid")
+    if validation.stale or validation.unmapped:
+        print(validation.format())
+    return 0 if validation.ok else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m harness")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run TC scripts in one shared browser")
+    _add_common_options(run)
+    run.add_argument("ids", nargs="*", help="test ids to run (default: all)")
+    run.add_argument("-j", "--parallel", type=int, help="tests in flight at once")
+    run.add_argument("-w", "--workers", type=int, default=1, help="shard across this many processes")
+    run.add_argument("--junit", help="JUnit XML path (default: <output-dir>/junit.xml)")
+    run.add_argument("--fixed-waits", action="store_true", help="keep the scripts' recorded sleeps")
+    run.add_argument("--no-pool", action="store_true", help="create contexts on demand, without seeded consent")
+    run.add_argument("--net", choices=("off", "replay", "offline"), help="third-party request handling")
+    run.add_argument("--recorded-steps", action="store_true", help="keep repeated navigations, refills and clicks")
+    run.add_argument("--recorded-selectors", action="store_true", help="use the scripts' absolute XPaths as recorded")
+    run.add_argument("--real-time", action="store_true", help="let demo animations run on the wall clock")
+    run.add_argument("--live", action="store_true", help="run content tests in the browser, not against a DOM snapshot")
+    run.add_argument("--trace", action="store_true", help="record and summarise a CDP trace per test")
+    run.add_argument("--timers", action="store_true", help="report the live timers each test leaves behind")
+    run.add_argument("--no-flake-policy", action="store_true", help="no history-based retries or quarantine")
+    run.add_argument("--coverage", action="store_true", help="record the source lines each test runs into the impact map")
+    run.add_argument("--changed-since", metavar="REF",
+                     help="run only the tests the changes since REF or since the impact map's commit can affect")
+    run.add_argument("--full-every", type=int, default=10, help="with --changed-since, run everything every N runs")
+    run.set_defaults(func=cmd_run)
+
+    optimise = commands.add_parser("compile", help="drop redundant steps from the TC scripts and report the savings")
+    _add_common_options(optimise)
+    optimise.add_argument("ids", nargs="*", help="test ids to compile (default: all)")
+    optimise.add_argument("-v", "--verbose", action="store_true", help="list every dropped step")
+    optimise.set_defaults(func=cmd_compile)
+
+    flakes = commands.add_parser("flaky", help="rank tests by the time their flaky attempts waste")
+    _add_common_options(flakes)
+    flakes.add_argument("--top", type=int, help="tests to list (default: all with history)")
+    flakes.set_defaults(func=cmd_flaky)
+
+    affected = commands.add_parser("impact", help="which tests a git diff selects, without running them")
+    _add_common_options(affected)
+    affected.add_argument("ref", nargs="?", default="HEAD",
+                          help="git revision whose changes count besides those since the impact map's commit (default: HEAD)")
+    affected.add_argument("--full-every", type=int, default=10, help="selective runs between full runs")
+    affected.set_defaults(func=cmd_impact)
+
+    bench = commands.add_parser("vitals", help="Core Web Vitals benchmark with regression check")
+    _add_common_options(bench)
+    bench.add_argument("--target", action="append", help="name=url to benchmark (default: dev and preview)")
+    bench.add_argument("-n", "--runs", type=int, default=5, help="page loads per target and mode")
+    bench.add_argument("--mode", choices=("cold", "warm", "both"), default="both")
+    _add_bench_options(bench)
+    bench.set_defaults(func=cmd_vitals)
+
+    first = commands.add_parser("startup", help="initial JS, compile time and LCP on a throttled phone")
+    _add_common_options(first)
+    _add_page_load_options(first)
+    _add_bench_options(first)
+    first.set_defaults(func=cmd_startup)
+
+    type_ = commands.add_parser("fonts", help="font bytes, swap shifts and LCP on a throttled phone")
+    _add_common_options(type_)
+    _add_page_load_options(type_)
+    _add_bench_options(type_)
+    type_.set_defaults(func=cmd_fonts)
+
+    subset = commands.add_parser("fonts-build", help="self-host subsetted WOFF2 fonts and rewrite index.html")
+    _add_common_options(subset)
+    subset.set_defaults(func=cmd_fonts_build)
+
+    rest = commands.add_parser("idle", help="main-thread busy time at rest, per nav section")
+    _add_common_options(rest)
+    rest.add_argument("sections", nargs="*", help="section ids to park on (default: navItems in App.tsx)")
+    rest.add_argument("--offscreen", action="store_true", help="measure what started demos cost once scrolled away")
+    rest.add_argument("-n", "--runs", type=int, default=3, help="passes over the sections")
+    rest.add_argument("--window", type=float, default=5.0, help="seconds measured per section")
+    rest.add_argument("--settle", type=float, default=1.5, help="seconds to wait after scrolling")
+    _add_bench_options(rest, min_change=0.10)
+    rest.set_defaults(func=cmd_idle)
+
+    leak = commands.add_parser("leaks", help="heap and DOM growth over repeated demo replays")
+    _add_common_options(leak)
+    leak.add_argument("sections", nargs="*", help=f"demo sections to replay (default: {', '.join(leaks.REPLAY_SELECTORS)})")
+    leak.add_argument("-n", "--cycles", type=int, default=10, help="measured replays per demo")
+    leak.add_argument("--warmup", type=int, default=1, help="replays before measuring")
+    leak.set_defaults(func=cmd_leaks)
+
+    grid = commands.add_parser("matrix", help="navbar tests at every viewport at once, with layout metrics")
+    _add_common_options(grid)
+    grid.add_argument("ids", nargs="*", help=f"test ids (default: {', '.join(matrix.DEFAULT_TESTS)})")
+    grid.add_argument("--viewport", action="append", choices=list(matrix.VIEWPORTS),
+                      help="viewport or device to run at, repeatable (default: all)")
+    grid.add_argument("-j", "--parallel", type=int, help="runs in flight at once (default: all)")
+    grid.set_defaults(func=cmd_matrix)
+
+    cross = commands.add_parser("engines", help="the suite in Chromium, Firefox and WebKit at once, timings side by side")
+    _add_common_options(cross)
+    cross.add_argument("ids", nargs="*", help="test ids (default: all)")
+    cross.add_argument("--engine", action="append", choices=list(engines.ENGINES),
+                       help="engine to run in, repeatable (default: all three)")
+    cross.add_argument("-j", "--parallel", type=int, help="tests in flight across all engines")
+    cross.set_defaults(func=cmd_engines)
+
+    look = commands.add_parser("visual", help="per-section screenshots at every breakpoint against baselines")
+    _add_common_options(look)
+    look.add_argument("sections", nargs="*", help="section ids to capture (default: the hero plus navItems)")
+    look.add_argument("--viewport", action="append", choices=list(visual.BREAKPOINTS),
+                      help="breakpoint to capture at, repeatable (default: all)")
+    look.add_argument("--update", action="store_true", help="store every capture as the new baseline")
+    look.set_defaults(func=cmd_visual)
+
+    size = commands.add_parser("bundle", help="build output size per chunk, module and package")
+    _add_common_options(size)
+    size.add_argument("--dist", help="vite build output (default: dist/ of the project)")
+    size.add_argument("--top", type=int, default=15, help="largest modules to list")
+    size.set_defaults(func=cmd_bundle)
+
+    host = commands.add_parser("serve", help="build and serve dist/ the way the harness does")
+    _add_common_options(host)
+    host.add_argument("--port", type=int, default=4173, help="port to listen on, 0 for any free one")
+    host.set_defaults(func=cmd_serve)
+
+    check = commands.add_parser("selectors", help="check the data-testid registry against the sources")
+    check.set_defaults(func=cmd_selectors)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+"""Size of the ``vite build`` output per chunk, source module and package.
+
+An analysis build (``LEADQ_ANALYZE=1``, which ``server.ensure_build``
+sets) emits ``dist/.vite/manifest.json`` and hidden sourcemaps.  The
+manifest says which chunks the entry loads up front (``initial``) and
+which are fetched later (``React.lazy`` sections).  Each chunk's raw,
+gzip and brotli size is measured on the file itself; the sourcemap then
+attributes the chunk's generated bytes to the source files they came
+from, and those to the npm package under ``node_modules`` (or ``(app)``
+for ``src/``).  Compressed sizes of a module are its raw share of the
+chunk's compressed size.
+
+Sizes are checked against the ``bundle`` entry of ``perf_budgets.json``.
+Every analysis is recorded in the history as the ``bundle`` suite, so
+the report can show the change against the previous build.  Dependencies
+declared in ``package.json`` that contribute no bytes are listed as
+unused.
+
+Brotli sizes need the optional ``brotli`` package and are reported as
+``-`` without it.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from .config import PROJECT_DIR
+from .perf import BUDGETS_PATH
+
+DIST_DIR = PROJECT_DIR / "dist"
+
+APP_PACKAGE = "(app)"
+# Helpers the bundler injects, such as vite/preload-helper
+BUNDLER_PACKAGE = "(bundler)"
+UNMAPPED = "(unmapped)"
+
+_BASE64 = {char: index for index, char in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")}
+_PACKAGE_PATH = re.compile(r"node_modules/((?:@[^/]+/)?[^/]+)/")
+
+
+@dataclass
+class Sizes:
+    raw: float
+    gzip: float
+    # None when the brotli package is not installed
+    brotli: float | None
+
+    @classmethod
+    def zero(cls) -> "Sizes":
+        return cls(0, 0, 0 if brotli is not None else None)
+
+    @classmethod
+    def measure(cls, data: bytes) -> "Sizes":
+        compressed = len(brotli.compress(data, quality=11)) if brotli is not None else None
+        return cls(len(data), len(gzip.compress(data, 9, mtime=0)), compressed)
+
+    def share(self, raw: float) -> "Sizes":
+        """The part of these sizes that ``raw`` bytes stand for."""
+        ratio = raw / self.raw if self.raw else 0
+        return Sizes(raw, self.gzip * ratio, None if self.brotli is None else self.brotli * ratio)
+
+    def add(self, other: "Sizes") -> None:
+        self.raw += other.raw
+        self.gzip += other.gzip
+        self.brotli = None if self.brotli is None or other.brotli is None else self.brotli + other.brotli
+
+    def to_dict(self) -> dict[str, float]:
+        values = {"raw": self.raw, "gzip": self.gzip}
+        if self.brotli is not None:
+            values["brotli"] = self.brotli
+        return values
+
+
+@dataclass
+class Chunk:
+    name: str
+    file: str
+    initial: bool
+    sizes: Sizes
+    # Raw generated bytes per source file
+    modules: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class BundleBudget:
+    """Largest tolerated gzip sizes, in bytes."""
+
+    initial_gzip: float | None = None
+    total_gzip: float | None = None
+    chunks_gzip: dict[str, float] = field(default_factory=dict)
+    packages_gzip: dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls) -> "BundleBudget":
+        """The ``bundle`` entry of ``perf_budgets.json``."""
+        entry: dict = {}
+        if BUDGETS_PATH.exists():
+            entry = json.loads(BUDGETS_PATH.read_text(encoding="utf-8")).get("bundle", {})
+        return cls(
+            entry.get("initial_gzip"),
+            entry.get("total_gzip"),
+            entry.get("chunks_gzip", {}),
+            entry.get("packages_gzip", {}),
+        )
+
+
+def decode_vlq(segment: str) -> list[int]:
+    """Base64 VLQ fields of one sourcemap segment."""
+    values = []
+    value = shift = 0
+    for char in segment:
+        digit = _BASE64[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+            continue
+        values.append(-(value >> 1) if value & 1 else value >> 1)
+        value = shift = 0
+    return values
+
+
+def attribute(code: str, sourcemap: dict) -> dict[str, int]:
+    """Raw generated bytes per source file of one chunk.
+
+    A segment owns the code up to the next segment on its line; code
+    before the first segment of a line, or under a segment without a
+    source, is ``UNMAPPED``.  Columns are taken as code points, which is
+    exact for the ASCII that minified output almost always is.
+    """
+    root = sourcemap.get("sourceRoot") or ""
+    sources = [root + source for source in sourcemap.get("sources", [])]
+    owned: dict[str, int] = {}
+    source = 0
+    lines = code.split("\n")
+    for number, mappings in enumerate(sourcemap.get("mappings", "").split(";")):
+        if number >= len(lines):
+            break
+        line = lines[number]
+        starts: list[tuple[int, str]] = []
+        column = 0
+        for segment in filter(None, mappings.split(",")):
+            fields = decode_vlq(segment)
+            column += fields[0]
+            if len(fields) >= 4:
+                source += fields[1]
+                starts.append((column, sources[source]))
+            else:
+                starts.append((column, UNMAPPED))
+        leading = starts[0][0] if starts else len(line)
+        if leading:
+            owned[UNMAPPED] = owned.get(UNMAPPED, 0) + len(line[:leading].encode("utf-8"))
+        for index, (start, path) in enumerate(starts):
+            end = starts[index + 1][0] if index + 1 < len(starts) else len(line)
+            owned[path] = owned.get(path, 0) + len(line[start:end].encode("utf-8"))
+    # Newlines belong to nobody in particular
+    owned[UNMAPPED] = owned.get(UNMAPPED, 0) + max(0, len(lines) - 1)
+    return {path: size for path, size in owned.items() if size}
+
+
+def normalize_source(path: str) -> str:
+    """Project-relative source path (``src/App.tsx``, ``node_modules/react/...``)."""
+    marker = path.rfind("node_modules/")
+    if marker >= 0:
+        return path[marker:]
+    path = path.split("?", 1)[0]
+    while path.startswith(("../", "./")):
+        path = path.split("/", 1)[1]
+    return path
+
+
+def package_of(source: str) -> str:
+    match = _PACKAGE_PATH.search(source)
+    if match:
+        return match.group(1)
+    if source == UNMAPPED:
+        return UNMAPPED
+    return APP_PACKAGE if source.startswith(("src/", "index.html")) else BUNDLER_PACKAGE
+
+
+def _chunk_name(key: str, entry: dict) -> str:
+    if entry.get("name"):
+        return entry["name"]
+    return Path(key).stem
+
+
+def _initial_keys(manifest: dict[str, dict]) -> set[str]:
+    """Manifest keys the entry chunks load before any dynamic import."""
+    pending = [key for key, entry in manifest.items() if entry.get("isEntry")]
+    seen: set[str] = set()
+    while pending:
+        key = pending.pop()
+        if key in seen or key not in manifest:
+            continue
+        seen.add(key)
+        pending.extend(manifest[key].get("imports", []))
+    return seen
+
+
+@dataclass
+class BundleReport:
+    chunks: list[Chunk]
+    # Stylesheets, fonts and images by file name
+    assets: dict[str, Sizes]
+    initial_assets: set[str]
+
+    def modules(self) -> dict[str, Sizes]:
+        totals: dict[str, Sizes] = {}
+        for chunk in self.chunks:
+            for source, raw in chunk.modules.items():
+                totals.setdefault(source, Sizes.zero()).add(chunk.sizes.share(raw))
+        return totals
+
+    def packages(self) -> dict[str, Sizes]:
+        totals: dict[str, Sizes] = {}
+        for source, sizes in self.modules().items():
+            totals.setdefault(package_of(source), Sizes.zero()).add(sizes)
+        return totals
+
+    def initial(self) -> Sizes:
+        total = Sizes.zero()
+        for chunk in self.chunks:
+            if chunk.initial:
+                total.add(chunk.sizes)
+        for name in self.initial_assets:
+            total.add(self.assets[name])
+        return total
+
+    def total(self) -> Sizes:
+        total = Sizes.zero()
+        for chunk in self.chunks:
+            total.add(chunk.sizes)
+        for sizes in self.assets.values():
+            total.add(sizes)
+        return total
+
+    def to_samples(self) -> dict[str, dict[str, list[float]]]:
+        """History samples: one value per size metric and target."""
+        targets: dict[str, Sizes] = {"initial": self.initial(), "total": self.total()}
+        targets.update({f"chunk:{chunk.name}": chunk.sizes for chunk in self.chunks})
+        targets.update({f"package:{name}": sizes for name, sizes in self.packages().items()})
+        targets.update({f"module:{path}": sizes for path, sizes in self.modules().items()})
+        targets.update({f"asset:{name}": sizes for name, sizes in self.assets.items()})
+        return {target: {metric: [value] for metric, value in sizes.to_dict().items()} for target, sizes in targets.items()}
+
+    def violations(self, budget: BundleBudget) -> list[str]:
+        problems = []
+
+        def check(label: str, actual: float, limit: float | None) -> None:
+            if limit is not None and actual > limit:
+                problems.append(f"{label} {actual / 1024:.1f} KiB gzip > {limit / 1024:.1f} KiB")
+
+        check("initial load", self.initial().gzip, budget.initial_gzip)
+        check("total", self.total().gzip, budget.total_gzip)
+        chunks: dict[str, float] = {}
+        for chunk in self.chunks:
+            chunks[chunk.name] = chunks.get(chunk.name, 0) + chunk.sizes.gzip
+        for name, limit in budget.chunks_gzip.items():
+            check(f"chunk {name}", chunks.get(name, 0), limit)
+        packages = self.packages()
+        for name, limit in budget.packages_gzip.items():
+            check(f"package {name}", packages[name].gzip if name in packages else 0, limit)
+        return problems
+
+    def unused_dependencies(self, package_json: Path = PROJECT_DIR / "package.json") -> list[str]:
+        """``dependencies`` of ``package_json`` that put no bytes in the bundle."""
+        declared = json.loads(package_json.read_text(encoding="utf-8")).get("dependencies", {})
+        bundled = set(self.packages())
+        return sorted(name for name in declared if name not in bundled)
+
+    def format(self, previous: dict[str, dict[str, list[float]]] | None = None, top: int = 15) -> str:
+        previous = previous or {}
+
+        def row(label: str, target: str, sizes: Sizes, width: int = 44) -> str:
+            brotli_kib = "-" if sizes.brotli is None else f"{sizes.brotli / 1024:.1f}"
+            line = f"{label:<{width}}{sizes.raw / 1024:10.1f}{sizes.gzip / 1024:10.1f}{brotli_kib:>10}"
+            before = previous.get(target, {}).get("gzip")
+            if previous:
+                line += f"{(sizes.gzip - before[0]) / 1024:+10.1f}" if before else "       new"
+            return line
+
+        header = f"{'':<44}{'raw KiB':>10}{'gzip KiB':>10}{'br KiB':>10}" + (f"{'change':>10}" if previous else "")
+        lines = [header, row("initial load", "initial", self.initial()), row("total", "total", self.total()), "", "chunks"]
+        for chunk in sorted(self.chunks, key=lambda chunk: (not chunk.initial, -chunk.sizes.gzip)):
+            label = f"  {chunk.name} ({'initial' if chunk.initial else 'lazy'})"
+            lines.append(row(label, f"chunk:{chunk.name}", chunk.sizes))
+        for name, sizes in sorted(self.assets.items(), key=lambda item: -item[1].gzip):
+            lines.append(row(f"  {name}", f"asset:{name}", sizes))
+        lines += ["", "packages"]
+        for name, sizes in sorted(self.packages().items(), key=lambda item: -item[1].gzip):
+            lines.append(row(f"  {name}", f"package:{name}", sizes))
+        lines += ["", f"largest {top} modules"]
+        for path, sizes in sorted(self.modules().items(), key=lambda item: -item[1].gzip)[:top]:
+            lines.append(row(f"  {path[-42:]}", f"module:{path}", sizes))
+        return "\n".join(lines)
+
+
+def analyze(dist_dir: Path = DIST_DIR) -> BundleReport:
+    """Measure the analysis build in ``dist_dir``."""
+    manifest_path = dist_dir / ".vite" / "manifest.json"
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"{manifest_path} not found; build with `LEADQ_ANALYZE=1 npm run build` first")
+    manifest: dict[str, dict] = json.loads(manifest_path.read_text(encoding="utf-8"))
+    initial = _initial_keys(manifest)
+    chunks = []
+    initial_assets: set[str] = set()
+    chunk_files: set[str] = set()
+    for key, entry in manifest.items():
+        if key in initial:
+            initial_assets.update(entry.get("css", []))
+        if not entry["file"].endswith(".js"):
+            continue
+        path = dist_dir / entry["file"]
+        data = path.read_bytes()
+        chunk_files.add(entry["file"])
+        map_path = path.with_name(path.name + ".map")
+        if map_path.exists():
+            sourcemap = json.loads(map_path.read_text(encoding="utf-8"))
+            owned = attribute(data.decode("utf-8"), sourcemap)
+            modules: dict[str, int] = {}
+            for source, size in owned.items():
+                name = normalize_source(source) if source != UNMAPPED else UNMAPPED
+                modules[name] = modules.get(name, 0) + size
+        else:
+            modules = {UNMAPPED: len(data)}
+        chunks.append(Chunk(_chunk_name(key, entry), entry["file"], key in initial, Sizes.measure(data), modules))
+    assets = {}
+    for path in sorted((dist_dir / "assets").glob("*")):
+        name = f"assets/{path.name}"
+        if name in chunk_files or path.suffix in {".map", ".gz", ".br"}:
+            continue
+        assets[name] = Sizes.measure(path.read_bytes())
+    return BundleReport(chunks, assets, initial_assets)
@@ -0,0 +1,166 @@
+"""Virtual time for the demo sections' ``setTimeout`` chains.
+
+``BookingsMeeting``, ``ProfileResearch`` and ``EmailDraftAnimation`` play
+their demos as fixed timeout schedules of up to 28 s after the play button
+is clicked.  Tests listed in ``HarnessConfig.virtual_time`` get a context
+with Playwright's fake clock installed before any page script runs; time
+still flows normally, but a ``StageClock`` can run the clock forward to a
+named stage of a demo in one step::
+
+    timeline = StageClock(page, "profile-research")
+    await start_button.click()
+    await timeline.mark()
+    await timeline.jump("enriching")
+
+The recorded scripts stay as generated: ``VirtualTime`` reports every
+click on a button inside a demo section back to the harness, which jumps
+that demo to its last stage (or the one given in ``stops``) right away.
+Without virtual time, ``jump`` falls back to waiting out the remaining
+real time.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from playwright import async_api
+
+from .report import TestResult
+from .steps import unwrap
+
+VIRTUAL_TIME_FLAG = "__leadqVirtualTime"
+
+# Binding the page calls with a section id when a demo button is clicked
+DEMO_CLICK_BINDING = "__leadqDemoClicked"
+
+# Milliseconds from the play click to each stage, per section id.  Mirrors
+# the timeout schedules in the components; keep in sync when they change.
+STAGE_TIMELINES: dict[str, dict[str, int]] = {
+    "bookings-meeting": {
+        "booking-webhook": 1200,
+        "booking-offline": 3500,
+        "context-linking": 6000,
+        "live-transcription": 9000,
+        "transcript-complete": 10000 + 3 * 1200,
+        "proof-upload": 15000,
+        "ai-summary": 19000,
+        "upload-complete": 19200 + 100 * 25,
+        "summary-complete": 20500 + 6 * 500,
+        "dashboard": 24000,
+        "finished": 28000,
+    },
+    "profile-research": {
+        "input": 500,
+        "researching": 1500,
+        "sources-complete": 3000,
+        "disambiguating": 4000,
+        "enriching": 6500,
+        "fields-complete": 7000 + 6 * 400,
+        "complete": 10000,
+    },
+    # Playback starts 100 ms after the click (handlePlayPause)
+    "email-draft": {
+        "contact": 100,
+        "subject": 100 + 1000,
+        "generation": 100 + 2000,
+        "sections-complete": 100 + 2500 + 4 * 700,
+        "customization": 100 + 6500,
+        "delivery": 100 + 9500,
+        "send-complete": 100 + 9500 + 10 * 150,
+        "complete": 100 + 11500,
+    },
+}
+
+
+# Reports clicks on the buttons of the sections in STAGE_TIMELINES; runs
+# in the capture phase so it sees the click before the demo's handler
+DEMO_CLICK_SCRIPT = """
+window.%(flag)s = true;
+document.addEventListener('click', (event) => {
+  const button = event.target instanceof Element ? event.target.closest('button') : null;
+  const section = button ? button.closest(%(sections)s) : null;
+  if (section) window.%(binding)s(section.id);
+}, true);
+""" % {
+    "flag": VIRTUAL_TIME_FLAG,
+    "sections": repr(", ".join(f"#{section}" for section in STAGE_TIMELINES)),
+    "binding": DEMO_CLICK_BINDING,
+}
+
+
+class VirtualTime:
+    """Runner plugin installing the fake clock and jumping started demos ahead."""
+
+    def __init__(self, test_ids: tuple[str, ...], stops: dict[str, str] | None = None):
+        self.test_ids = set(test_ids)
+        # Section id -> stage a started demo jumps to (default: its last one)
+        self.stops = stops or {}
+        self._skipped: dict[Any, float] = {}
+
+    def install(self, runner: Any) -> None:
+        runner.context_hooks.append(self.on_context)
+        runner.finish_hooks.append(self.on_finish)
+
+    def stop_for(self, section: str) -> str:
+        timeline = STAGE_TIMELINES[section]
+        return self.stops.get(section) or max(timeline, key=timeline.__getitem__)
+
+    async def on_context(self, context: async_api.BrowserContext, session: Any) -> None:
+        if session.case.id not in self.test_ids:
+            return
+        self._skipped.setdefault(session, 0.0)
+
+        async def demo_clicked(source: dict[str, Any], section: str) -> None:
+            # The click is still being dispatched; the demo's handler starts
+            # its schedule right after, so the offsets count from here
+            timeline = StageClock(source["page"], section)
+            await timeline.mark()
+            await timeline.jump(self.stop_for(section))
+            self._skipped[session] += timeline.skipped_ms
+
+        await context.clock.install()
+        await context.expose_binding(DEMO_CLICK_BINDING, demo_clicked)
+        await context.add_init_script(DEMO_CLICK_SCRIPT)
+
+    async def on_finish(self, session: Any, result: TestResult) -> None:
+        skipped = self._skipped.pop(session, None)
+        if skipped is not None:
+            result.metrics["virtual_time"] = {"skipped_ms": round(skipped, 1)}
+
+
+class StageClock:
+    """Moves a page's clock to named stages of one section's demo."""
+
+    def __init__(self, page: Any, section: str):
+        if section not in STAGE_TIMELINES:
+            raise KeyError(f"no stage timeline for section {section!r}")
+        self.page = unwrap(page)
+        self.section = section
+        self.timeline = STAGE_TIMELINES[section]
+        self.virtual = False
+        self.skipped_ms = 0.0
+        self._started_at: float | None = None
+
+    async def _now(self) -> float:
+        return await self.page.evaluate("Date.now()")
+
+    async def mark(self) -> None:
+        """Record the play click; stage offsets count from here."""
+        self.virtual = bool(await self.page.evaluate(f"window.{VIRTUAL_TIME_FLAG} === true"))
+        self._started_at = await self._now()
+
+    async def jump(self, stage: str) -> None:
+        """Advance until every timeout up to ``stage`` has fired."""
+        if self._started_at is None:
+            raise RuntimeError("StageClock.jump() called before mark()")
+        if stage not in self.timeline:
+            known = ", ".join(self.timeline)
+            raise KeyError(f"unknown {self.section} stage {stage!r} (known: {known})")
+        remaining = self._started_at + self.timeline[stage] - await self._now()
+        if remaining <= 0:
+            return
+        if self.virtual:
+            await self.page.clock.run_for(int(remaining) + 1)
+            self.skipped_ms += remaining
+        else:
+            await self.page.wait_for_timeout(remaining + 1)
@@ -0,0 +1,353 @@
+"""Step-level optimiser for the generated TC scripts.
+
+The recordings repeat themselves: TC020 reopens the cookie Preferences
+modal up to three times in a row, TC017/TC018 refill the same contact
+fields with the same values several times over, and most scripts
+navigate two or three times before the first action.  Since the scripts
+are regenerated, the clean-up happens on the AST every time a script is
+loaded rather than by editing them.
+
+Each statement block is split into steps.  A step is one awaited action
+(``await page.goto(...)``, ``await elem.click(...)``) together with the
+statements leading up to it: the ``frame = ...``/``elem = ...`` setup and
+the fixed sleeps the generator puts in front of every action.  Anything
+else (``try`` blocks around assertions, loops) is kept as an opaque step.
+The pass then drops
+
+* a ``goto`` the next step replaces with another ``goto``;
+* a ``fill`` that a later ``fill`` of the same field overwrites before
+  anything else happens, or that writes the value the field already has;
+* a click that repeats the previous step on a target that only opens or
+  scrolls to something (``IDEMPOTENT_CLICKS``); toggles and submits are
+  never collapsed;
+* the idle sleep after the last step of ``run_test``.
+
+The setup assignments of a dropped step are kept when a later statement
+reads them.  ``python -m harness compile`` writes the optimised scripts
+under ``<output-dir>/compiled`` and reports the time each one saves.
+
+With auto-wait on, ``skip_action_sleeps`` also swaps the sleeps right in
+front of a step's action for a call that only records them, since the
+step engine waits for that action's target instead (see steps.py).
+"""
+
+from __future__ import annotations
+
+import ast
+from dataclasses import dataclass, field
+
+from .selectors import (
+    COOKIE_PREFERENCES,
+    NAV_DIRECT_LINKS,
+    NAV_SOLUTION_LINKS,
+    RECORDED_XPATHS,
+    nav_link,
+    nav_menu_link,
+    nav_mobile_link,
+    normalize_xpath,
+)
+from .steps import ACTIONS, SKIPPED_SLEEP
+
+# Statements calling only these do not change what the page shows
+WAIT_CALLS = {"wait_for_load_state", "wait_for_timeout", "sleep"}
+
+# Clicks that set state rather than flip it, by data-testid
+IDEMPOTENT_CLICKS = frozenset(
+    [COOKIE_PREFERENCES]
+    + [nav_link(section) for section in NAV_DIRECT_LINKS]
+    + [nav_menu_link(section) for section in NAV_SOLUTION_LINKS]
+    + [nav_mobile_link(section) for section in NAV_DIRECT_LINKS + NAV_SOLUTION_LINKS]
+)
+
+# Nominal cost of an action on top of its recorded sleeps, in seconds
+ACTION_SECONDS = {"goto": 1.0, "click": 0.2, "fill": 0.1}
+
+
+def goto_url(node: ast.stmt) -> str | None:
+    # Matches `await page.goto("<literal>", ...)` as a statement
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Await):
+        return None
+    call = node.value.value
+    if not isinstance(call, ast.Call) or not isinstance(call.func, ast.Attribute) or call.func.attr != "goto":
+        return None
+    if call.args and isinstance(call.args[0], ast.Constant) and isinstance(call.args[0].value, str):
+        return call.args[0].value
+    return None
+
+
+def only_waits(node: ast.stmt) -> bool:
+    calls = [child for child in ast.walk(node) if isinstance(child, ast.Call)]
+    return all(isinstance(call.func, ast.Attribute) and call.func.attr in WAIT_CALLS for call in calls)
+
+
+def _sleep_seconds(node: ast.stmt) -> float:
+    seconds = 0.0
+    for call in ast.walk(node):
+        if isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute) and call.args:
+            value = call.args[0]
+            if not isinstance(value, ast.Constant) or not isinstance(value.value, (int, float)):
+                continue
+            if call.func.attr == "wait_for_timeout":
+                seconds += value.value / 1000
+            elif call.func.attr == "sleep":
+                seconds += value.value
+    return seconds
+
+
+def _locator_key(node: ast.expr) -> str | None:
+    # `frame.locator('<selector>').nth(0)` -> normalised selector plus the chain after it
+    chain = []
+    while isinstance(node, (ast.Call, ast.Attribute)):
+        if isinstance(node, ast.Call):
+            func = node.func
+            if not isinstance(func, ast.Attribute):
+                return None
+            if func.attr == "locator" and node.args and isinstance(node.args[0], ast.Constant):
+                selector = str(node.args[0].value)
+                if selector.startswith("xpath="):
+                    xpath = normalize_xpath(selector)
+                    selector = f"testid={RECORDED_XPATHS[xpath]}" if xpath in RECORDED_XPATHS else f"xpath={xpath}"
+                return selector + "".join(reversed(chain))
+            chain.append(f".{func.attr}({', '.join(ast.unparse(arg) for arg in node.args)})")
+            node = func.value
+        else:
+            chain.append(f".{node.attr}")
+            node = node.value
+    return None
+
+
+@dataclass
+class Step:
+    statements: list[ast.stmt]
+    # "goto", a locator method such as "click"/"fill", "wait" or "other"
+    kind: str
+    target: str = ""
+    # Positional arguments of the action, e.g. the text of a fill
+    args: str = ""
+    dropped: str = ""
+
+    @property
+    def line(self) -> int:
+        return self.statements[-1].lineno
+
+    @property
+    def seconds(self) -> float:
+        return sum(_sleep_seconds(statement) for statement in self.statements) + ACTION_SECONDS.get(self.kind, 0.0)
+
+    @property
+    def idempotent(self) -> bool:
+        if self.kind in ("fill", "hover", "focus", "check", "uncheck", "select_option", "scroll_into_view_if_needed"):
+            return True
+        return self.kind == "click" and self.target.split(".", 1)[0].removeprefix("testid=") in IDEMPOTENT_CLICKS
+
+    def same_action(self, other: "Step") -> bool:
+        return (self.kind, self.target, self.args) == (other.kind, other.target, other.args)
+
+    def describe(self) -> str:
+        if self.kind == "goto":
+            return f"goto {self.target}"
+        if self.kind == "wait":
+            return f"sleep {self.seconds:g}s"
+        return f"{self.kind}{f'({self.args})' if self.args else ''} on {self.target}"
+
+
+def split_steps(statements: list[ast.stmt]) -> list[Step]:
+    """Group a statement block into steps, each ending in one action."""
+    steps: list[Step] = []
+    pending: list[ast.stmt] = []
+    # Name -> locator key of the `elem = frame.locator(...)` that bound it
+    locators: dict[str, str] = {}
+    for statement in statements:
+        if isinstance(statement, ast.Assign) and not any(isinstance(n, ast.Await) for n in ast.walk(statement)):
+            key = _locator_key(statement.value)
+            for target in statement.targets:
+                if isinstance(target, ast.Name):
+                    if key is not None:
+                        locators[target.id] = key
+                    else:
+                        locators.pop(target.id, None)
+            pending.append(statement)
+            continue
+        if only_waits(statement):
+            pending.append(statement)
+            continue
+        pending.append(statement)
+        url = goto_url(statement)
+        if url is not None:
+            steps.append(Step(pending, "goto", url.rstrip("/")))
+        elif (
+            isinstance(statement, ast.Expr)
+            and isinstance(statement.value, ast.Await)
+            and isinstance(statement.value.value, ast.Call)
+            and isinstance(statement.value.value.func, ast.Attribute)
+            and isinstance(statement.value.value.func.value, ast.Name)
+            and statement.value.value.func.value.id in locators
+        ):
+            call = statement.value.value
+            args = ", ".join(ast.unparse(arg) for arg in call.args)
+            steps.append(Step(pending, call.func.attr, locators[call.func.value.id], args))
+        else:
+            steps.append(Step(pending, "other"))
+        pending = []
+    if pending:
+        steps.append(Step(pending, "wait"))
+    return steps
+
+
+def optimize_steps(steps: list[Step], trailing: bool = False) -> None:
+    """Mark redundant steps with the rule that drops them."""
+    live = [step for step in steps if step.kind != "wait"]
+    # Field -> value it holds since the last step that may have reset it
+    values: dict[str, str] = {}
+    # Field -> its fill in the current run of consecutive fills
+    run: dict[str, Step] = {}
+    previous: Step | None = None
+    for index, step in enumerate(live):
+        following = live[index + 1] if index + 1 < len(live) else None
+        if step.kind == "goto" and following is not None and following.kind == "goto":
+            step.dropped = "superseded goto"
+        elif step.kind == "fill":
+            earlier = run.get(step.target)
+            if values.get(step.target) == step.args:
+                step.dropped = "refill with the same value"
+            elif earlier is not None and not earlier.dropped:
+                earlier.dropped = "overwritten fill"
+            run[step.target] = step
+            values[step.target] = step.args
+        elif step.idempotent and previous is not None and previous.same_action(step):
+            step.dropped = f"repeated {step.kind}"
+        if step.kind != "fill":
+            run = {}
+            if not step.idempotent:
+                values = {}
+        if not step.dropped:
+            previous = step
+    if trailing:
+        for step in reversed(steps):
+            if step.kind != "wait":
+                break
+            step.dropped = "trailing sleep"
+
+
+def _names(node: ast.AST, context: type) -> set[str]:
+    return {child.id for child in ast.walk(node) if isinstance(child, ast.Name) and isinstance(child.ctx, context)}
+
+
+def _read_later(names: set[str], statements: list[ast.stmt]) -> set[str]:
+    """Names in ``names`` that ``statements`` read before assigning them."""
+    read: set[str] = set()
+    pending = set(names)
+    for statement in statements:
+        if not pending:
+            break
+        if isinstance(statement, ast.Assign):
+            read |= pending & _names(statement.value, ast.Load)
+            pending -= _names(statement, ast.Store)
+        else:
+            read |= pending & _names(statement, ast.Load)
+    return read
+
+
+def rebuild(steps: list[Step]) -> list[ast.stmt]:
+    """The statements of the kept steps, plus the setup later statements need."""
+    statements: list[ast.stmt] = []
+    for index, step in enumerate(steps):
+        if not step.dropped:
+            statements.extend(step.statements)
+            continue
+        rest = [statement for later in steps[index + 1:] if not later.dropped for statement in later.statements]
+        assigned = {name for statement in step.statements if isinstance(statement, ast.Assign)
+                    for name in _names(statement, ast.Store)}
+        needed = _read_later(assigned, rest)
+        statements.extend(
+            statement for statement in step.statements
+            if isinstance(statement, ast.Assign) and _names(statement, ast.Store) & needed
+        )
+    return statements or [ast.Pass()]
+
+
+@dataclass
+class ScriptReport:
+    test_id: str
+    steps_before: int = 0
+    dropped: list[Step] = field(default_factory=list)
+
+    @property
+    def steps_after(self) -> int:
+        return self.steps_before - len(self.dropped)
+
+    @property
+    def seconds_saved(self) -> float:
+        return sum(step.seconds for step in self.dropped)
+
+
+def _main_blocks(tree: ast.Module) -> set[int]:
+    # The body of run_test, or of the try statement wrapping it
+    blocks = set()
+    for node in tree.body:
+        if isinstance(node, ast.AsyncFunctionDef) and node.name == "run_test":
+            blocks.add(id(node.body))
+            blocks.update(id(child.body) for child in node.body if isinstance(child, ast.Try))
+    return blocks
+
+
+def optimize(tree: ast.Module, test_id: str = "") -> ScriptReport:
+    """Drop redundant steps from every block of ``tree`` in place."""
+    report = ScriptReport(test_id)
+    main = _main_blocks(tree)
+    for node in list(ast.walk(tree)):
+        for name in ("body", "orelse", "finalbody"):
+            block = getattr(node, name, None)
+            if not isinstance(block, list) or not block or not isinstance(block[0], ast.stmt):
+                continue
+            steps = split_steps(block)
+            optimize_steps(steps, trailing=id(block) in main)
+            report.steps_before += len(steps)
+            report.dropped.extend(step for step in steps if step.dropped)
+            if any(step.dropped for step in steps):
+                setattr(node, name, rebuild(steps))
+    return report
+
+
+def _action_sleeps(step: Step) -> list[ast.stmt]:
+    # The sleeps before the action, past setup assignments that await nothing
+    found = []
+    for statement in reversed(step.statements[:-1]):
+        if isinstance(statement, ast.Assign) and not any(isinstance(n, ast.Await) for n in ast.walk(statement)):
+            continue
+        if not isinstance(statement, ast.Expr) or not only_waits(statement) or not _sleep_seconds(statement):
+            break
+        found.append(statement)
+    return found
+
+
+def skip_action_sleeps(tree: ast.Module) -> None:
+    """Replace each sleep directly before an auto-waited action with a ``SKIPPED_SLEEP`` call."""
+    for node in list(ast.walk(tree)):
+        for name in ("body", "orelse", "finalbody"):
+            block = getattr(node, name, None)
+            if not isinstance(block, list) or not block or not isinstance(block[0], ast.stmt):
+                continue
+            replaced: dict[int, ast.stmt] = {}
+            for step in split_steps(block):
+                if step.kind not in ACTIONS:
+                    continue
+                for statement in _action_sleeps(step):
+                    ms = _sleep_seconds(statement) * 1000
+                    call = ast.Call(ast.Name(SKIPPED_SLEEP, ast.Load()), [ast.Constant(ms)], [])
+                    replaced[id(statement)] = ast.copy_location(ast.Expr(call), statement)
+            if replaced:
+                setattr(node, name, [replaced.get(id(statement), statement) for statement in block])
+
+
+def format_reports(reports: list[ScriptReport], verbose: bool = False) -> str:
+    lines = [f"{'test':<8}{'steps':>7}{'kept':>7}{'saved s':>10}"]
+    for report in reports:
+        lines.append(f"{report.test_id:<8}{report.steps_before:>7}{report.steps_after:>7}{report.seconds_saved:>10.1f}")
+        if verbose:
+            for step in sorted(report.dropped, key=lambda step: step.line):
+                lines.append(f"    line {step.line:>4}  {step.dropped}: {step.describe()}")
+    total = sum(report.seconds_saved for report in reports)
+    dropped = sum(len(report.dropped) for report in reports)
+    lines.append(f"{dropped} steps dropped, {total:.1f}s of recorded sleeps and actions saved")
+    return "\n".join(lines)
@@ -0,0 +1,121 @@
+"""Runtime settings shared by the harness entry points."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Directory holding the generated TC scripts and the TestSprite plan files
+TESTS_DIR = Path(__file__).resolve().parent.parent
+
+# Root of the landing page project (package.json, src/, dist/)
+PROJECT_DIR = TESTS_DIR.parent
+
+# URL the generated scripts were recorded against
+RECORDED_BASE_URL = "http://localhost:5173"
+
+# The same dev server under the loopback addresses some scripts fall back to
+RECORDED_ORIGINS = (RECORDED_BASE_URL, "http://127.0.0.1:5173", "http://[::1]:5173")
+
+
+def _flag(env: Mapping[str, str], name: str, default: bool) -> bool:
+    """Boolean environment variable ``name``: anything but 0/false/no is on."""
+    if name not in env:
+        return default
+    return env[name].lower() not in ("0", "false", "no")
+
+
+@dataclass
+class HarnessConfig:
+    """Settings for one harness invocation.
+
+    Every field can be overridden from the environment with the
+    ``LEADQ_`` prefix, e.g. ``LEADQ_PARALLELISM=8``.
+    """
+
+    # Empty: build dist/ and serve it from the harness (see server.py)
+    base_url: str = ""
+    # Rebuild dist/ before serving it when a source is newer
+    build: bool = True
+    parallelism: int = 4
+    headless: bool = True
+    # Upper bound for a whole TC run, in seconds
+    test_timeout: float = 180.0
+    # Default Playwright action timeout, in milliseconds
+    action_timeout: float = 5000
+    # Replace the scripts' fixed sleeps with actionability waits (see steps.py)
+    auto_wait: bool = True
+    # Record a CDP trace of every test (see tracing.py)
+    trace: bool = False
+    # Record which source lines each test runs, for impact.py
+    coverage: bool = False
+    # Instrument timers and record a per-test census (see timers.py)
+    timer_census: bool = False
+    # Check contexts out of a pool with cookie consent pre-seeded (see pool.py)
+    context_pool: bool = True
+    # Tests that must see the cookie banner
+    consent_opt_out: tuple[str, ...] = ("TC020",)
+    # Third-party traffic: "off", "replay" (cache, fetch misses) or "offline" (see netcache.py)
+    net_cache: str = "replay"
+    # Tests whose contexts get a fake clock to fast-forward demo timeouts (see clock.py)
+    virtual_time: tuple[str, ...] = ("TC008", "TC009")
+    # Tests whose scroll frame timing is checked against a budget afterwards (see perf.py)
+    scroll_budgets: tuple[str, ...] = ("TC010", "TC024")
+    # Read-only content tests evaluated against one DOM snapshot (see snapshot.py)
+    snapshot_tests: tuple[str, ...] = ("TC012", "TC013", "TC015", "TC025")
+    # Drop repeated navigations, refills and reopened modals (see compiler.py)
+    optimize_steps: bool = True
+    # Retry failures and quarantine unstable tests from their history (see flaky.py)
+    flake_policy: bool = True
+    # Times a failed test is retried, filled in from the flake policy
+    retries: dict[str, int] = field(default_factory=dict)
+    # Swap recorded absolute XPaths for data-testid selectors (see selectors.py)
+    stable_selectors: bool = True
+    output_dir: Path = field(default_factory=lambda: TESTS_DIR / ".harness")
+    browser_args: list[str] = field(
+        default_factory=lambda: [
+            "--window-size=1280,720",
+            "--disable-dev-shm-usage",
+        ]
+    )
+
+    @classmethod
+    def from_env(cls, **overrides) -> "HarnessConfig":
+        config = cls()
+        env = os.environ
+        if "LEADQ_BASE_URL" in env:
+            config.base_url = env["LEADQ_BASE_URL"]
+        config.build = _flag(env, "LEADQ_BUILD", config.build)
+        if "LEADQ_PARALLELISM" in env:
+            config.parallelism = int(env["LEADQ_PARALLELISM"])
+        config.headless = _flag(env, "LEADQ_HEADLESS", config.headless)
+        config.auto_wait = _flag(env, "LEADQ_AUTO_WAIT", config.auto_wait)
+        config.trace = _flag(env, "LEADQ_TRACE", config.trace)
+        config.coverage = _flag(env, "LEADQ_COVERAGE", config.coverage)
+        config.timer_census = _flag(env, "LEADQ_TIMER_CENSUS", config.timer_census)
+        config.context_pool = _flag(env, "LEADQ_CONTEXT_POOL", config.context_pool)
+        if "LEADQ_NET_CACHE" in env:
+            config.net_cache = env["LEADQ_NET_CACHE"]
+        if "LEADQ_VIRTUAL_TIME" in env:
+            config.virtual_time = tuple(t for t in env["LEADQ_VIRTUAL_TIME"].split(",") if t)
+        if "LEADQ_SCROLL_BUDGETS" in env:
+            config.scroll_budgets = tuple(t for t in env["LEADQ_SCROLL_BUDGETS"].split(",") if t)
+        if "LEADQ_SNAPSHOT_TESTS" in env:
+            config.snapshot_tests = tuple(t for t in env["LEADQ_SNAPSHOT_TESTS"].split(",") if t)
+        config.optimize_steps = _flag(env, "LEADQ_OPTIMIZE_STEPS", config.optimize_steps)
+        config.flake_policy = _flag(env, "LEADQ_FLAKE_POLICY", config.flake_policy)
+        config.stable_selectors = _flag(env, "LEADQ_STABLE_SELECTORS", config.stable_selectors)
+        if "LEADQ_TEST_TIMEOUT" in env:
+            config.test_timeout = float(env["LEADQ_TEST_TIMEOUT"])
+        if "LEADQ_OUTPUT_DIR" in env:
+            config.output_dir = Path(env["LEADQ_OUTPUT_DIR"])
+        for name, value in overrides.items():
+            if value is not None:
+                setattr(config, name, value)
+        return config
+
+    def ensure_output_dir(self) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        return self.output_dir
@@ -0,0 +1,221 @@
+"""Cross-engine runs: the suite in Chromium, Firefox and WebKit at once.
+
+The scripts only ever launch Chromium, but the glass and stardust buttons
+lean on ``backdrop-filter: blur(...)``, which costs very different amounts
+in each engine.  ``python -m harness engines`` starts one ``SuiteRunner``
+per engine and feeds them from one queue: jobs are interleaved test by
+test and share a single ``asyncio.Semaphore``, so every engine runs under
+the same load and their timings compare.
+
+Every test runs live in every engine (no DOM snapshot, no CDP recorders,
+which are Chromium-only).  ``FrameRecorder`` samples every animation frame
+of the page for the whole test, plus long tasks, layout shifts and Event
+Timing interactions where the engine has them, and summarises it with
+``perf.FrameStats``.  Interaction latency is reported twice: the Event
+Timing p95 (input to next paint; Chromium and Firefox) and the p95 time
+Playwright's actions took (every engine, from the step engine).  Results
+are written to ``<output-dir>/engines.json``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+from playwright import async_api
+
+from .config import HarnessConfig
+from .loader import TestCase
+from .perf import FrameStats, PerfBudget
+from .report import ERROR, PASSED, TestResult
+from .runner import SuiteRunner
+from .stats import percentile
+
+ENGINES = ("chromium", "firefox", "webkit")
+
+# Interactions slower than this are poor by the INP thresholds
+INTERACTION_BUDGET_MS = 200
+
+# Frame timestamps kept per page, about five minutes at 60 Hz
+MAX_FRAMES = 20000
+
+# Records every animation frame plus whatever performance entries the engine supports
+FRAMES_INIT_SCRIPT = """
+(() => {
+  const probe = { frames: [], longTasks: [], layoutShift: 0, events: [], eventTiming: false };
+  window.__leadqFrames = probe;
+  const tick = (stamp) => {
+    if (probe.frames.length < %d) probe.frames.push(stamp);
+    requestAnimationFrame(tick);
+  };
+  requestAnimationFrame(tick);
+  const observe = (type, sink, options) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(sink)).observe({ type, buffered: true, ...options });
+      return true;
+    } catch (error) {
+      // Entry type not supported by this engine
+      return false;
+    }
+  };
+  observe('longtask', (entry) => probe.longTasks.push({ start: entry.startTime, duration: entry.duration }));
+  observe('layout-shift', (entry) => { if (!entry.hadRecentInput) probe.layoutShift += entry.value; });
+  probe.eventTiming = observe('event', (entry) => { if (entry.interactionId) probe.events.push(entry.duration); },
+                              { durationThreshold: 16 });
+})();
+""" % MAX_FRAMES
+
+FRAMES_SCRIPT = """
+() => {
+  const probe = window.__leadqFrames;
+  if (!probe) return null;
+  const frames = probe.frames;
+  return { ...probe, durationMs: frames.length > 1 ? frames[frames.length - 1] - frames[0] : 0 };
+}
+"""
+
+
+class FrameRecorder:
+    """Runner plugin recording frame timing and interaction latency of every test."""
+
+    def install(self, runner: Any) -> None:
+        runner.context_hooks.append(self.on_context)
+        runner.finish_hooks.append(self.on_finish)
+
+    async def on_context(self, context: async_api.BrowserContext, session: Any) -> None:
+        await context.add_init_script(FRAMES_INIT_SCRIPT)
+
+    async def on_finish(self, session: Any, result: TestResult) -> None:
+        pages = [page for context in session.contexts for page in context.pages if not page.is_closed()]
+        if not pages:
+            return
+        try:
+            probe = await pages[-1].evaluate(FRAMES_SCRIPT)
+        except async_api.Error as exc:
+            result.metrics["frames_error"] = str(exc).splitlines()[0]
+            return
+        if probe is None:
+            return
+        events = probe["events"]
+        stats = FrameStats.from_probe(probe)
+        result.metrics["frames"] = {
+            **stats.to_dict(),
+            "dropped_frame_ratio": stats.dropped_frame_ratio,
+            "interactions": len(events),
+            "interaction_p95_ms": percentile(events, 95) if probe["eventTiming"] else None,
+        }
+
+
+@dataclass
+class EngineRun:
+    engines: list[str]
+    # Engine -> results, in case order
+    results: dict[str, list[TestResult]] = field(default_factory=dict)
+    wall_s: float = 0.0
+    # Engines that did not launch, with the reason
+    errors: dict[str, str] = field(default_factory=dict)
+
+    def jank(self, budget: PerfBudget) -> list[str]:
+        """One line per test and engine over the frame or interaction budget."""
+        found = []
+        for engine in self.engines:
+            for result in self.results[engine]:
+                frames = result.metrics.get("frames")
+                if not frames:
+                    continue
+                problems = []
+                if frames["p95_frame_ms"] > budget.p95_frame_ms:
+                    problems.append(f"p95 frame {frames['p95_frame_ms']:.1f} ms > {budget.p95_frame_ms:.1f}")
+                if frames["dropped_frame_ratio"] > budget.dropped_frame_ratio:
+                    problems.append(f"{frames['dropped_frame_ratio']:.0%} frames dropped")
+                if (frames["interaction_p95_ms"] or 0) > INTERACTION_BUDGET_MS:
+                    problems.append(f"p95 interaction {frames['interaction_p95_ms']:.0f} ms")
+                if problems:
+                    found.append(f"{result.test_id} on {engine}: {'; '.join(problems)}")
+        return found
+
+    @staticmethod
+    def _cell(result: TestResult) -> str:
+        frames = result.metrics.get("frames")
+        steps = result.metrics.get("steps") or {}
+        if not frames:
+            return f"{result.status:<8}{'-':>7}{'-':>6}{'-':>6}{'-':>6}"
+        interaction = frames["interaction_p95_ms"]
+        return (
+            f"{result.status:<8}{frames['p95_frame_ms']:>7.1f}{frames['dropped_frame_ratio']:>6.0%}"
+            f"{'-' if interaction is None else f'{interaction:.0f}':>6}{steps.get('action_p95_ms', 0):>6.0f}"
+        )
+
+    def format(self, budget: PerfBudget | None = None) -> str:
+        width = 36
+        columns = f"{'result':<8}{'p95 fr':>7}{'drop':>6}{'INP':>6}{'act':>6}"
+        lines = [f"{'':<8}" + "".join(f"{engine:<{width}}" for engine in self.engines)]
+        lines.append(f"{'test':<8}" + f"{columns:<{width}}" * len(self.engines))
+        for index, result in enumerate(self.results[self.engines[0]]):
+            test_id = result.test_id
+            cells = [self._cell(self.results[engine][index]) for engine in self.engines]
+            lines.append(f"{test_id:<8}" + "".join(f"{cell:<{width}}" for cell in cells))
+        lines.append("")
+        for engine in self.engines:
+            if engine in self.errors:
+                lines.append(f"{engine:<10}did not launch: {self.errors[engine]}")
+                continue
+            results = self.results[engine]
+            passed = sum(1 for result in results if result.status == PASSED)
+            p95s = [result.metrics["frames"]["p95_frame_ms"] for result in results if result.metrics.get("frames")]
+            median_p95 = f"{statistics.median(p95s):.1f} ms" if p95s else "-"
+            lines.append(
+                f"{engine:<10}{passed}/{len(results)} passed, {sum(result.duration for result in results):.0f}s "
+                f"of test time, median p95 frame {median_p95}"
+            )
+        lines.append(f"{len(self.engines)} engines in {self.wall_s:.1f}s wall time")
+        lines.append("INP: p95 Event Timing interaction ms; act: p95 Playwright action ms")
+        jank = self.jank(budget or PerfBudget.load("engines"))
+        if jank:
+            lines.append("\nOver budget:")
+            lines.extend(f"  {line}" for line in jank)
+        return "\n".join(lines)
+
+    def write(self, path: Path) -> None:
+        data = {
+            "wall_s": self.wall_s,
+            "errors": self.errors,
+            "engines": {engine: [result.to_dict() for result in results] for engine, results in self.results.items()},
+        }
+        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+async def run_engines(cases: list[TestCase], config: HarnessConfig, engines: list[str]) -> EngineRun:
+    """Run ``cases`` in every engine at once, ``config.parallelism`` tests in flight across all of them."""
+    # The same live run everywhere, so the DOM snapshot and CDP-only recorders are off
+    config = replace(config, snapshot_tests=(), trace=False, coverage=False)
+    runners = {engine: SuiteRunner(config, engine) for engine in engines}
+    for runner in runners.values():
+        FrameRecorder().install(runner)
+    run = EngineRun(list(engines))
+    started = time.perf_counter()
+    launched = await asyncio.gather(*(runner.start() for runner in runners.values()), return_exceptions=True)
+    for engine, outcome in zip(engines, launched):
+        if isinstance(outcome, Exception):
+            run.errors[engine] = (str(outcome).strip().splitlines() or [type(outcome).__name__])[0]
+    try:
+        semaphore = asyncio.Semaphore(max(1, config.parallelism))
+        # Test by test, so no engine gets the machine to itself
+        jobs = [(engine, runners[engine].run([case], semaphore)) for case in cases for engine in engines
+                if engine not in run.errors]
+        outcomes = await asyncio.gather(*(job for _, job in jobs))
+    finally:
+        await asyncio.gather(*(runner.stop() for runner in runners.values()), return_exceptions=True)
+    run.wall_s = time.perf_counter() - started
+    for engine in engines:
+        if engine in run.errors:
+            message = f"{engine} did not launch: {run.errors[engine]}"
+            run.results[engine] = [TestResult(case.id, case.title, ERROR, 0.0, message) for case in cases]
+        else:
+            run.results[engine] = [results[0] for (name, _), results in zip(jobs, outcomes) if name == engine]
+    return run
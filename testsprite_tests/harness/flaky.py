@@ -0,0 +1,150 @@
+"""Flake detection from the run history: targeted retries and quarantine.
+
+Every attempt of every test is in ``history.sqlite``.  Over a test's last
+``WINDOW`` runs, a failed attempt counts as *flaky* when nothing changed
+and the test passed anyway: a later attempt of the same run passed, or
+the runs just before and after it passed (a P-F-P flip).  From that:
+
+* ``p_flaky`` -- the chance a fresh failure is a flake, the posterior
+  mean ``(flaky + 0.5) / (failures + 2)`` under a prior that says most
+  failures are real.  A failed test is retried only when it is at least
+  ``RETRY_THRESHOLD``, and only as often as it takes for a flaky test to
+  pass with 95% confidence given its per-attempt flaky failure rate (at
+  most ``MAX_RETRIES``).  A test with a clean or consistently red record
+  fails fast instead of costing a rerun.
+* ``score`` -- the share of runs that gave a consistent verdict, smoothed
+  the same way.  Once a test has ``MIN_RUNS`` runs and its score drops
+  below ``QUARANTINE_BELOW`` it moves to the quarantine lane: it still
+  runs and is recorded, so it leaves quarantine by itself once its flaky
+  runs age out of the window, but it no longer decides the exit status.
+* ``wasted_s`` -- test time spent without producing a verdict: attempts
+  superseded by a retry plus every attempt of a flipped run, which
+  somebody had to rerun.  ``python -m harness flaky`` ranks tests by it.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+
+from .history import History
+from .report import PASSED
+
+# Runs per test the statistics look back over
+WINDOW = 30
+# Pseudo-counts of flaky and real failures before any history
+PRIOR_FLAKY = 0.5
+PRIOR_REAL = 1.5
+# Retry a failure when at least this likely to be a flake
+RETRY_THRESHOLD = 0.3
+MAX_RETRIES = 2
+# Chance a flaky test should get to pass within its retries
+RETRY_CONFIDENCE = 0.95
+# Quarantine tests with fewer consistent runs than this
+QUARANTINE_BELOW = 0.8
+MIN_RUNS = 5
+
+
+@dataclass
+class Attempt:
+    started_at: float
+    attempt: int
+    status: str
+    duration: float
+
+
+@dataclass
+class Stability:
+    test_id: str
+    runs: int = 0
+    attempts: int = 0
+    failures: int = 0
+    flaky_failures: int = 0
+    # Runs with a flaky failure in them
+    flaky_runs: int = 0
+    wasted_s: float = 0.0
+
+    @property
+    def p_flaky(self) -> float:
+        """Posterior probability that a failure of this test is a flake."""
+        return (self.flaky_failures + PRIOR_FLAKY) / (self.failures + PRIOR_FLAKY + PRIOR_REAL)
+
+    @property
+    def score(self) -> float:
+        """Smoothed share of runs whose attempts agreed on one verdict."""
+        return (self.runs - self.flaky_runs + 1) / (self.runs + 2)
+
+    @property
+    def quarantined(self) -> bool:
+        return self.runs >= MIN_RUNS and self.score < QUARANTINE_BELOW
+
+    @property
+    def retries(self) -> int:
+        if self.quarantined or self.p_flaky < RETRY_THRESHOLD:
+            return 0
+        # Chance one attempt of this test fails spuriously
+        rate = (self.flaky_failures + PRIOR_FLAKY) / (self.attempts + PRIOR_FLAKY + PRIOR_REAL)
+        needed = math.ceil(math.log(1 - RETRY_CONFIDENCE) / math.log(rate))
+        return max(1, min(MAX_RETRIES, needed))
+
+
+def stability(test_id: str, attempts: list[Attempt]) -> Stability:
+    """Statistics for one test from its attempts, oldest first."""
+    result = Stability(test_id, attempts=len(attempts))
+    runs: list[list[Attempt]] = []
+    for attempt in attempts:
+        if runs and runs[-1][0].started_at == attempt.started_at:
+            runs[-1].append(attempt)
+        else:
+            runs.append([attempt])
+    result.runs = len(runs)
+    verdicts = [run[-1].status == PASSED for run in runs]
+    for index, run in enumerate(runs):
+        failed = [attempt for attempt in run if attempt.status != PASSED]
+        result.failures += len(failed)
+        if verdicts[index] and failed:
+            flaky = len(failed)
+            result.wasted_s += sum(attempt.duration for attempt in run[:-1])
+        elif not verdicts[index] and 0 < index < len(runs) - 1 and verdicts[index - 1] and verdicts[index + 1]:
+            flaky = len(failed)
+            result.wasted_s += sum(attempt.duration for attempt in run)
+        else:
+            continue
+        result.flaky_failures += flaky
+        result.flaky_runs += 1
+    return result
+
+
+@dataclass
+class Policy:
+    """What the next run does with each test."""
+
+    stats: dict[str, Stability] = field(default_factory=dict)
+
+    @property
+    def retries(self) -> dict[str, int]:
+        return {test_id: stat.retries for test_id, stat in self.stats.items() if stat.retries}
+
+    @property
+    def quarantined(self) -> set[str]:
+        return {test_id for test_id, stat in self.stats.items() if stat.quarantined}
+
+    def format(self, top: int | None = None) -> str:
+        ranked = sorted(self.stats.values(), key=lambda stat: (-stat.wasted_s, stat.score, stat.test_id))
+        lines = [f"{'test':<8}{'runs':>6}{'fails':>7}{'flaky':>7}{'P(flake)':>10}{'score':>7}{'wasted min':>12}  action"]
+        for stat in ranked[:top]:
+            action = "quarantine" if stat.quarantined else f"retry x{stat.retries}" if stat.retries else ""
+            lines.append(
+                f"{stat.test_id:<8}{stat.runs:>6}{stat.failures:>7}{stat.flaky_failures:>7}"
+                f"{stat.p_flaky:>10.2f}{stat.score:>7.2f}{stat.wasted_s / 60:>12.1f}  {action}"
+            )
+        total = sum(stat.wasted_s for stat in self.stats.values())
+        lines.append(f"{total / 60:.1f} test minutes wasted on flaky attempts over the last {WINDOW} runs")
+        return "\n".join(lines)
+
+
+def policy(history: History, test_ids: list[str] | None = None) -> Policy:
+    """Retry and quarantine decisions for ``test_ids`` (default: every test with history)."""
+    rows = history.test_attempts(WINDOW)
+    ids = test_ids if test_ids is not None else sorted(rows)
+    return Policy({test_id: stability(test_id, [Attempt(*row) for row in rows.get(test_id, [])]) for test_id in ids})
@@ -0,0 +1,330 @@
+"""Self-hosted, subsetted web fonts and what they cost the first screen.
+
+``build`` replaces the render-blocking Google Fonts stylesheet in
+``index.html``.  For every face the components use (``FAMILIES``) it
+fetches the full TrueType file from the css2 API (cached under
+``<output-dir>/fonts``), keeps only the glyphs for printable ASCII plus
+the non-ASCII characters found in the family's sources, and writes a
+WOFF2 file to ``public/fonts``.  The ``<!-- fonts:start -->`` block of
+``index.html`` is then rewritten with inline ``@font-face`` rules
+(``font-display: swap``, ``unicode-range`` from the subset's cmap) and
+``preload`` hints for the faces the first screen renders.  Font files
+under ``src/assets`` that no source mentions are reported as unused.
+Subsetting needs the optional ``fontTools`` and ``brotli`` packages.
+
+``measure_fonts`` loads a target the way ``startup`` does, on a phone
+with a throttled CPU and a slow 4G link, and samples:
+
+* ``font_bytes`` / ``font_requests``: font files fetched (encoded size);
+* ``font_css_ms``: when the last font stylesheet finished loading, 0 with
+  inline rules;
+* ``fonts_done_ms``: when the last ``document.fonts`` load finished;
+* ``font_cls``: layout shift within ``SWAP_WINDOW_MS`` of a font load,
+  i.e. fallback text reflowing on swap;
+* ``lcp_ms`` and ``cls`` from the ``vitals`` observers.
+
+``--target before=... --target after=...`` compares two builds; runs are
+recorded as the ``fonts`` suite and compared with its baseline.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+
+try:
+    from fontTools import subset
+except ImportError:
+    subset = None
+
+from playwright import async_api
+
+from .config import PROJECT_DIR, HarnessConfig
+from .startup import MOBILE
+from .vitals import VITALS_INIT_SCRIPT
+
+SRC_DIR = PROJECT_DIR / "src"
+INDEX_HTML = PROJECT_DIR / "index.html"
+PUBLIC_FONTS_DIR = PROJECT_DIR / "public" / "fonts"
+# URL path ``public/fonts`` is served from
+FONTS_URL = "/fonts"
+
+CSS2_URL = "https://fonts.googleapis.com/css2"
+
+BLOCK_PATTERN = re.compile(r"( *)<!-- fonts:start.*?-->.*?<!-- fonts:end -->", re.DOTALL)
+
+PRINTABLE_ASCII = {chr(code) for code in range(0x20, 0x7F)}
+
+
+@dataclass(frozen=True)
+class Family:
+    name: str
+    # Weights the components ask for (font-normal/medium/semibold/bold)
+    weights: tuple[int, ...]
+    # Globs under src/ whose text the subset must cover
+    sources: tuple[str, ...]
+    # Weights drawn on the first screen
+    preload: tuple[int, ...] = ()
+
+    @property
+    def slug(self) -> str:
+        return self.name.lower().replace(" ", "-")
+
+
+FAMILIES = (
+    # Tailwind ``sans``, the body font
+    Family("Inter", (400, 500, 600, 700), ("**/*.tsx", "**/*.ts"), preload=(400,)),
+    # Tailwind ``font-display``; the navbar logo is bold
+    Family("Space Grotesk", (400, 500, 600, 700), ("**/*.tsx", "**/*.ts"), preload=(700,)),
+    # Only the Hero headline, set inline
+    Family("Orbitron", (700,), ("components/Hero.tsx",), preload=(700,)),
+)
+
+# Lower is better for every metric
+METRICS = ("font_bytes", "font_requests", "font_css_ms", "fonts_done_ms", "font_cls", "lcp_ms", "cls")
+
+# Shifts this soon after a font load are blamed on the swap
+SWAP_WINDOW_MS = 100
+
+# Chrome DevTools "Slow 4G" preset
+SLOW_4G = {
+    "offline": False,
+    "latency": 150,
+    "downloadThroughput": 1.6 * 1024 * 1024 / 8,
+    "uploadThroughput": 750 * 1024 / 8,
+}
+
+FONT_INIT_SCRIPT = """
+(() => {
+  const state = { loads: [], shifts: [] };
+  document.fonts.addEventListener('loadingdone', () => state.loads.push(performance.now()));
+  try {
+    new PerformanceObserver((list) => list.getEntries().forEach((entry) => {
+      if (!entry.hadRecentInput) state.shifts.push({ start: entry.startTime, value: entry.value });
+    })).observe({ type: 'layout-shift', buffered: true });
+  } catch (error) {
+    // Entry type not supported by this engine
+  }
+  window.__leadqFonts = {
+    load(swapWindow) {
+      const stylesheets = performance.getEntriesByType('resource')
+        .filter((entry) => entry.initiatorType === 'link' && /fonts\\.googleapis\\.com|\\/fonts\\/.*\\.css/.test(entry.name));
+      return {
+        font_css_ms: Math.max(0, ...stylesheets.map((entry) => entry.responseEnd)),
+        fonts_done_ms: Math.max(0, ...state.loads),
+        font_cls: state.shifts
+          .filter((shift) => state.loads.some((at) => shift.start >= at && shift.start - at <= swapWindow))
+          .reduce((total, shift) => total + shift.value, 0),
+      };
+    },
+  };
+})();
+"""
+
+
+@dataclass
+class Face:
+    family: str
+    weight: int
+    file: Path
+    source_bytes: int
+    woff2_bytes: int
+    codepoints: list[int]
+
+    @property
+    def unicode_range(self) -> str:
+        return format_unicode_range(self.codepoints)
+
+
+@dataclass
+class FontReport:
+    faces: list[Face] = field(default_factory=list)
+    # Font files under src/ that no source file mentions
+    unused: list[Path] = field(default_factory=list)
+
+    def format(self) -> str:
+        lines = [f"{'face':<24}{'source':>12}{'woff2':>12}{'glyphs':>8}   unicode-range"]
+        for face in self.faces:
+            lines.append(
+                f"{face.family + ' ' + str(face.weight):<24}{face.source_bytes:12d}{face.woff2_bytes:12d}"
+                f"{len(face.codepoints):8d}   {face.unicode_range}"
+            )
+        source = sum(face.source_bytes for face in self.faces)
+        woff2 = sum(face.woff2_bytes for face in self.faces)
+        lines.append(f"{'total':<24}{source:12d}{woff2:12d}")
+        return "\n".join(lines)
+
+
+def format_unicode_range(codepoints: list[int]) -> str:
+    """``U+20-7E, U+A9`` style ranges over sorted, merged codepoints."""
+    ranges: list[list[int]] = []
+    for code in sorted(set(codepoints)):
+        if ranges and code == ranges[-1][1] + 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return ", ".join(f"U+{start:X}" if start == end else f"U+{start:X}-{end:X}" for start, end in ranges)
+
+
+def characters(family: Family, src_dir: Path = SRC_DIR) -> set[str]:
+    """Printable ASCII plus every other printable character in the family's sources."""
+    chars = set(PRINTABLE_ASCII)
+    for pattern in family.sources:
+        for path in src_dir.glob(pattern):
+            chars.update(char for char in path.read_text(encoding="utf-8") if char.isprintable())
+    return chars
+
+
+def unused_font_files(src_dir: Path = SRC_DIR) -> list[Path]:
+    """Font files under ``src_dir`` whose name or family no source mentions."""
+    text = "\n".join(
+        path.read_text(encoding="utf-8")
+        for pattern in ("**/*.ts", "**/*.tsx", "**/*.css")
+        for path in src_dir.glob(pattern)
+    ) + (PROJECT_DIR / "tailwind.config.js").read_text(encoding="utf-8")
+    fonts = [path for extension in (".ttf", ".otf", ".woff", ".woff2") for path in src_dir.rglob(f"*{extension}")]
+    return sorted(path for path in fonts if path.name not in text and path.stem not in text)
+
+
+def source_urls(family: Family) -> dict[int, str]:
+    """TrueType URL per weight.  Without a browser user agent css2 serves whole TTF files."""
+    query = urllib.parse.urlencode(
+        {"family": f"{family.name}:wght@{';'.join(map(str, family.weights))}"}, safe=":@;"
+    )
+    with urllib.request.urlopen(f"{CSS2_URL}?{query}", timeout=30) as response:
+        css = response.read().decode("utf-8")
+    urls: dict[int, str] = {}
+    for block in re.findall(r"@font-face\s*{(.*?)}", css, re.DOTALL):
+        weight = re.search(r"font-weight:\s*(\d+)", block)
+        url = re.search(r"url\((.*?)\)", block)
+        if weight and url:
+            urls[int(weight.group(1))] = url.group(1).strip("'\"")
+    return urls
+
+
+def _download(url: str, cache_dir: Path) -> Path:
+    path = cache_dir / (hashlib.sha256(url.encode("utf-8")).hexdigest()[:16] + Path(urllib.parse.urlsplit(url).path).suffix)
+    if not path.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with urllib.request.urlopen(url, timeout=60) as response:
+            path.write_bytes(response.read())
+    return path
+
+
+def subset_face(family: Family, weight: int, source: Path, chars: set[str], out_dir: Path) -> Face:
+    """Write the WOFF2 subset of ``source`` covering ``chars``."""
+    options = subset.Options()
+    options.flavor = "woff2"
+    # Keep kerning and ligatures; drop hinting, which only helps on low-DPI Windows
+    options.layout_features = ["*"]
+    options.hinting = False
+    options.desubroutinize = True
+    options.name_IDs = []
+    font = subset.load_font(str(source), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=[ord(char) for char in chars])
+    subsetter.subset(font)
+    codepoints = sorted(font.getBestCmap())
+    out_dir.mkdir(parents=True, exist_ok=True)
+    target = out_dir / f"{family.slug}-{weight}.woff2"
+    subset.save_font(font, str(target), options)
+    return Face(family.name, weight, target, source.stat().st_size, target.stat().st_size, codepoints)
+
+
+def render_block(faces: list[Face], indent: str = "    ") -> str:
+    """Preload hints and inline ``@font-face`` rules for ``index.html``."""
+    preloaded = {(family.name, weight) for family in FAMILIES for weight in family.preload}
+    lines = ["<!-- fonts:start: generated by `python -m harness fonts-build` -->"]
+    for face in faces:
+        if (face.family, face.weight) in preloaded:
+            lines.append(f'<link rel="preload" href="{FONTS_URL}/{face.file.name}" as="font" type="font/woff2" crossorigin>')
+    lines.append("<style>")
+    for face in faces:
+        lines.append(
+            f"  @font-face {{ font-family: '{face.family}'; font-style: normal; font-weight: {face.weight}; "
+            f"font-display: swap; src: url({FONTS_URL}/{face.file.name}) format('woff2'); "
+            f"unicode-range: {face.unicode_range}; }}"
+        )
+    lines.append("</style>")
+    lines.append("<!-- fonts:end -->")
+    return "\n".join(indent + line for line in lines)
+
+
+def write_index(block: str, index: Path = INDEX_HTML) -> None:
+    html = index.read_text(encoding="utf-8")
+    if not BLOCK_PATTERN.search(html):
+        raise ValueError(f"{index} has no <!-- fonts:start --> ... <!-- fonts:end --> block")
+    index.write_text(BLOCK_PATTERN.sub(lambda _: block, html, count=1), encoding="utf-8")
+
+
+def build(cache_dir: Path, out_dir: Path = PUBLIC_FONTS_DIR, index: Path = INDEX_HTML) -> FontReport:
+    """Subset every face in ``FAMILIES`` and point ``index.html`` at the result."""
+    if subset is None:
+        raise RuntimeError("subsetting fonts needs fontTools and brotli: pip install fonttools brotli")
+    report = FontReport(unused=unused_font_files())
+    for family in FAMILIES:
+        chars = characters(family)
+        urls = source_urls(family)
+        for weight in family.weights:
+            if weight not in urls:
+                raise RuntimeError(f"{CSS2_URL} has no {family.name} {weight}")
+            report.faces.append(subset_face(family, weight, _download(urls[weight], cache_dir), chars, out_dir))
+    write_index(render_block(report.faces), index)
+    return report
+
+
+async def measure_fonts(browser: async_api.Browser, url: str, cpu_slowdown: float = 4,
+                        settle_ms: float = 3000) -> dict[str, float]:
+    """Load ``url`` once in a fresh, throttled mobile context and return one sample."""
+    context = await browser.new_context(**MOBILE)
+    try:
+        await context.add_init_script(VITALS_INIT_SCRIPT)
+        await context.add_init_script(FONT_INIT_SCRIPT)
+        page = await context.new_page()
+        requests: list[async_api.Request] = []
+        page.on("request", lambda request: requests.append(request) if request.resource_type == "font" else None)
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Emulation.setCPUThrottlingRate", {"rate": cpu_slowdown})
+        await cdp.send("Network.enable")
+        await cdp.send("Network.emulateNetworkConditions", SLOW_4G)
+        await page.goto(url, wait_until="load")
+        await page.wait_for_timeout(settle_ms)
+        vitals = await page.evaluate("window.__leadqVitals.load()")
+        fonts = await page.evaluate("(swapWindow) => window.__leadqFonts.load(swapWindow)", SWAP_WINDOW_MS)
+        font_bytes = 0
+        for request in requests:
+            font_bytes += (await request.sizes())["responseBodySize"]
+    finally:
+        await context.close()
+    return {
+        "font_bytes": float(font_bytes),
+        "font_requests": float(len(requests)),
+        "font_css_ms": float(fonts["font_css_ms"]),
+        "fonts_done_ms": float(fonts["fonts_done_ms"]),
+        "font_cls": float(fonts["font_cls"]),
+        "lcp_ms": float(vitals["lcp_ms"]),
+        "cls": float(vitals["cls"]),
+    }
+
+
+async def collect(config: HarnessConfig, targets: dict[str, str], runs: int, cpu_slowdown: float = 4,
+                  settle_ms: float = 3000) -> dict[str, dict[str, list[float]]]:
+    """Launch a browser and take ``runs`` samples per target."""
+    samples: dict[str, dict[str, list[float]]] = {}
+    async with async_api.async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=config.headless, args=config.browser_args)
+        try:
+            for name, url in targets.items():
+                series: dict[str, list[float]] = {metric: [] for metric in METRICS}
+                for _ in range(runs):
+                    sample = await measure_fonts(browser, url, cpu_slowdown, settle_ms)
+                    for metric in METRICS:
+                        series[metric].append(sample[metric])
+                samples[name] = series
+        finally:
+            await browser.close()
+    return samples
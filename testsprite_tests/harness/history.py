@@ -0,0 +1,156 @@
+"""SQLite history of past test runs and benchmark samples.
+
+The database lives in the harness output directory.  Benchmark samples are
+grouped into runs of a named suite (``vitals``, ``idle``, ...) and keyed by
+a free-form target such as ``preview/cold``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+
+from .report import TestResult
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS test_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    test_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL NOT NULL,
+    started_at REAL NOT NULL,
+    attempt INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS test_runs_test_id ON test_runs (test_id);
+CREATE TABLE IF NOT EXISTS bench_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    suite TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    is_baseline INTEGER NOT NULL DEFAULT 0,
+    note TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS bench_samples (
+    run_id INTEGER NOT NULL REFERENCES bench_runs (id),
+    target TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bench_samples_run ON bench_samples (run_id);
+"""
+
+
+class History:
+    """Append-only record of test outcomes and benchmark samples."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(SCHEMA)
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(test_runs)")}
+        if "attempt" not in columns:
+            # Databases from before retries were recorded
+            with self.db:
+                self.db.execute("ALTER TABLE test_runs ADD COLUMN attempt INTEGER NOT NULL DEFAULT 1")
+
+    @classmethod
+    def open(cls, output_dir: Path) -> "History":
+        return cls(output_dir / "history.sqlite")
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "History":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def record(self, results: list[TestResult], started_at: float | None = None) -> None:
+        """Store every attempt of ``results``; retried ones list theirs in ``metrics["attempts"]``."""
+        started_at = time.time() if started_at is None else started_at
+        rows = []
+        for r in results:
+            earlier = r.metrics.get("attempts", [])
+            rows.extend((r.test_id, a["status"], a["duration"], started_at, n) for n, a in enumerate(earlier, 1))
+            rows.append((r.test_id, r.status, r.duration, started_at, len(earlier) + 1))
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO test_runs (test_id, status, duration, started_at, attempt) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def test_attempts(self, last: int = 30) -> dict[str, list[tuple[float, int, str, float]]]:
+        """(started_at, attempt, status, duration) per test over its ``last`` runs, oldest first."""
+        rows = self.db.execute(
+            """
+            SELECT test_id, started_at, attempt, status, duration FROM (
+                SELECT *, DENSE_RANK() OVER (PARTITION BY test_id ORDER BY started_at DESC) AS n
+                FROM test_runs
+            ) WHERE n <= ? ORDER BY test_id, started_at, attempt, id
+            """,
+            (last,),
+        )
+        attempts: dict[str, list[tuple[float, int, str, float]]] = {}
+        for test_id, started_at, attempt, status, duration in rows:
+            attempts.setdefault(test_id, []).append((started_at, attempt, status, duration))
+        return attempts
+
+    def mean_durations(self, last: int = 10) -> dict[str, float]:
+        """Mean duration per test over its ``last`` recorded runs."""
+        rows = self.db.execute(
+            """
+            SELECT test_id, AVG(duration) FROM (
+                SELECT test_id, duration,
+                       ROW_NUMBER() OVER (PARTITION BY test_id ORDER BY started_at DESC, id DESC) AS n
+                FROM test_runs
+            ) WHERE n <= ? GROUP BY test_id
+            """,
+            (last,),
+        )
+        return {test_id: duration for test_id, duration in rows}
+
+    def record_bench(self, suite: str, samples: dict[str, dict[str, list[float]]], baseline: bool = False,
+                     note: str = "") -> int:
+        """Store ``samples[target][metric]`` as one run of ``suite``; return the run id."""
+        with self.db:
+            run_id = self.db.execute(
+                "INSERT INTO bench_runs (suite, created_at, is_baseline, note) VALUES (?, ?, ?, ?)",
+                (suite, time.time(), int(baseline), note),
+            ).lastrowid
+            self.db.executemany(
+                "INSERT INTO bench_samples (run_id, target, metric, value) VALUES (?, ?, ?, ?)",
+                [
+                    (run_id, target, metric, value)
+                    for target, metrics in samples.items()
+                    for metric, values in metrics.items()
+                    for value in values
+                ],
+            )
+        return run_id
+
+    def baseline_run(self, suite: str, before: int | None = None) -> int | None:
+        """Latest run marked as baseline, else the latest run, older than ``before``."""
+        limit = before if before is not None else 2**62
+        row = self.db.execute(
+            "SELECT id FROM bench_runs WHERE suite = ? AND id < ? ORDER BY is_baseline DESC, id DESC LIMIT 1",
+            (suite, limit),
+        ).fetchone()
+        return row[0] if row else None
+
+    def latest_run(self, suite: str, before: int | None = None) -> int | None:
+        """Latest run of ``suite`` older than ``before``, baseline or not."""
+        limit = before if before is not None else 2**62
+        row = self.db.execute(
+            "SELECT id FROM bench_runs WHERE suite = ? AND id < ? ORDER BY id DESC LIMIT 1",
+            (suite, limit),
+        ).fetchone()
+        return row[0] if row else None
+
+    def bench_samples(self, run_id: int) -> dict[str, dict[str, list[float]]]:
+        samples: dict[str, dict[str, list[float]]] = {}
+        rows = self.db.execute("SELECT target, metric, value FROM bench_samples WHERE run_id = ?", (run_id,))
+        for target, metric, value in rows:
+            samples.setdefault(target, {}).setdefault(metric, []).append(value)
+        return samples
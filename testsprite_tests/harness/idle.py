@@ -0,0 +1,174 @@
+"""Main-thread work of the page at rest, per section.
+
+With no input at all the page still runs ``repeat: Infinity``
+``framer-motion`` loops and repaints the full-viewport ``noise`` overlay
+from ``App.tsx``.  For every section linked from ``navItems`` the benchmark
+parks the viewport on it, lets reveal animations finish, then samples CDP
+``Performance.getMetrics`` over a fixed window.  Each sample is busy
+milliseconds per second of wall time for ``TaskDuration`` (all main-thread
+tasks) and its script, layout and style-recalc parts.
+
+``run_offscreen`` checks that the demos pause once scrolled away.  Each
+demo gets a fresh page: a reference window is measured at the top of the
+page, then the demo is scrolled into view and started, the viewport
+returns to the top and a second window is measured.  The sample is the
+difference, i.e. what the demo still costs while far out of view.
+"""
+
+from __future__ import annotations
+
+import statistics
+
+from playwright import async_api
+
+from .config import HarnessConfig
+from .leaks import REPLAY_SELECTORS
+from .pool import consent_storage_state
+from .sections import component_for, nav_section_ids
+
+# Demos with stage timers or infinite loops; Workflow is not mounted in App.tsx
+DEMO_SECTIONS = ("dashboard", "profile-research", "bookings-meeting", "email-draft", "workflow")
+
+# Performance.getMetrics durations (seconds) reported as ms per second
+IDLE_METRICS = ("TaskDuration", "ScriptDuration", "LayoutDuration", "RecalcStyleDuration")
+
+# Scrolls without smooth-scroll so the window starts with the section in place
+PARK_SCRIPT = """
+(id) => {
+  const section = document.getElementById(id);
+  if (!section) return false;
+  section.scrollIntoView({ block: 'start', behavior: 'instant' });
+  return true;
+}
+"""
+
+# The hero, far above every demo section
+PARK_TOP_SCRIPT = "() => window.scrollTo({ top: 0, behavior: 'instant' })"
+
+
+async def _metrics(cdp: async_api.CDPSession) -> dict[str, float]:
+    return {m["name"]: m["value"] for m in (await cdp.send("Performance.getMetrics"))["metrics"]}
+
+
+async def _busy(page: async_api.Page, cdp: async_api.CDPSession, window_ms: float) -> dict[str, float]:
+    before = await _metrics(cdp)
+    await page.wait_for_timeout(window_ms)
+    after = await _metrics(cdp)
+    elapsed = after["Timestamp"] - before["Timestamp"]
+    return {metric: 1000 * (after.get(metric, 0) - before.get(metric, 0)) / elapsed for metric in IDLE_METRICS}
+
+
+async def park(page: async_api.Page, cdp: async_api.CDPSession, section: str, window_ms: float,
+               settle_ms: float) -> dict[str, float] | None:
+    """Busy ms/s per metric with the viewport on ``section``; ``None`` if it is missing."""
+    if not await page.evaluate(PARK_SCRIPT, section):
+        return None
+    await page.wait_for_timeout(settle_ms)
+    return await _busy(page, cdp, window_ms)
+
+
+async def offscreen_cost(page: async_api.Page, cdp: async_api.CDPSession, section: str, window_ms: float,
+                         settle_ms: float) -> dict[str, float] | None:
+    """Busy ms/s ``section`` adds once started and scrolled out of view; ``None`` if it is missing."""
+    await page.evaluate(PARK_TOP_SCRIPT)
+    await page.wait_for_timeout(settle_ms)
+    reference = await _busy(page, cdp, window_ms)
+    if not await page.evaluate(PARK_SCRIPT, section):
+        return None
+    if section in REPLAY_SELECTORS:
+        await page.locator(REPLAY_SELECTORS[section]).first.click()
+    await page.wait_for_timeout(settle_ms)
+    await page.evaluate(PARK_TOP_SCRIPT)
+    await page.wait_for_timeout(settle_ms)
+    offscreen = await _busy(page, cdp, window_ms)
+    return {metric: offscreen[metric] - reference[metric] for metric in IDLE_METRICS}
+
+
+async def run_idle(browser: async_api.Browser, url: str, sections: list[str], runs: int,
+                   window_ms: float = 5000, settle_ms: float = 1500) -> tuple[dict[str, dict[str, list[float]]], list[str]]:
+    """Samples keyed by section, plus the sections the page does not have."""
+    samples: dict[str, dict[str, list[float]]] = {}
+    missing: list[str] = []
+    context = await browser.new_context(
+        viewport={"width": 1280, "height": 720},
+        storage_state=consent_storage_state([url]),
+    )
+    try:
+        page = await context.new_page()
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Performance.enable")
+        await page.goto(url, wait_until="load")
+        for _ in range(runs):
+            for section in sections:
+                if section in missing:
+                    continue
+                sample = await park(page, cdp, section, window_ms, settle_ms)
+                if sample is None:
+                    missing.append(section)
+                    continue
+                series = samples.setdefault(section, {metric: [] for metric in IDLE_METRICS})
+                for metric, value in sample.items():
+                    series[metric].append(value)
+    finally:
+        await context.close()
+    return samples, missing
+
+
+async def run_offscreen(browser: async_api.Browser, url: str, sections: list[str], runs: int,
+                        window_ms: float = 5000, settle_ms: float = 1500) -> tuple[dict[str, dict[str, list[float]]], list[str]]:
+    """Offscreen cost samples keyed by section, plus the sections the page does not have."""
+    samples: dict[str, dict[str, list[float]]] = {}
+    missing: list[str] = []
+    context = await browser.new_context(
+        viewport={"width": 1280, "height": 720},
+        storage_state=consent_storage_state([url]),
+    )
+    try:
+        for _ in range(runs):
+            for section in sections:
+                if section in missing:
+                    continue
+                page = await context.new_page()
+                try:
+                    cdp = await context.new_cdp_session(page)
+                    await cdp.send("Performance.enable")
+                    await page.goto(url, wait_until="load")
+                    sample = await offscreen_cost(page, cdp, section, window_ms, settle_ms)
+                finally:
+                    await page.close()
+                if sample is None:
+                    missing.append(section)
+                    continue
+                series = samples.setdefault(section, {metric: [] for metric in IDLE_METRICS})
+                for metric, value in sample.items():
+                    series[metric].append(value)
+    finally:
+        await context.close()
+    return samples, missing
+
+
+async def collect(config: HarnessConfig, sections: list[str] | None, runs: int, window_ms: float,
+                  settle_ms: float, offscreen: bool = False) -> tuple[dict[str, dict[str, list[float]]], list[str]]:
+    """Launch a browser and park on ``sections`` (default: the nav targets, or the demos when ``offscreen``)."""
+    async with async_api.async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=config.headless, args=config.browser_args)
+        try:
+            if offscreen:
+                return await run_offscreen(browser, config.base_url, sections or list(DEMO_SECTIONS), runs,
+                                           window_ms, settle_ms)
+            return await run_idle(browser, config.base_url, sections or nav_section_ids(), runs, window_ms, settle_ms)
+        finally:
+            await browser.close()
+
+
+def format_table(samples: dict[str, dict[str, list[float]]], unit: str = "ms busy per second") -> str:
+    """Median busy ms/s per section, busiest first."""
+    header = f"{'section':<18}{'component':<20}" + "".join(f"{metric.replace('Duration', ''):>12}" for metric in IDLE_METRICS)
+    lines = [header + f"   ({unit})"]
+    medians = {
+        section: [statistics.median(metrics[metric]) for metric in IDLE_METRICS]
+        for section, metrics in samples.items()
+    }
+    for section, values in sorted(medians.items(), key=lambda item: -item[1][0]):
+        lines.append(f"{section:<18}{component_for(section):<20}" + "".join(f"{value:12.1f}" for value in values))
+    return "\n".join(lines)
@@ -0,0 +1,496 @@
+"""Test-impact analysis: run only the TC scripts a change can affect.
+
+Every test loads the whole landing page, so which *files* a test touches
+says little; which *lines* it runs does.  ``run --coverage`` records V8
+precise coverage (function call counts) for every page a test opens,
+maps the executed ranges of each served chunk back to source lines
+through the hidden sourcemaps of the analysis build (``LEADQ_ANALYZE``),
+and stores per file which tests ran which lines in
+``<output-dir>/impact.json``.  Modules fetched from the dev server
+(``/src/...``) have no usable mapping and count as wholly run.
+
+The line numbers in the map belong to the commit it was recorded at, so
+``run --changed-since REF`` reads the changes since that commit, adds the
+ones between ``REF`` and it (``git diff REF <commit>``, read on the
+commit's side so their lines line up too) and selects:
+
+* for a file under ``src/`` reachable from ``main.tsx`` in the import
+  graph: the tests whose covered lines meet the changed lines (every
+  test covering the file when a changed line compiled to no code); a file
+  no test has covered yet falls back to the tests covering its importers;
+* for a TC script: that test;
+* for a source file ``main.tsx`` cannot reach (``Testimonials.tsx``,
+  ``Workflow.tsx``, ...) or a Markdown file: nothing;
+* for anything else (styles, ``index.html``, build config, dependencies,
+  the harness itself): everything.
+
+With no map yet, or once ``--full-every`` selective runs have passed
+since the last full one, the whole suite runs with coverage instead and
+the map is rebuilt.  Only such full runs write the map: coverage from a
+partial run was taken on another build and its line runs would not line
+up with the rest.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import subprocess
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+from playwright import async_api
+
+from .config import PROJECT_DIR
+from .loader import TEST_FILE_PATTERN
+from .report import TestResult
+from .server import DIST_DIR
+from .sourcemaps import segments
+
+IMPACT_FILE = "impact.json"
+
+SRC_DIR = PROJECT_DIR / "src"
+ENTRY = SRC_DIR / "main.tsx"
+
+SOURCE_EXTENSIONS = (".tsx", ".ts", ".jsx", ".js")
+
+# Stands for every line of a file whose coverage cannot be mapped to lines
+WHOLE_FILE = 0
+
+# Harness code and fixtures change how every test runs
+HARNESS_PATHS = ("testsprite_tests/harness/", "testsprite_tests/fixtures/")
+
+_IMPORT = re.compile(
+    r"""(?:^|[;\s])(?:import|export)\s[^'";]*?\sfrom\s*['"]([^'"]+)['"]"""
+    r"""|\bimport\s*\(\s*['"]([^'"]+)['"]\s*\)"""
+    r"""|(?:^|[;\s])import\s*['"]([^'"]+)['"]""",
+    re.MULTILINE,
+)
+_DIFF_FILE = re.compile(r"^diff --git a/(.+) b/(.+)$")
+_HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+# -- import graph -----------------------------------------------------------
+
+
+def _resolve(specifier: str, importer: Path) -> Path | None:
+    if specifier.startswith("@/"):
+        base = SRC_DIR / specifier[2:]
+    elif specifier.startswith("."):
+        base = importer.parent / specifier
+    else:
+        # A package under node_modules
+        return None
+    candidates = [base] + [base.with_name(base.name + ext) for ext in SOURCE_EXTENSIONS]
+    candidates += [base / f"index{ext}" for ext in SOURCE_EXTENSIONS]
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate.resolve()
+    return None
+
+
+def _relative(path: Path) -> str:
+    return path.resolve().relative_to(PROJECT_DIR.resolve()).as_posix()
+
+
+def import_graph(entry: Path = ENTRY) -> dict[str, set[str]]:
+    """Project-relative module -> modules it imports, for everything ``entry`` reaches."""
+    graph: dict[str, set[str]] = {}
+    pending = [entry.resolve()]
+    while pending:
+        path = pending.pop()
+        key = _relative(path)
+        if key in graph:
+            continue
+        graph[key] = set()
+        if path.suffix not in SOURCE_EXTENSIONS:
+            continue
+        for match in _IMPORT.finditer(path.read_text(encoding="utf-8")):
+            target = _resolve(next(group for group in match.groups() if group), path)
+            if target is not None:
+                graph[key].add(_relative(target))
+                pending.append(target)
+    return graph
+
+
+def importers(graph: dict[str, set[str]]) -> dict[str, set[str]]:
+    reverse: dict[str, set[str]] = defaultdict(set)
+    for module, imports in graph.items():
+        for target in imports:
+            reverse[target].add(module)
+    return reverse
+
+
+# -- coverage ---------------------------------------------------------------
+
+
+def mapped_lines(dist_dir: Path = DIST_DIR) -> dict[str, set[int]]:
+    """Source lines that produced any code in the build, per project-relative file."""
+    mapped: dict[str, set[int]] = defaultdict(set)
+    for path in sorted(dist_dir.glob("assets/*.js.map")):
+        for _, _, source, line in segments(json.loads(path.read_text(encoding="utf-8"))):
+            mapped[source].add(line)
+    return dict(mapped)
+
+
+def covered_lines(code: str, sourcemap: dict, ranges: list[dict]) -> dict[str, set[int]]:
+    """1-based source lines per project-relative file whose generated code ran.
+
+    ``ranges`` are V8 coverage ranges, properly nested; the innermost range
+    around a mapping segment decides whether it ran.  Offsets and columns
+    are taken as code points, exact for the ASCII minified output is.
+    """
+    starts = [0]
+    for line in code.split("\n"):
+        starts.append(starts[-1] + len(line) + 1)
+    segments = [
+        (starts[number] + column, source, line)
+        for number, column, source, line in segments(sourcemap)
+        if number < len(starts) - 1
+    ]
+    intervals = sorted(((r["startOffset"], r["endOffset"], r["count"]) for r in ranges), key=lambda r: (r[0], -r[1]))
+    covered: dict[str, set[int]] = defaultdict(set)
+    stack: list[tuple[int, int]] = []
+    index = 0
+    for position, path, line in sorted(segments):
+        while index < len(intervals) and intervals[index][0] <= position:
+            start, end, count = intervals[index]
+            while stack and stack[-1][0] <= start:
+                stack.pop()
+            stack.append((end, count))
+            index += 1
+        while stack and stack[-1][0] <= position:
+            stack.pop()
+        if stack and stack[-1][1] > 0:
+            covered[path].add(line)
+    return dict(covered)
+
+
+def to_ranges(lines: set[int]) -> list[list[int]]:
+    """Sorted lines as inclusive ``[first, last]`` runs."""
+    runs: list[list[int]] = []
+    for line in sorted(lines):
+        if runs and line == runs[-1][1] + 1:
+            runs[-1][1] = line
+        else:
+            runs.append([line, line])
+    return runs
+
+
+class PageCoverage:
+    """V8 precise coverage of one page, started as soon as the object is created."""
+
+    def __init__(self, context: async_api.BrowserContext, page: async_api.Page):
+        self.context = context
+        self.page = page
+        self.cdp: async_api.CDPSession | None = None
+        self.started = asyncio.ensure_future(self._start())
+
+    async def _start(self) -> None:
+        self.cdp = await self.context.new_cdp_session(self.page)
+        await self.cdp.send("Profiler.enable")
+        await self.cdp.send("Profiler.startPreciseCoverage", {"callCount": True, "detailed": False})
+
+    async def take(self) -> list[dict]:
+        await self.started
+        assert self.cdp is not None
+        return (await self.cdp.send("Profiler.takePreciseCoverage"))["result"]
+
+
+class CoverageRecorder:
+    """Runner plugin putting each test's covered source lines in ``metrics["coverage"]``."""
+
+    def __init__(self, dist_dir: Path = DIST_DIR):
+        self.dist_dir = dist_dir
+        # Per test session, so the variants of one case keep their own pages
+        self._pages: dict[Any, list[PageCoverage]] = defaultdict(list)
+        self._chunks: dict[str, tuple[str, dict] | None] = {}
+
+    def install(self, runner: Any) -> None:
+        runner.context_hooks.append(self.on_context)
+        runner.finish_hooks.append(self.on_finish)
+
+    async def on_context(self, context: async_api.BrowserContext, session: Any) -> None:
+        pages = self._pages[session]
+        context.on("page", lambda page: pages.append(PageCoverage(context, page)))
+
+    async def on_finish(self, session: Any, result: TestResult) -> None:
+        lines: dict[str, set[int]] = defaultdict(set)
+        for coverage in self._pages.pop(session, []):
+            try:
+                scripts = await coverage.take()
+            except async_api.Error as exc:
+                result.metrics["coverage_error"] = str(exc).splitlines()[0]
+                continue
+            for script in scripts:
+                for path, covered in self._map_script(script).items():
+                    lines[path].update(covered)
+        result.metrics["coverage"] = {
+            path: to_ranges(covered) for path, covered in sorted(lines.items()) if path.startswith("src/")
+        }
+
+    def _map_script(self, script: dict) -> dict[str, set[int]]:
+        url_path = urlsplit(script.get("url", "")).path
+        ranges = [r for function in script["functions"] for r in function["ranges"]]
+        if url_path.startswith("/src/"):
+            ran = any(r["count"] > 0 for r in ranges)
+            return {url_path[1:]: {WHOLE_FILE}} if ran else {}
+        chunk = self._chunk(url_path)
+        if chunk is None:
+            return {}
+        code, sourcemap = chunk
+        return covered_lines(code, sourcemap, ranges)
+
+    def _chunk(self, url_path: str) -> tuple[str, dict] | None:
+        if url_path not in self._chunks:
+            path = self.dist_dir / url_path.lstrip("/")
+            sourcemap = path.with_name(path.name + ".map")
+            if path.suffix == ".js" and path.is_file() and sourcemap.is_file():
+                self._chunks[url_path] = (
+                    path.read_text(encoding="utf-8"),
+                    json.loads(sourcemap.read_text(encoding="utf-8")),
+                )
+            else:
+                self._chunks[url_path] = None
+        return self._chunks[url_path]
+
+
+# -- the map ----------------------------------------------------------------
+
+
+@dataclass
+class ImpactMap:
+    # Source file -> test id -> inclusive line runs the test executed
+    files: dict[str, dict[str, list[list[int]]]] = field(default_factory=dict)
+    # Source file -> line runs that produced code in the build the map was made from
+    mapped: dict[str, list[list[int]]] = field(default_factory=dict)
+    built_at: float = 0.0
+    commit: str = ""
+    runs_since_full: int = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "ImpactMap | None":
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(data["files"], data["mapped"], data["built_at"], data["commit"], data["runs_since_full"])
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "built_at": self.built_at,
+            "commit": self.commit,
+            "runs_since_full": self.runs_since_full,
+            "files": self.files,
+            "mapped": self.mapped,
+        }
+        path.write_text(json.dumps(data, indent=1, sort_keys=True), encoding="utf-8")
+
+    def update(self, results: list[TestResult]) -> None:
+        """Rebuild the map from a full run's ``results`` and the build it ran on."""
+        self.files = {}
+        for result in results:
+            for path, runs in result.metrics.get("coverage", {}).items():
+                self.files.setdefault(path, {})[result.test_id] = runs
+        self.mapped = {path: to_ranges(lines) for path, lines in mapped_lines().items() if path.startswith("src/")}
+        self.built_at = time.time()
+        self.commit = _git("rev-parse", "HEAD").strip()
+        self.runs_since_full = 0
+
+    def tests_for(self, path: str, lines: set[int] | None) -> set[str]:
+        """Tests that ran any of ``lines`` of ``path`` (any line when ``None``).
+
+        A line that compiled to nothing (an import, a type, a comment) may
+        still change what the rest of the file does, so it counts as every
+        line of the file.
+        """
+        mapped = self.mapped.get(path)
+        if lines is not None and mapped is not None:
+            if any(not any(first <= line <= last for first, last in mapped) for line in lines):
+                lines = None
+        hits = set()
+        for test_id, runs in self.files.get(path, {}).items():
+            if lines is None or any(first == WHOLE_FILE for first, _ in runs):
+                hits.add(test_id)
+            elif any(first <= line <= last for first, last in runs for line in lines):
+                hits.add(test_id)
+        return hits
+
+
+# -- selection --------------------------------------------------------------
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(["git", *args], cwd=PROJECT_DIR, capture_output=True, text=True, check=True).stdout
+
+
+def changed_lines(ref: str, target: str | None = None) -> dict[str, set[int] | None]:
+    """Project-relative path -> changed lines (``None``: whole file).
+
+    Without ``target`` the working tree is diffed against ``ref`` and the
+    lines are those on the ``ref`` side; with it, ``ref`` is diffed against
+    ``target`` and the lines are those on the ``target`` side.
+    """
+    changes: dict[str, set[int] | None] = {}
+    current: str | None = None
+    args = (ref, target) if target else (ref,)
+    for line in _git("diff", "--unified=0", "--no-color", "--no-ext-diff", *args, "--").splitlines():
+        match = _DIFF_FILE.match(line)
+        if match:
+            old, new = match.groups()
+            current = new if target else old
+            changes.setdefault(current, set())
+            if new != old:
+                changes[old] = changes[new] = None
+            continue
+        if current is None:
+            continue
+        if line.startswith(("new file mode", "deleted file mode")):
+            changes[current] = None
+            continue
+        hunk = _HUNK.match(line)
+        if hunk and changes[current] is not None:
+            start, count = hunk.group(3, 4) if target else hunk.group(1, 2)
+            start, count = int(start), int(count or 1)
+            # A pure insertion sits between line ``start`` and the next one
+            changes[current].update(range(start, start + count) if count else (start, start + 1))
+    if target is None:
+        for path in _git("ls-files", "--others", "--exclude-standard").splitlines():
+            changes[path] = None
+    return changes
+
+
+def merge_changes(*changes: dict[str, set[int] | None]) -> dict[str, set[int] | None]:
+    """Union of several ``changed_lines`` results; a whole file stays whole."""
+    merged: dict[str, set[int] | None] = {}
+    for change in changes:
+        for path, lines in change.items():
+            if lines is None or (path in merged and merged[path] is None):
+                merged[path] = None
+            else:
+                merged[path] = merged.get(path, set()) | lines
+    return merged
+
+
+@dataclass
+class Selection:
+    tests: set[str] = field(default_factory=set)
+    # Why the whole suite has to run, if it does
+    full_reason: str = ""
+    # Test id -> changed files that selected it
+    reasons: dict[str, set[str]] = field(default_factory=lambda: defaultdict(set))
+    ignored: list[str] = field(default_factory=list)
+    # Commit of the map, when its changes were added to the ones asked for
+    base: str = ""
+
+    @property
+    def full(self) -> bool:
+        return bool(self.full_reason)
+
+    def add(self, tests: set[str], path: str) -> None:
+        self.tests |= tests
+        for test_id in tests:
+            self.reasons[test_id].add(path)
+
+    def format(self) -> str:
+        if self.full:
+            return f"running every test: {self.full_reason}"
+        lines = [f"{len(self.tests)} impacted test(s)"]
+        if self.base:
+            lines[0] += f" (with the changes since {self.base[:10]}, where {IMPACT_FILE} was recorded)"
+        for test_id in sorted(self.tests):
+            lines.append(f"  {test_id}  <- {', '.join(sorted(self.reasons[test_id]))}")
+        for path in self.ignored:
+            lines.append(f"  (no test reaches {path})")
+        return "\n".join(lines)
+
+
+def select(changes: dict[str, set[int] | None], impact_map: ImpactMap, all_ids: list[str],
+           graph: dict[str, set[str]] | None = None) -> Selection:
+    """Tests affected by ``changes`` according to ``impact_map``."""
+    graph = import_graph() if graph is None else graph
+    reverse = importers(graph)
+    selection = Selection()
+    for path, lines in sorted(changes.items()):
+        name = Path(path).name
+        if path.startswith(HARNESS_PATHS):
+            selection.full_reason = f"{path} is part of the harness"
+        elif path.startswith("testsprite_tests/"):
+            match = TEST_FILE_PATTERN.match(name)
+            if match and match.group(1) in all_ids:
+                selection.add({match.group(1)}, path)
+            else:
+                selection.ignored.append(path)
+        elif path.endswith(".md"):
+            selection.ignored.append(path)
+        elif path.startswith("src/") and path.endswith(SOURCE_EXTENSIONS):
+            if path not in graph:
+                selection.ignored.append(path)
+                continue
+            tests = impact_map.tests_for(path, lines)
+            if path not in impact_map.files:
+                tests = _via_importers(path, impact_map, reverse)
+                if not tests:
+                    selection.full_reason = f"no test has covered {path} or its importers yet"
+            selection.add(tests & set(all_ids), path)
+        else:
+            selection.full_reason = f"{path} affects the whole page"
+    if selection.full:
+        selection.tests = set(all_ids)
+    return selection
+
+
+def _via_importers(path: str, impact_map: ImpactMap, reverse: dict[str, set[str]]) -> set[str]:
+    seen = {path}
+    pending = list(reverse.get(path, ()))
+    tests: set[str] = set()
+    while pending:
+        module = pending.pop()
+        if module in seen:
+            continue
+        seen.add(module)
+        if module in impact_map.files:
+            tests |= impact_map.tests_for(module, None)
+        else:
+            pending.extend(reverse.get(module, ()))
+    return tests
+
+
+def plan(ref: str, map_path: Path, all_ids: list[str], full_every: int) -> Selection:
+    """``select`` with the periodic full run: the whole suite when the map is missing or due."""
+    impact_map = ImpactMap.load(map_path)
+    if impact_map is None:
+        return Selection(set(all_ids), f"no {IMPACT_FILE} yet; this run builds it")
+    if full_every and impact_map.runs_since_full + 1 >= full_every:
+        return Selection(set(all_ids), f"{impact_map.runs_since_full} selective runs since the last full run")
+    try:
+        _git("cat-file", "-e", f"{impact_map.commit}^{{commit}}")
+    except subprocess.CalledProcessError:
+        return Selection(set(all_ids), f"{IMPACT_FILE} was recorded at {impact_map.commit[:10] or 'no commit'}, "
+                                       "which this repository does not have")
+    changes = changed_lines(impact_map.commit)
+    if _git("rev-parse", ref).strip() == impact_map.commit:
+        return select(changes, impact_map, all_ids)
+    selection = select(merge_changes(changes, changed_lines(ref, impact_map.commit)), impact_map, all_ids)
+    selection.base = impact_map.commit
+    return selection
+
+
+def record_selective_run(map_path: Path) -> None:
+    impact_map = ImpactMap.load(map_path)
+    if impact_map is not None:
+        impact_map.runs_since_full += 1
+        impact_map.save(map_path)
+
+
+def update_map(map_path: Path, results: list[TestResult]) -> ImpactMap:
+    impact_map = ImpactMap.load(map_path) or ImpactMap()
+    impact_map.update(results)
+    impact_map.save(map_path)
+    return impact_map
+
@@ -0,0 +1,141 @@
+"""Heap and DOM growth across repeated replays of the demo sections.
+
+``EmailDraftAnimation``, ``ProfileResearch`` and ``BookingsMeeting`` each
+have a replay button that schedules a fresh ``setTimeout`` chain.  For each
+demo one page replays it ``cycles`` times on Playwright's fake clock (a
+cycle is the demo's full timeline, see ``clock.STAGE_TIMELINES``).  After
+every cycle the page is garbage collected over CDP and ``Performance``
+metrics are sampled; the least-squares slope of each metric over the
+cycles, warm-up excluded, is the per-cycle growth checked against a
+``LeakBudget``.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, fields
+
+from playwright import async_api
+
+from .clock import STAGE_TIMELINES
+from .config import HarnessConfig
+from .perf import BUDGETS_PATH
+from .pool import consent_storage_state
+from .stats import slope
+
+# Performance.getMetrics names sampled after each cycle
+LEAK_METRICS = ("JSHeapUsedSize", "Nodes", "JSEventListeners", "Documents")
+
+# Replay control of each demo, by section id
+REPLAY_SELECTORS = {
+    "email-draft": '#email-draft button:text-matches("Start Demo|Replay")',
+    "profile-research": '#profile-research button:text-matches("Start Research Demo|Replay Demo")',
+    "bookings-meeting": "#bookings-meeting button:has(svg.lucide-rotate-ccw)",
+}
+
+# Slack after the last scheduled timeout of a cycle
+CYCLE_MARGIN_MS = 500
+
+
+def cycle_ms(section: str) -> int:
+    return max(STAGE_TIMELINES[section].values()) + CYCLE_MARGIN_MS
+
+
+@dataclass
+class LeakBudget:
+    """Largest tolerated growth per replay cycle."""
+
+    JSHeapUsedSize: float = 256 * 1024
+    Nodes: float = 50
+    JSEventListeners: float = 10
+    Documents: float = 0.5
+
+    @classmethod
+    def load(cls) -> "LeakBudget":
+        """Overrides from the ``leaks`` entry of ``perf_budgets.json``."""
+        entry: dict = {}
+        if BUDGETS_PATH.exists():
+            entry = json.loads(BUDGETS_PATH.read_text(encoding="utf-8")).get("leaks", {})
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in entry.items() if key in known})
+
+
+@dataclass
+class LeakReport:
+    section: str
+    warmup: int
+    samples: dict[str, list[float]]
+
+    def growth(self) -> dict[str, float]:
+        """Per-cycle slope of every metric, warm-up cycles excluded."""
+        return {metric: slope(values[self.warmup:]) for metric, values in self.samples.items()}
+
+    def violations(self, budget: LeakBudget) -> list[str]:
+        problems = []
+        for metric, rate in self.growth().items():
+            limit = getattr(budget, metric)
+            if rate > limit:
+                problems.append(f"{metric} +{rate:.1f}/cycle > {limit:.1f}")
+        return problems
+
+    def format(self) -> str:
+        cycles = len(next(iter(self.samples.values()), []))
+        growth = self.growth()
+        parts = [f"{metric} {self.samples[metric][-1]:.0f} ({growth[metric]:+.1f}/cycle)" for metric in LEAK_METRICS]
+        return f"{self.section:<18} {cycles} cycles  " + ", ".join(parts)
+
+
+async def _snapshot(cdp: async_api.CDPSession) -> dict[str, float]:
+    # Two passes: the first can leave objects queued for finalisation
+    await cdp.send("HeapProfiler.collectGarbage")
+    await cdp.send("HeapProfiler.collectGarbage")
+    metrics = {m["name"]: m["value"] for m in (await cdp.send("Performance.getMetrics"))["metrics"]}
+    return {name: float(metrics.get(name, 0)) for name in LEAK_METRICS}
+
+
+async def replay_cycles(context: async_api.BrowserContext, url: str, section: str, cycles: int,
+                        warmup: int = 1) -> LeakReport:
+    """Replay ``section``'s demo ``warmup + cycles`` times in one page."""
+    page = await context.new_page()
+    try:
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Performance.enable")
+        await cdp.send("HeapProfiler.enable")
+        await page.goto(url, wait_until="load")
+        await page.locator(f"#{section}").scroll_into_view_if_needed()
+        replay = page.locator(REPLAY_SELECTORS[section]).first
+        samples: dict[str, list[float]] = {metric: [] for metric in LEAK_METRICS}
+        for _ in range(warmup + cycles):
+            await replay.click()
+            await page.clock.run_for(cycle_ms(section))
+            for metric, value in (await _snapshot(cdp)).items():
+                samples[metric].append(value)
+        return LeakReport(section, warmup, samples)
+    finally:
+        await page.close()
+
+
+async def run_leaks(browser: async_api.Browser, url: str, sections: list[str], cycles: int,
+                    warmup: int = 1) -> list[LeakReport]:
+    reports = []
+    for section in sections:
+        context = await browser.new_context(
+            viewport={"width": 1280, "height": 720},
+            storage_state=consent_storage_state([url]),
+        )
+        try:
+            await context.clock.install()
+            reports.append(await replay_cycles(context, url, section, cycles, warmup))
+        finally:
+            await context.close()
+    return reports
+
+
+async def collect(config: HarnessConfig, sections: list[str], cycles: int, warmup: int = 1) -> list[LeakReport]:
+    """Launch a browser and run the replay cycles against ``config.base_url``."""
+    async with async_api.async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=config.headless, args=config.browser_args)
+        try:
+            return await run_leaks(browser, config.base_url, sections, cycles, warmup)
+        finally:
+            await browser.close()
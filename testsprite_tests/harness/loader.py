@@ -0,0 +1,249 @@
+"""Load the generated TC scripts as coroutines bound to a harness session.
+
+The TestSprite scripts are regenerated often, so they are never edited by
+hand.  Instead each script is compiled without its trailing
+``asyncio.run(run_test())`` and executed in a fresh namespace whose
+``async_api`` name is swapped for a shim.  The shim hands the script a
+context from the harness-owned browser, and turns the script's own
+``launch()``/``close()``/``stop()`` calls into no-ops.
+
+Navigations are trimmed at compile time: recorded URLs are rebased onto
+the URL under test and ``goto`` calls to dev-server module paths such as
+``/src/App.tsx`` are dropped when the target is a production build.  The
+remaining redundant steps (repeated navigations, refills, reopened
+modals) are removed by ``compiler.optimize``.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Protocol
+from urllib.parse import urlsplit
+
+from playwright import async_api
+
+from .compiler import ScriptReport, goto_url, optimize, skip_action_sleeps
+from .config import RECORDED_ORIGINS, TESTS_DIR
+
+TEST_FILE_PATTERN = re.compile(r"^(TC\d{3})_(.+)\.py$")
+
+# Markdown code fences the generator occasionally leaves inside run_test()
+_FENCE_LINE = re.compile(r"^[ \t]*```[\w-]*[ \t]*$", re.MULTILINE)
+
+# Served by the Vite dev server only
+DEV_ONLY_PREFIXES = ("/src/", "/@vite/", "/@react-refresh", "/@fs/", "/node_modules/")
+
+
+@dataclass(frozen=True)
+class TestCase:
+    id: str
+    title: str
+    path: Path
+
+
+class Session(Protocol):
+    """What a loaded script needs from the harness.
+
+    A session may also define ``patch_namespace(namespace)`` to adjust the
+    script's globals after they have been set up.
+    """
+
+    async def new_context(self, **kwargs: Any) -> Any: ...
+
+
+def load_plan(tests_dir: Path = TESTS_DIR) -> dict[str, dict]:
+    """Return the TestSprite test plan keyed by test id."""
+    plan_path = tests_dir / "testsprite_frontend_test_plan.json"
+    if not plan_path.exists():
+        return {}
+    with plan_path.open(encoding="utf-8") as fh:
+        return {entry["id"]: entry for entry in json.load(fh)}
+
+
+def discover(tests_dir: Path = TESTS_DIR, ids: list[str] | None = None) -> list[TestCase]:
+    """Find the TC scripts in ``tests_dir``, optionally limited to ``ids``."""
+    plan = load_plan(tests_dir)
+    wanted = {test_id.upper() for test_id in ids} if ids else None
+    cases = []
+    for path in sorted(tests_dir.glob("TC*.py")):
+        match = TEST_FILE_PATTERN.match(path.name)
+        if not match:
+            continue
+        test_id = match.group(1)
+        if wanted is not None and test_id not in wanted:
+            continue
+        title = plan.get(test_id, {}).get("title") or match.group(2).replace("_", " ")
+        cases.append(TestCase(id=test_id, title=title, path=path))
+    if wanted is not None:
+        missing = wanted - {case.id for case in cases}
+        if missing:
+            raise ValueError(f"Unknown test id(s): {', '.join(sorted(missing))}")
+    return cases
+
+
+def clean_source(source: str) -> str:
+    """Undo generator artefacts that keep a script from compiling."""
+    return _FENCE_LINE.sub("", source)
+
+
+def parse_script(case: TestCase) -> ast.Module:
+    source = clean_source(case.path.read_text(encoding="utf-8"))
+    return ast.parse(source, filename=str(case.path))
+
+
+def _is_entry_point(node: ast.stmt) -> bool:
+    # Matches the module-level `asyncio.run(run_test())` the generator appends
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "run"
+        and isinstance(func.value, ast.Name)
+        and func.value.id == "asyncio"
+    )
+
+
+def _trim_block(statements: list[ast.stmt]) -> list[ast.stmt]:
+    kept = [
+        statement for statement in statements
+        if not urlsplit(goto_url(statement) or "").path.startswith(DEV_ONLY_PREFIXES)
+    ]
+    return kept or [ast.Pass()]
+
+
+def rewrite_navigations(tree: ast.Module, base_url: str | None) -> None:
+    """Rebase recorded URLs onto ``base_url`` and drop dev-server-only ``goto`` calls.
+
+    ``localhost``, ``127.0.0.1`` and ``[::1]`` on the dev server's port are
+    the same recorded origin (TC007 retries on ``127.0.0.1``).
+    """
+    rebase = bool(base_url) and base_url.rstrip("/") not in RECORDED_ORIGINS
+    for node in ast.walk(tree):
+        if rebase and isinstance(node, ast.Constant) and isinstance(node.value, str):
+            origin = next((origin for origin in RECORDED_ORIGINS if node.value.startswith(origin)), None)
+            if origin is not None:
+                node.value = base_url.rstrip("/") + node.value[len(origin):]
+    if not rebase:
+        return
+    for node in list(ast.walk(tree)):
+        for name in ("body", "orelse", "finalbody"):
+            block = getattr(node, name, None)
+            if isinstance(block, list) and block and isinstance(block[0], ast.stmt):
+                setattr(node, name, _trim_block(block))
+
+
+class LoadedScript:
+    """A compiled TC script that can be bound to any number of sessions."""
+
+    def __init__(self, case: TestCase, base_url: str | None = None, optimize_steps: bool = True,
+                 auto_wait: bool = False):
+        self.case = case
+        tree = parse_script(case)
+        tree.body = [node for node in tree.body if not _is_entry_point(node)]
+        rewrite_navigations(tree, base_url)
+        self.report = optimize(tree, case.id) if optimize_steps else ScriptReport(case.id)
+        # The replacement call is bound by the step engine, so only with auto-wait
+        if auto_wait:
+            skip_action_sleeps(tree)
+        self.code = compile(ast.fix_missing_locations(tree), str(case.path), "exec")
+
+    def bind(self, session: Session) -> Callable[[], Awaitable[None]]:
+        """Execute the script body and return its ``run_test`` coroutine function."""
+        namespace: dict[str, Any] = {
+            "__name__": f"testsprite_{self.case.id}",
+            "__file__": str(self.case.path),
+        }
+        exec(self.code, namespace)
+        namespace["async_api"] = SessionAsyncApi(session)
+        # Several generated scripts use `expect` without importing it
+        namespace.setdefault("expect", async_api.expect)
+        patch_namespace = getattr(session, "patch_namespace", None)
+        if patch_namespace is not None:
+            patch_namespace(namespace)
+        run_test = namespace.get("run_test")
+        if run_test is None:
+            raise ValueError(f"{self.case.path.name} does not define run_test()")
+        return run_test
+
+
+class SessionAsyncApi:
+    """Stand-in for ``playwright.async_api`` inside a loaded script."""
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(async_api, name)
+
+    def async_playwright(self) -> "_PlaywrightStarter":
+        return _PlaywrightStarter(self._session)
+
+
+class _PlaywrightStarter:
+    def __init__(self, session: Session):
+        self._session = session
+
+    async def start(self) -> "_PlaywrightShim":
+        return _PlaywrightShim(self._session)
+
+    async def __aenter__(self) -> "_PlaywrightShim":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+class _PlaywrightShim:
+    def __init__(self, session: Session):
+        browser_type = _BrowserTypeShim(session)
+        self.chromium = browser_type
+        self.firefox = browser_type
+        self.webkit = browser_type
+
+    async def stop(self) -> None:
+        # The harness owns the Playwright driver
+        return None
+
+
+class _BrowserTypeShim:
+    def __init__(self, session: Session):
+        self._session = session
+
+    async def launch(self, **kwargs: Any) -> "_BrowserShim":
+        # Launch arguments are ignored: the browser is shared across scripts
+        return _BrowserShim(self._session)
+
+
+class _BrowserShim:
+    def __init__(self, session: Session):
+        self._session = session
+
+    async def new_context(self, **kwargs: Any) -> "_ScriptContext":
+        return _ScriptContext(await self._session.new_context(**kwargs))
+
+    async def close(self) -> None:
+        # Contexts are closed by the session; the browser outlives the script
+        return None
+
+
+class _ScriptContext:
+    """A session context whose ``close()`` is left to the session.
+
+    The harness inspects pages after ``run_test`` returns (traces, metrics),
+    so the script's own ``finally: await context.close()`` must not tear
+    them down early.
+    """
+
+    def __init__(self, context: Any):
+        self._context = context
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._context, name)
+
+    async def close(self) -> None:
+        return None
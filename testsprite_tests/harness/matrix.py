@@ -0,0 +1,199 @@
+"""Responsive matrix: navbar tests at several viewports and devices at once.
+
+TC001 (tubelight navbar) and TC003 (mobile menu toggle) were recorded at
+1280x720 only, while ``tubelight-navbar.tsx`` switches layout at the ``md``
+(768px) and ``lg`` (1024px) breakpoints.  ``python -m harness matrix`` runs
+each test once per entry of ``VIEWPORTS``, every run in its own emulated
+context of one shared browser, all of them concurrently; the matrix costs
+about as much wall time as its slowest run.
+
+``LayoutRecorder`` adds evidence the scripts' text assertions cannot give.
+At the end of every run it records, for the page as the test left it:
+
+* which navigation is showing, the desktop pill (``navbar-menu.tsx``) or
+  the hamburger, and the box of every visible ``nav-*`` test id;
+* horizontal overflow of the document and the nav elements sticking out
+  of the viewport;
+* whether the fixed Login/Sign Up buttons overlap the pill;
+* layout shift over the whole run and the part of it caused by the navbar
+  (``layout-shift`` entries whose sources sit inside it).
+
+Results go to ``<output-dir>/matrix.json``.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from playwright import async_api
+
+from .config import HarnessConfig
+from .loader import TestCase
+from .report import TestResult
+from .runner import SuiteRunner
+
+# Tests the matrix runs when none are named
+DEFAULT_TESTS = ("TC001", "TC003")
+
+# Context options per viewport; phones and tablets are emulated with touch
+# and their device pixel ratio so the `md:`/`lg:` breakpoints see real sizes
+VIEWPORTS: dict[str, dict[str, Any]] = {
+    "desktop": {"viewport": {"width": 1280, "height": 720}},
+    "laptop": {"viewport": {"width": 1024, "height": 768}},
+    "tablet": {"viewport": {"width": 768, "height": 1024}, "device_scale_factor": 2, "is_mobile": True, "has_touch": True},
+    "pixel-7": {"viewport": {"width": 412, "height": 915}, "device_scale_factor": 2.625, "is_mobile": True, "has_touch": True},
+    "iphone-14": {"viewport": {"width": 390, "height": 844}, "device_scale_factor": 3, "is_mobile": True, "has_touch": True},
+    "iphone-se": {"viewport": {"width": 375, "height": 667}, "device_scale_factor": 2, "is_mobile": True, "has_touch": True},
+    "fold": {"viewport": {"width": 280, "height": 653}, "device_scale_factor": 3, "is_mobile": True, "has_touch": True},
+}
+
+# Keeps every layout-shift entry with its source nodes, from the first paint
+LAYOUT_INIT_SCRIPT = """
+(() => {
+  const layout = { entries: [], supported: false };
+  window.__leadqLayout = layout;
+  try {
+    new PerformanceObserver((list) => {
+      for (const entry of list.getEntries()) {
+        if (entry.hadRecentInput) continue;
+        layout.entries.push({ value: entry.value, nodes: (entry.sources || []).map((source) => source.node) });
+      }
+    }).observe({ type: 'layout-shift', buffered: true });
+    layout.supported = true;
+  } catch (error) {
+    // Entry type not supported by this engine
+  }
+})();
+"""
+
+# Navbar boxes, overflow, overlaps and layout shift of the page as it is now
+LAYOUT_SCRIPT = """
+() => {
+  // Media queries see the width with the scrollbar, overflow is against the width without
+  const width = document.documentElement.clientWidth;
+  const rect = (element) => {
+    const box = element.getBoundingClientRect();
+    return { x: Math.round(box.x), y: Math.round(box.y), width: Math.round(box.width), height: Math.round(box.height) };
+  };
+  const visible = (element) => {
+    if (!element) return false;
+    const style = getComputedStyle(element);
+    const box = element.getBoundingClientRect();
+    return style.display !== 'none' && style.visibility !== 'hidden' && box.width > 0 && box.height > 0;
+  };
+  const boxes = {};
+  for (const element of document.querySelectorAll('[data-testid^="nav-"]')) {
+    if (visible(element)) boxes[element.dataset.testid] = rect(element);
+  }
+  const solutions = document.querySelector('[data-testid="nav-solutions"]');
+  const pill = solutions && solutions.closest('nav');
+  if (visible(pill)) boxes.nav = rect(pill);
+  const toggle = document.querySelector('[data-testid="nav-mobile-toggle"]');
+  const root = (solutions || toggle) && (solutions || toggle).closest('.fixed');
+  const overlap = (a, b) => Boolean(a && b && a.x < b.x + b.width && b.x < a.x + a.width && a.y < b.y + b.height && b.y < a.y + a.height);
+  const layout = window.__leadqLayout || { entries: [], supported: false };
+  let shift = 0;
+  let navShift = 0;
+  for (const entry of layout.entries) {
+    shift += entry.value;
+    if (root && entry.nodes.some((node) => node && root.contains(node))) navShift += entry.value;
+  }
+  return {
+    width: window.innerWidth,
+    height: window.innerHeight,
+    mode: boxes.nav && boxes['nav-mobile-toggle'] ? 'both' : boxes.nav ? 'pill' : boxes['nav-mobile-toggle'] ? 'hamburger' : 'none',
+    overflowX: Math.max(0, document.documentElement.scrollWidth - width),
+    offscreen: Object.keys(boxes).filter((id) => boxes[id].x < 0 || boxes[id].x + boxes[id].width > width),
+    overlaps: ['nav-login', 'nav-signup'].filter((id) => overlap(boxes.nav, boxes[id])),
+    layoutShift: shift,
+    navLayoutShift: navShift,
+    shiftSupported: layout.supported,
+    boxes,
+  };
+}
+"""
+
+
+class LayoutRecorder:
+    """Runner plugin recording navbar layout metrics at the end of every test."""
+
+    def install(self, runner: Any) -> None:
+        runner.context_hooks.append(self.on_context)
+        runner.finish_hooks.append(self.on_finish)
+
+    async def on_context(self, context: async_api.BrowserContext, session: Any) -> None:
+        await context.add_init_script(LAYOUT_INIT_SCRIPT)
+
+    async def on_finish(self, session: Any, result: TestResult) -> None:
+        pages = [page for context in session.contexts for page in context.pages if not page.is_closed()]
+        if not pages:
+            return
+        try:
+            result.metrics["layout"] = await pages[-1].evaluate(LAYOUT_SCRIPT)
+        except async_api.Error as exc:
+            result.metrics["layout_error"] = str(exc).splitlines()[0]
+
+
+@dataclass
+class MatrixRun:
+    results: list[TestResult] = field(default_factory=list)
+    wall_s: float = 0.0
+
+    @property
+    def serial_s(self) -> float:
+        """What the same runs would have taken one after another."""
+        return sum(result.duration for result in self.results)
+
+    def problems(self, result: TestResult) -> list[str]:
+        layout = result.metrics.get("layout")
+        if layout is None:
+            return []
+        width = layout["width"]
+        found = []
+        # The pill is `hidden md:flex`, the hamburger `md:hidden`
+        expected = "pill" if width >= 768 else "hamburger"
+        if layout["mode"] != expected:
+            found.append(f"{layout['mode']} nav at {width}px, expected {expected}")
+        if layout["overflowX"]:
+            found.append(f"page {layout['overflowX']}px wider than the viewport")
+        if layout["offscreen"]:
+            found.append(f"off screen: {', '.join(layout['offscreen'])}")
+        if layout["overlaps"]:
+            found.append(f"overlapping the nav: {', '.join(layout['overlaps'])}")
+        return found
+
+    def format(self) -> str:
+        lines = [f"{'run':<20}{'status':<9}{'s':>6}{'nav':>11}{'overflow':>10}{'CLS':>7}{'nav CLS':>9}  problems"]
+        for result in self.results:
+            layout = result.metrics.get("layout")
+            if layout is None:
+                lines.append(f"{result.test_id:<20}{result.status:<9}{result.duration:>6.1f}  "
+                             f"no layout: {result.metrics.get('layout_error', 'no page open')}")
+                continue
+            shift = f"{layout['layoutShift']:>7.3f}{layout['navLayoutShift']:>9.3f}" if layout["shiftSupported"] else f"{'-':>7}{'-':>9}"
+            lines.append(
+                f"{result.test_id:<20}{result.status:<9}{result.duration:>6.1f}{layout['mode']:>11}"
+                f"{layout['overflowX']:>10}{shift}  {'; '.join(self.problems(result))}"
+            )
+        lines.append(
+            f"{len(self.results)} runs in {self.wall_s:.1f}s wall time "
+            f"({self.serial_s:.1f}s if run one after another)"
+        )
+        return "\n".join(lines)
+
+    def write(self, path: Path) -> None:
+        runs = [{**result.to_dict(), "problems": self.problems(result)} for result in self.results]
+        path.write_text(json.dumps({"wall_s": self.wall_s, "serial_s": self.serial_s, "runs": runs}, indent=2), encoding="utf-8")
+
+
+async def run_matrix(cases: list[TestCase], config: HarnessConfig, viewports: dict[str, dict[str, Any]]) -> MatrixRun:
+    """Run ``cases`` at every viewport in one browser, with as many runs in flight as ``config.parallelism``."""
+    async with SuiteRunner(config) as runner:
+        LayoutRecorder().install(runner)
+        started = time.perf_counter()
+        results = await runner.run_variants(cases, viewports)
+        return MatrixRun(results, time.perf_counter() - started)
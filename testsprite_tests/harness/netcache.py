@@ -0,0 +1,208 @@
+"""Hermetic network layer: third-party requests served from disk.
+
+Every context gets a ``route`` that intercepts third-party requests (the
+Lottie animation on ``lottie.host``, Google Fonts CSS and font files).
+The site's own requests, fonts included, go to the server under test
+untouched: they change with every build and the harness serves them
+locally anyway.  Intercepted requests are answered, in order, from
+
+1. committed fixtures (``testsprite_tests/fixtures/manifest.json``, keyed by
+   URL glob), e.g. an offline stand-in for ``LeadCaptureStream``'s
+   ``LOTTIE_URL`` so TC007 does not sit out the 5 s ``lottieError`` timeout;
+2. a content-addressed cache under ``<output-dir>/netcache`` (bodies stored
+   by SHA-256, one small index file per URL);
+3. the network, in ``replay`` mode, storing the response for next time.
+   In ``offline`` mode a miss gets an empty stand-in (stylesheets) or is
+   aborted as if the network were down.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from playwright import async_api
+
+from .config import TESTS_DIR
+from .pool import origin_of
+from .report import TestResult
+
+FIXTURES_DIR = TESTS_DIR / "fixtures"
+
+MODES = ("off", "replay", "offline")
+
+
+@dataclass
+class CacheStats:
+    fixture_hits: int = 0
+    cache_hits: int = 0
+    misses: int = 0
+    stand_ins: int = 0
+    bytes_saved: int = 0
+    bytes_fetched: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.fixture_hits + self.cache_hits + self.misses + self.stand_ins
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.fixture_hits + self.cache_hits) / self.requests if self.requests else 0.0
+
+    def add(self, other: "CacheStats") -> None:
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 3)}
+
+    def describe(self) -> str:
+        return (
+            f"{self.requests} intercepted, {self.hit_rate:.0%} hit rate "
+            f"({self.fixture_hits} fixture, {self.cache_hits} cache, {self.misses} fetched, "
+            f"{self.stand_ins} stand-in), {self.bytes_saved / 1024:.0f} KiB saved"
+        )
+
+
+class ContentStore:
+    """Response bodies addressed by SHA-256, with a per-URL index entry."""
+
+    def __init__(self, root: Path):
+        self.objects = root / "objects"
+        self.index = root / "index"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.index.mkdir(parents=True, exist_ok=True)
+
+    def _index_path(self, url: str) -> Path:
+        return self.index / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest
+
+    def get(self, url: str) -> tuple[dict[str, Any], bytes] | None:
+        try:
+            entry = json.loads(self._index_path(url).read_text(encoding="utf-8"))
+            return entry, self._object_path(entry["sha256"]).read_bytes()
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, url: str, status: int, headers: dict[str, str], body: bytes) -> None:
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(path, body)
+        entry = {"url": url, "sha256": digest, "status": status, "content_type": headers.get("content-type", "")}
+        self._write_atomic(self._index_path(url), json.dumps(entry).encode("utf-8"))
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        # Shard workers share the store; never expose a half-written file
+        temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temp.write_bytes(data)
+        os.replace(temp, path)
+
+
+def load_fixtures(fixtures_dir: Path = FIXTURES_DIR) -> list[tuple[str, Path, str]]:
+    """(URL glob, file, content type) triples from the fixture manifest."""
+    manifest = fixtures_dir / "manifest.json"
+    if not manifest.exists():
+        return []
+    entries = json.loads(manifest.read_text(encoding="utf-8"))
+    return [
+        (pattern, (fixtures_dir / entry["path"]).resolve(), entry.get("content_type", "application/octet-stream"))
+        for pattern, entry in entries.items()
+    ]
+
+
+class NetworkCache:
+    """Runner plugin routing third-party traffic through fixtures and the store."""
+
+    def __init__(self, output_dir: Path, local_urls: list[str], mode: str = "replay"):
+        if mode not in MODES:
+            raise ValueError(f"unknown network cache mode {mode!r}")
+        self.mode = mode
+        self.store = ContentStore(output_dir / "netcache")
+        self.local_origins = {origin_of(url) for url in local_urls}
+        self.fixtures = load_fixtures()
+        self.totals = CacheStats()
+        # Per test session, so the variants of one case keep their own counts
+        self._stats: dict[Any, CacheStats] = {}
+
+    def install(self, runner: Any) -> None:
+        runner.context_hooks.append(self.on_context)
+        runner.finish_hooks.append(self.on_finish)
+
+    def wants(self, url: str) -> bool:
+        return url.startswith(("http://", "https://")) and origin_of(url) not in self.local_origins
+
+    async def on_context(self, context: async_api.BrowserContext, session: Any) -> None:
+        stats = self._stats.setdefault(session, CacheStats())
+
+        async def handle(route: async_api.Route, request: async_api.Request) -> None:
+            await self.handle(route, request, stats)
+
+        await context.route(self.wants, handle)
+
+    async def on_finish(self, session: Any, result: TestResult) -> None:
+        stats = self._stats.pop(session, None)
+        if stats is not None and stats.requests:
+            self.totals.add(stats)
+            result.metrics["netcache"] = stats.to_dict()
+
+    async def handle(self, route: async_api.Route, request: async_api.Request, stats: CacheStats) -> None:
+        url = request.url
+        for pattern, path, content_type in self.fixtures:
+            if fnmatch.fnmatchcase(url, pattern) and path.exists():
+                body = path.read_bytes()
+                stats.fixture_hits += 1
+                stats.bytes_saved += len(body)
+                await route.fulfill(status=200, body=body, headers=_headers(content_type))
+                return
+
+        if request.method != "GET":
+            if self.mode == "offline":
+                await route.abort("internetdisconnected")
+            else:
+                await route.continue_()
+            return
+
+        cached = self.store.get(url)
+        if cached is not None:
+            entry, body = cached
+            stats.cache_hits += 1
+            stats.bytes_saved += len(body)
+            await route.fulfill(status=entry["status"], body=body, headers=_headers(entry["content_type"]))
+            return
+
+        if self.mode == "replay":
+            try:
+                response = await route.fetch()
+                body = await response.body()
+            except async_api.Error:
+                response = None
+            if response is not None:
+                if response.ok:
+                    self.store.put(url, response.status, response.headers, body)
+                stats.misses += 1
+                stats.bytes_fetched += len(body)
+                await route.fulfill(response=response, body=body)
+                return
+
+        stats.stand_ins += 1
+        if request.resource_type == "stylesheet":
+            await route.fulfill(status=200, body="", headers=_headers("text/css"))
+        else:
+            await route.abort("internetdisconnected")
+
+
+def _headers(content_type: str) -> dict[str, str]:
+    headers = {"access-control-allow-origin": "*"}
+    if content_type:
+        headers["content-type"] = content_type
+    return headers
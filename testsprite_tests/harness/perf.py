@@ -0,0 +1,251 @@
+"""Frame-time and main-thread blocking measurements for scroll scenarios.
+
+``measure_scroll`` installs a ``requestAnimationFrame`` sampler plus
+``PerformanceObserver``s for ``longtask`` and ``layout-shift`` entries,
+drives scripted scroll cycles across a section (by default the
+``DashboardPreview``/``ContainerScroll`` block) and returns a
+``FrameStats`` summary that tests can check against a ``PerfBudget``.
+
+TC010 and TC024 only look for a "smooth scrolling" text.  For the tests in
+``HarnessConfig.scroll_budgets`` the ``ScrollBudgetCheck`` plugin runs the
+``SCROLL_SCENARIOS`` entry on the test's last page once the script is
+done, and fails the test when the result is over its budget.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, fields
+from typing import Any
+
+from playwright import async_api
+
+from .config import TESTS_DIR
+from .report import FAILED, TestResult
+from .stats import percentile
+
+BUDGETS_PATH = TESTS_DIR / "perf_budgets.json"
+
+# Nominal frame interval of headless Chromium (60 Hz)
+FRAME_INTERVAL_MS = 1000 / 60
+
+# Long tasks block input for everything past this many milliseconds
+BLOCKING_THRESHOLD_MS = 50
+
+# Scrolls the target section down and back up `cycles` times, advancing a
+# fixed distance per animation frame, while recording every frame's
+# timestamp, long task and layout shift.
+SCROLL_PROBE_SCRIPT = """
+async ({ selector, cycles, pxPerFrame, settleFrames }) => {
+  const target = selector ? document.querySelector(selector) : document.documentElement;
+  if (!target) throw new Error('measure_scroll: no element matches ' + selector);
+  const nextFrame = () => new Promise((resolve) => requestAnimationFrame(resolve));
+  const longTasks = [];
+  const shifts = [];
+  const observers = [];
+  const observe = (type, sink) => {
+    try {
+      const observer = new PerformanceObserver((list) => {
+        for (const entry of list.getEntries()) sink(entry);
+      });
+      observer.observe({ type, buffered: false });
+      observers.push(observer);
+    } catch (error) {
+      // Entry type not supported by this engine
+    }
+  };
+  observe('longtask', (entry) => longTasks.push({ start: entry.startTime, duration: entry.duration }));
+  observe('layout-shift', (entry) => { if (!entry.hadRecentInput) shifts.push(entry.value); });
+
+  const rect = target.getBoundingClientRect();
+  const top = Math.max(0, window.scrollY + rect.top - window.innerHeight);
+  const bottom = Math.min(
+    document.documentElement.scrollHeight - window.innerHeight,
+    window.scrollY + rect.bottom,
+  );
+  window.scrollTo(0, top);
+  for (let i = 0; i < settleFrames; i++) await nextFrame();
+
+  const frames = [];
+  const sweep = async (from, to) => {
+    const direction = Math.sign(to - from) || 1;
+    for (let y = from; direction > 0 ? y < to : y > to; y += direction * pxPerFrame) {
+      window.scrollTo(0, y);
+      frames.push(await nextFrame());
+    }
+    window.scrollTo(0, to);
+    frames.push(await nextFrame());
+  };
+  const started = performance.now();
+  for (let cycle = 0; cycle < cycles; cycle++) {
+    await sweep(top, bottom);
+    await sweep(bottom, top);
+  }
+  for (let i = 0; i < settleFrames; i++) frames.push(await nextFrame());
+  const finished = performance.now();
+  // Let the observers deliver entries queued during the last frames
+  await new Promise((resolve) => setTimeout(resolve, 0));
+  observers.forEach((observer) => observer.disconnect());
+  return {
+    frames,
+    longTasks: longTasks.filter((task) => task.start >= started && task.start <= finished),
+    layoutShift: shifts.reduce((total, value) => total + value, 0),
+    durationMs: finished - started,
+  };
+}
+"""
+
+
+@dataclass
+class PerfBudget:
+    """Upper bounds a scroll measurement must stay within."""
+
+    p50_frame_ms: float = 20.0
+    p95_frame_ms: float = 34.0
+    p99_frame_ms: float = 50.0
+    dropped_frame_ratio: float = 0.10
+    total_blocking_time_ms: float = 300.0
+    cumulative_layout_shift: float = 0.1
+
+    @classmethod
+    def load(cls, name: str) -> "PerfBudget":
+        """Budget ``name`` from ``perf_budgets.json``, over the ``default`` entry."""
+        entries: dict[str, dict] = {}
+        if BUDGETS_PATH.exists():
+            entries = json.loads(BUDGETS_PATH.read_text(encoding="utf-8"))
+        known = {f.name for f in fields(cls)}
+        values = {**entries.get("default", {}), **entries.get(name, {})}
+        return cls(**{key: value for key, value in values.items() if key in known})
+
+
+@dataclass
+class FrameStats:
+    frame_count: int
+    duration_ms: float
+    p50_frame_ms: float
+    p95_frame_ms: float
+    p99_frame_ms: float
+    dropped_frames: int
+    long_tasks: int
+    total_blocking_time_ms: float
+    cumulative_layout_shift: float
+
+    @property
+    def fps(self) -> float:
+        return 1000 * self.frame_count / self.duration_ms if self.duration_ms else 0.0
+
+    @property
+    def dropped_frame_ratio(self) -> float:
+        expected = self.frame_count + self.dropped_frames
+        return self.dropped_frames / expected if expected else 0.0
+
+    @classmethod
+    def from_probe(cls, probe: dict[str, Any]) -> "FrameStats":
+        stamps = probe["frames"]
+        deltas = [later - earlier for earlier, later in zip(stamps, stamps[1:])]
+        dropped = sum(max(0, round(delta / FRAME_INTERVAL_MS) - 1) for delta in deltas)
+        blocking = sum(max(0.0, task["duration"] - BLOCKING_THRESHOLD_MS) for task in probe["longTasks"])
+        return cls(
+            frame_count=len(deltas),
+            duration_ms=probe["durationMs"],
+            p50_frame_ms=percentile(deltas, 50),
+            p95_frame_ms=percentile(deltas, 95),
+            p99_frame_ms=percentile(deltas, 99),
+            dropped_frames=dropped,
+            long_tasks=len(probe["longTasks"]),
+            total_blocking_time_ms=blocking,
+            cumulative_layout_shift=probe["layoutShift"],
+        )
+
+    def violations(self, budget: PerfBudget) -> list[str]:
+        problems = []
+        for name in ("p50_frame_ms", "p95_frame_ms", "p99_frame_ms", "dropped_frame_ratio",
+                     "total_blocking_time_ms", "cumulative_layout_shift"):
+            actual, limit = getattr(self, name), getattr(budget, name)
+            if actual > limit:
+                problems.append(f"{name} {actual:.3f} > {limit:.3f}")
+        return problems
+
+    def assert_within(self, budget: PerfBudget) -> None:
+        problems = self.violations(budget)
+        if problems:
+            raise AssertionError(f"Performance budget exceeded ({self.describe()}): " + "; ".join(problems))
+
+    def describe(self) -> str:
+        return (
+            f"{self.fps:.0f} fps, p50/p95/p99 {self.p50_frame_ms:.1f}/{self.p95_frame_ms:.1f}/"
+            f"{self.p99_frame_ms:.1f} ms, {self.dropped_frames} dropped, "
+            f"TBT {self.total_blocking_time_ms:.0f} ms, CLS {self.cumulative_layout_shift:.3f}"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "fps": self.fps}
+
+
+async def measure_scroll(
+    page: Any,
+    selector: str | None = "#dashboard",
+    cycles: int = 3,
+    px_per_frame: int = 40,
+    settle_frames: int = 10,
+) -> FrameStats:
+    """Scroll across ``selector`` ``cycles`` times and summarise frame timing.
+
+    ``selector=None`` sweeps the whole document.
+    """
+    probe = await page.evaluate(
+        SCROLL_PROBE_SCRIPT,
+        {"selector": selector, "cycles": cycles, "pxPerFrame": px_per_frame, "settleFrames": settle_frames},
+    )
+    return FrameStats.from_probe(probe)
+
+
+@dataclass(frozen=True)
+class ScrollScenario:
+    """Arguments of ``measure_scroll`` plus the budget its result must meet."""
+
+    budget: str
+    selector: str | None = "#dashboard"
+    cycles: int = 3
+    px_per_frame: int = 40
+
+
+# Scroll measured after each test, by test id
+SCROLL_SCENARIOS: dict[str, ScrollScenario] = {
+    # Across the dashboard preview
+    "TC010": ScrollScenario("dashboard_scroll"),
+    # Rapid full-page sweeps
+    "TC024": ScrollScenario("repeated_scroll", selector=None, px_per_frame=120),
+}
+
+
+class ScrollBudgetCheck:
+    """Runner plugin measuring scroll frame timing after selected tests."""
+
+    def __init__(self, test_ids: tuple[str, ...]):
+        self.test_ids = set(test_ids) & set(SCROLL_SCENARIOS)
+
+    def install(self, runner: Any) -> None:
+        runner.finish_hooks.append(self.on_finish)
+
+    async def on_finish(self, session: Any, result: TestResult) -> None:
+        if session.case.id not in self.test_ids:
+            return
+        scenario = SCROLL_SCENARIOS[session.case.id]
+        pages = [page for context in session.contexts for page in context.pages if not page.is_closed()]
+        if not pages:
+            return
+        try:
+            stats = await measure_scroll(pages[-1], scenario.selector, scenario.cycles, scenario.px_per_frame)
+        except async_api.Error as exc:
+            result.metrics["scroll_error"] = str(exc).splitlines()[0]
+            return
+        result.metrics["scroll"] = stats.to_dict()
+        try:
+            stats.assert_within(PerfBudget.load(scenario.budget))
+        except AssertionError as exc:
+            if result.ok:
+                result.status, result.message = FAILED, str(exc)
+            else:
+                # Reported next to whatever the script itself found
+                result.message = f"{result.message.rstrip()}\n{exc}"
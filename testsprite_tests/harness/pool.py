@@ -0,0 +1,101 @@
+"""Pool of ready browser contexts with the cookie consent already given.
+
+``CookieConsent`` only shows its banner when ``leadq-cookie-consent`` is
+missing from ``localStorage``.  Pooled contexts are created ahead of time
+with that key in their ``storage_state``, so tests never see the banner,
+and the scripts' recorded "Accept All" clicks are skipped by the step
+engine.  Tests listed in ``HarnessConfig.consent_opt_out`` (TC020 tests the
+banner itself) get a fresh context without the key.  With fixed waits
+(``auto_wait`` off) nothing can skip those clicks, so there is no pool and
+every test sees the banner it was recorded against.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from typing import Any
+from urllib.parse import urlsplit
+
+from playwright import async_api
+
+CONSENT_KEY = "leadq-cookie-consent"
+
+# Recorded selectors of the banner's "Accept All" button
+CONSENT_ACCEPT_SELECTORS = [
+    re.compile(r"^xpath=html/body/div(?:\[1\])?/div/div\[5\]/div/div/div/div\[2\]/button\[3\]$"),
+    re.compile(r"^text=Accept All$"),
+]
+
+
+def origin_of(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def consent_storage_state(urls: list[str]) -> dict[str, Any]:
+    """``storage_state`` with consent recorded for the origins of ``urls``."""
+    value = json.dumps({"essential": True, "analytics": True, "marketing": True, "timestamp": "2026-01-01T00:00:00.000Z"})
+    origins = sorted({origin_of(url) for url in urls})
+    return {
+        "cookies": [],
+        "origins": [{"origin": origin, "localStorage": [{"name": CONSENT_KEY, "value": value}]} for origin in origins],
+    }
+
+
+class ContextPool:
+    """Keeps ``size`` consent-seeded contexts ready for checkout.
+
+    Contexts are never returned to the pool: each test gets a new one and
+    the pool refills in the background, so isolation between tests is the
+    same as with ``browser.new_context()``.
+    """
+
+    def __init__(self, browser: async_api.Browser, urls: list[str], size: int, **context_options: Any):
+        self.browser = browser
+        self.size = max(1, size)
+        self.context_options = context_options
+        self.storage_state = consent_storage_state(urls)
+        self._ready: asyncio.Queue[async_api.BrowserContext] = asyncio.Queue()
+        self._refills: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        contexts = await asyncio.gather(*(self._create(seeded=True) for _ in range(self.size)))
+        for context in contexts:
+            self._ready.put_nowait(context)
+
+    async def _create(self, seeded: bool) -> async_api.BrowserContext:
+        options = dict(self.context_options)
+        if seeded:
+            options["storage_state"] = self.storage_state
+        return await self.browser.new_context(**options)
+
+    def _refill(self) -> None:
+        task = asyncio.ensure_future(self._create(seeded=True))
+        self._refills.add(task)
+
+        def done(finished: asyncio.Task) -> None:
+            self._refills.discard(finished)
+            if not finished.cancelled() and finished.exception() is None:
+                self._ready.put_nowait(finished.result())
+
+        task.add_done_callback(done)
+
+    async def acquire(self, seeded: bool = True) -> async_api.BrowserContext:
+        """Check out a context; unseeded ones are created on demand."""
+        if not seeded:
+            return await self._create(seeded=False)
+        context = await self._ready.get()
+        self._refill()
+        return context
+
+    async def close(self) -> None:
+        for task in list(self._refills):
+            task.cancel()
+        await asyncio.gather(*self._refills, return_exceptions=True)
+        while not self._ready.empty():
+            try:
+                await self._ready.get_nowait().close()
+            except async_api.Error:
+                pass
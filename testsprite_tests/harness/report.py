@@ -0,0 +1,83 @@
+"""Result records and report writers."""
+
+from __future__ import annotations
+
+import json
+import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+PASSED = "passed"
+FAILED = "failed"
+ERROR = "error"
+TIMEOUT = "timeout"
+
+
+@dataclass
+class TestResult:
+    test_id: str
+    title: str
+    status: str
+    duration: float
+    message: str = ""
+    artifacts: list[str] = field(default_factory=list)
+    metrics: dict = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == PASSED
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def format_summary(results: list[TestResult], wall_time: float | None = None) -> str:
+    """Render a plain-text table of results, one line per test."""
+    lines = []
+    for result in sorted(results, key=lambda r: r.test_id):
+        line = f"{result.test_id}  {result.status.upper():<7}  {result.duration:7.2f}s  {result.title}"
+        if result.message and not result.ok:
+            first_line = result.message.strip().splitlines()[0] if result.message.strip() else ""
+            line += f"\n        {first_line[:160]}"
+        lines.append(line)
+    passed = sum(1 for r in results if r.ok)
+    total_time = sum(r.duration for r in results)
+    footer = f"{passed}/{len(results)} passed, {total_time:.1f}s of test time"
+    if wall_time is not None:
+        footer += f" in {wall_time:.1f}s wall clock"
+    lines.append(footer)
+    return "\n".join(lines)
+
+
+def write_json(results: list[TestResult], path: Path, **extra) -> Path:
+    payload = {**extra, "results": [result.to_dict() for result in results]}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return path
+
+
+def write_junit(results: list[TestResult], path: Path, suite_name: str = "testsprite") -> Path:
+    """Write ``results`` as a single JUnit XML test suite."""
+    failures = sum(1 for r in results if r.status in (FAILED, TIMEOUT))
+    errors = sum(1 for r in results if r.status == ERROR)
+    suite = ET.Element(
+        "testsuite",
+        name=suite_name,
+        tests=str(len(results)),
+        failures=str(failures),
+        errors=str(errors),
+        time=f"{sum(r.duration for r in results):.3f}",
+    )
+    for result in results:
+        case = ET.SubElement(
+            suite, "testcase", classname=suite_name, name=f"{result.test_id} {result.title}", time=f"{result.duration:.3f}"
+        )
+        if result.status in (FAILED, TIMEOUT):
+            ET.SubElement(case, "failure", message=result.status).text = result.message
+        elif result.status == ERROR:
+            ET.SubElement(case, "error", message=result.status).text = result.message
+        if result.artifacts:
+            ET.SubElement(case, "system-out").text = "\n".join(f"[[ATTACHMENT|{a}]]" for a in result.artifacts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+    return path
@@ -0,0 +1,237 @@
+"""Run TC scripts concurrently against one shared browser.
+
+Each script gets its own ``BrowserContext`` (cookies, storage and cache are
+isolated) but the Chromium process is launched once per suite run.
+``run_variants`` runs the same scripts once per set of context options,
+e.g. the viewports of matrix.py; runners for other engines can share one
+semaphore through ``run`` (see engines.py).  The
+number of scripts in flight is bounded by an ``asyncio.Semaphore`` sized
+from ``HarnessConfig.parallelism``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import traceback
+from typing import Any, Awaitable, Callable
+
+from playwright import async_api
+
+from .clock import VirtualTime
+from .config import RECORDED_ORIGINS, HarnessConfig
+from .impact import CoverageRecorder
+from .loader import LoadedScript, TestCase
+from .netcache import NetworkCache
+from .perf import ScrollBudgetCheck
+from .pool import CONSENT_ACCEPT_SELECTORS, ContextPool
+from .report import ERROR, FAILED, PASSED, TIMEOUT, TestResult
+from .selectors import SelectorIndex, validate
+from .server import serve
+from .snapshot import run_offline
+from .steps import StepEngine
+from .timers import TimerCensusRecorder
+from .tracing import TraceRecorder
+
+# Called for every context a script creates, before the script sees it; per-test
+# plugin state is keyed by the session, which the finish hooks get too
+ContextHook = Callable[[async_api.BrowserContext, "TestSession"], Awaitable[None]]
+
+# Called once a script has finished, before its contexts are closed
+FinishHook = Callable[["TestSession", TestResult], Awaitable[None]]
+
+
+class TestSession:
+    """Per-test view of the shared browser handed to a loaded script."""
+
+    def __init__(self, runner: "SuiteRunner", case: TestCase, context_options: dict[str, Any] | None = None):
+        self.runner = runner
+        self.case = case
+        # Viewport and device emulation for every context of this test (see matrix.py)
+        self.context_options = context_options or {}
+        self.contexts: list[async_api.BrowserContext] = []
+        config = runner.config
+        self.steps = StepEngine(action_timeout_ms=config.action_timeout) if config.auto_wait else None
+        if self.steps is not None:
+            self.steps.selectors = runner.selectors
+
+    async def new_context(self, **kwargs: Any) -> Any:
+        pool = self.runner.pool
+        # Only the step engine can skip the recorded "Accept All" clicks; without
+        # it they would wait for a banner that never shows
+        seeded = (
+            pool is not None and not kwargs and self.steps is not None
+            and self.case.id not in self.runner.config.consent_opt_out
+        )
+        if pool is not None and not kwargs and not self.context_options:
+            context = await pool.acquire(seeded)
+        elif seeded:
+            # Pooled contexts have the default viewport; emulated ones still skip the banner
+            context = await self.runner.browser.new_context(**self.context_options, storage_state=pool.storage_state)
+        else:
+            context = await self.runner.browser.new_context(**{**self.context_options, **kwargs})
+        if seeded:
+            # The banner never shows, so the recorded dismissal is moot
+            self.steps.skip_clicks.extend(CONSENT_ACCEPT_SELECTORS)
+        context.set_default_timeout(self.runner.config.action_timeout)
+        self.contexts.append(context)
+        for hook in self.runner.context_hooks:
+            await hook(context, self)
+        if self.steps is not None:
+            return self.steps.wrap_context(context)
+        return context
+
+    def patch_namespace(self, namespace: dict[str, Any]) -> None:
+        if self.steps is not None:
+            self.steps.patch_namespace(namespace)
+
+    async def close(self) -> None:
+        for context in self.contexts:
+            try:
+                await context.close()
+            except async_api.Error:
+                pass
+        self.contexts.clear()
+
+
+class SuiteRunner:
+    """Owns the Playwright driver and browser for one suite run.
+
+    Use as an async context manager::
+
+        async with SuiteRunner(config) as runner:
+            results = await runner.run(cases)
+    """
+
+    def __init__(self, config: HarnessConfig, browser_name: str = "chromium"):
+        self.config = config
+        self.browser_name = browser_name
+        self.context_hooks: list[ContextHook] = []
+        self.finish_hooks: list[FinishHook] = []
+        self._playwright: async_api.Playwright | None = None
+        self._browser: async_api.Browser | None = None
+        self.pool: ContextPool | None = None
+        self.net_cache: NetworkCache | None = None
+        # Stale mappings are dropped so those steps keep their recorded XPath
+        self.selectors = SelectorIndex.build(validate()) if config.stable_selectors else None
+        if config.trace:
+            TraceRecorder(config.output_dir).install(self)
+        if config.timer_census:
+            TimerCensusRecorder().install(self)
+        if config.coverage and browser_name == "chromium":
+            CoverageRecorder().install(self)
+        if config.net_cache != "off":
+            self.net_cache = NetworkCache(config.output_dir, [*RECORDED_ORIGINS, config.base_url], config.net_cache)
+            self.net_cache.install(self)
+        if config.virtual_time:
+            VirtualTime(config.virtual_time).install(self)
+        if config.scroll_budgets:
+            ScrollBudgetCheck(config.scroll_budgets).install(self)
+
+    @property
+    def browser(self) -> async_api.Browser:
+        if self._browser is None:
+            raise RuntimeError("SuiteRunner is not started")
+        return self._browser
+
+    async def start(self) -> None:
+        self._playwright = await async_api.async_playwright().start()
+        browser_type = getattr(self._playwright, self.browser_name)
+        launch_args = self.config.browser_args if self.browser_name == "chromium" else []
+        self._browser = await browser_type.launch(headless=self.config.headless, args=launch_args)
+        # Seeded contexts are only handed out when the step engine skips the consent clicks
+        if self.config.context_pool and self.config.auto_wait:
+            urls = [*RECORDED_ORIGINS, self.config.base_url]
+            self.pool = ContextPool(self._browser, urls, self.config.parallelism)
+            await self.pool.start()
+
+    async def stop(self) -> None:
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def __aenter__(self) -> "SuiteRunner":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    def load(self, case: TestCase) -> LoadedScript:
+        config = self.config
+        return LoadedScript(case, config.base_url, config.optimize_steps, config.auto_wait)
+
+    async def run(self, cases: list[TestCase], semaphore: asyncio.Semaphore | None = None) -> list[TestResult]:
+        """Run ``cases``; pass ``semaphore`` to share the parallelism budget with other runners."""
+        results: dict[str, TestResult] = {}
+        # The DOM snapshot is captured over CDP, and runs no code worth covering
+        live_only = self.browser_name != "chromium" or self.config.coverage
+        offline = [] if live_only else [case for case in cases if case.id in self.config.snapshot_tests]
+        if offline:
+            results.update((result.test_id, result) for result in await run_offline(self, offline))
+        semaphore = semaphore or asyncio.Semaphore(max(1, self.config.parallelism))
+        scripts = [self.load(case) for case in cases if case.id not in results]
+        for result in await asyncio.gather(*(self._run_one(script, semaphore) for script in scripts)):
+            results[result.test_id] = result
+        return [results[case.id] for case in cases]
+
+    async def run_variants(self, cases: list[TestCase], variants: dict[str, dict[str, Any]]) -> list[TestResult]:
+        """Run every case once per variant's context options, all at once; results are ``<id>@<variant>``."""
+        semaphore = asyncio.Semaphore(max(1, self.config.parallelism))
+        scripts = [self.load(case) for case in cases]
+        return list(await asyncio.gather(*(
+            self._attempt(script, semaphore, name, options) for script in scripts for name, options in variants.items()
+        )))
+
+    async def _run_one(self, script: LoadedScript, semaphore: asyncio.Semaphore) -> TestResult:
+        """Run ``script``, retrying as often as ``config.retries`` allows while it fails."""
+        earlier: list[dict] = []
+        while True:
+            result = await self._attempt(script, semaphore)
+            if result.ok or len(earlier) >= self.config.retries.get(result.test_id, 0):
+                break
+            message = (result.message.strip().splitlines() or [""])[0]
+            earlier.append({"status": result.status, "duration": result.duration, "message": message})
+        if earlier:
+            result.metrics["attempts"] = earlier
+        return result
+
+    async def _attempt(self, script: LoadedScript, semaphore: asyncio.Semaphore,
+                       variant: str = "", context_options: dict[str, Any] | None = None) -> TestResult:
+        case = script.case
+        async with semaphore:
+            session = TestSession(self, case, context_options)
+            started = time.perf_counter()
+            status, message = PASSED, ""
+            try:
+                run_test = script.bind(session)
+                await asyncio.wait_for(run_test(), timeout=self.config.test_timeout)
+            except AssertionError as exc:
+                status, message = FAILED, str(exc)
+            except asyncio.TimeoutError:
+                status, message = TIMEOUT, f"exceeded {self.config.test_timeout:.0f}s"
+            except Exception:
+                status, message = ERROR, traceback.format_exc()
+            duration = time.perf_counter() - started
+            result = TestResult(f"{case.id}@{variant}" if variant else case.id, case.title, status, duration, message)
+            if session.steps is not None:
+                result.metrics["steps"] = session.steps.summary()
+            try:
+                for hook in self.finish_hooks:
+                    await hook(session, result)
+            finally:
+                await session.close()
+        return result
+
+
+async def run_suite(cases: list[TestCase], config: HarnessConfig) -> list[TestResult]:
+    """Convenience wrapper: start a runner, run ``cases``, stop it."""
+    with serve(config) as config:
+        async with SuiteRunner(config) as runner:
+            return await runner.run(cases)
@@ -0,0 +1,50 @@
+"""Landing page sections and the components that render them."""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+from .config import PROJECT_DIR
+
+APP_PATH = PROJECT_DIR / "src" / "App.tsx"
+
+# Section element id -> component file stem, in page order
+SECTION_COMPONENTS: dict[str, str] = {
+    "main-content": "Hero",
+    "lead-capture": "LeadCaptureStream",
+    "profile-research": "ProfileResearch",
+    "dashboard": "DashboardPreview",
+    "bookings-meeting": "BookingsMeeting",
+    "email-draft": "EmailDraftAnimation",
+    "features": "Features",
+    "use-cases": "UseCases",
+    "agents": "Agents",
+    "pricing": "Pricing",
+    "faq": "FAQ",
+    "contact": "Contact",
+}
+
+_NAV_URL = re.compile(r"""url:\s*['"]#([\w-]+)['"]""")
+
+# Finds the nearest section (or other landmark) enclosing a DOM node
+CLOSEST_SECTION_FUNCTION = """
+function () {
+  const element = this.nodeType === 1 ? this : this.parentElement;
+  const landmark = element && element.closest('section[id], footer, nav, header');
+  if (!landmark) return null;
+  return landmark.id || landmark.tagName.toLowerCase();
+}
+"""
+
+
+def nav_section_ids(app_path: Path = APP_PATH) -> list[str]:
+    """Section ids linked from ``navItems`` in ``App.tsx``, in menu order."""
+    return _NAV_URL.findall(app_path.read_text(encoding="utf-8"))
+
+
+def component_for(section_id: str | None) -> str:
+    """Component name for a section id, falling back to the id itself."""
+    if not section_id:
+        return "(page)"
+    return SECTION_COMPONENTS.get(section_id, section_id)
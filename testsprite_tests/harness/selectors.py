@@ -0,0 +1,266 @@
+"""Stable ``data-testid`` selectors for the recorded absolute XPaths.
+
+The generated scripts address elements by absolute XPath
+(``html/body/div/div/section[12]/div/div[2]/form/div[4]/textarea``), which
+goes stale whenever a section is added to ``App.tsx``.  The key interactive
+elements of ``Contact``, ``CookieConsent``, ``FAQ``, ``Pricing`` and the
+tubelight navbar carry ``data-testid`` attributes; ``RECORDED_XPATHS`` maps
+the paths the scripts were recorded with onto them, and the step engine
+swaps a mapped XPath for a single ``[data-testid=...]`` query.
+
+``validate`` runs before the suite: a mapped test id that the component
+sources no longer render is reported as stale and left unmapped, so the
+script falls back to its recorded XPath.  Templated ids such as
+``faq-question-${index}`` are checked value by value against the data the
+component maps over (``template_ids``).
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .config import PROJECT_DIR, TESTS_DIR
+
+COMPONENTS_DIR = PROJECT_DIR / "src" / "components"
+
+TESTID_SOURCES = (
+    COMPONENTS_DIR / "Contact.tsx",
+    COMPONENTS_DIR / "CookieConsent.tsx",
+    COMPONENTS_DIR / "FAQ.tsx",
+    COMPONENTS_DIR / "Pricing.tsx",
+    COMPONENTS_DIR / "ui" / "tubelight-navbar.tsx",
+)
+
+# Cookie consent banner and preferences modal
+COOKIE_BANNER = "cookie-banner"
+COOKIE_PREFERENCES = "cookie-preferences"
+COOKIE_DECLINE = "cookie-decline"
+COOKIE_ACCEPT_ALL = "cookie-accept-all"
+COOKIE_PREFERENCES_MODAL = "cookie-preferences-modal"
+COOKIE_PREFERENCES_CLOSE = "cookie-preferences-close"
+COOKIE_PREFERENCES_CANCEL = "cookie-preferences-cancel"
+COOKIE_PREFERENCES_SAVE = "cookie-preferences-save"
+
+# Contact form
+CONTACT_FORM = "contact-form"
+CONTACT_NAME = "contact-name"
+CONTACT_EMAIL = "contact-email"
+CONTACT_COMPANY = "contact-company"
+CONTACT_MESSAGE = "contact-message"
+CONTACT_SUBMIT = "contact-submit"
+CONTACT_SUCCESS = "contact-success"
+
+# Pricing
+PRICING_DETAILS = "pricing-details"
+PRICING_PLANS = ("starter", "pro", "enterprise")
+
+# Navbar
+NAV_LOGIN = "nav-login"
+NAV_SIGNUP = "nav-signup"
+NAV_SOLUTIONS = "nav-solutions"
+NAV_MOBILE_TOGGLE = "nav-mobile-toggle"
+NAV_MOBILE_MENU = "nav-mobile-menu"
+NAV_DIRECT_LINKS = ("pricing", "faq", "contact")
+NAV_SOLUTION_LINKS = (
+    "features", "use-cases", "lead-capture", "profile-research",
+    "dashboard", "bookings-meeting", "email-draft", "agents",
+)
+
+COOKIE_KINDS = ("essential", "analytics", "marketing")
+
+
+def cookie_toggle(kind: str) -> str:
+    return f"cookie-toggle-{kind}"
+
+
+def faq_question(index: int) -> str:
+    return f"faq-question-{index}"
+
+
+def faq_answer(index: int) -> str:
+    return f"faq-answer-{index}"
+
+
+def pricing_plan(plan: str) -> str:
+    return f"pricing-plan-{plan}"
+
+
+def pricing_cta(plan: str) -> str:
+    return f"pricing-cta-{plan}"
+
+
+def nav_link(section: str) -> str:
+    return f"nav-link-{section}"
+
+
+def nav_menu_link(section: str) -> str:
+    return f"nav-menu-link-{section}"
+
+
+def nav_mobile_link(section: str) -> str:
+    return f"nav-mobile-link-{section}"
+
+
+def by_testid(testid: str) -> str:
+    """Playwright selector matching ``testid`` in one query."""
+    return f'[data-testid="{testid}"]'
+
+
+_FIRST_STEP = re.compile(r"\[1\](?=/|$)")
+_LITERAL_TESTID = re.compile(r"""data-testid=["']([\w-]+)["']""")
+_TEMPLATE_TESTID = re.compile(r"""data-testid=\{`([\w-]+)\$\{""")
+_TEMPLATE_PROP = re.compile(r"""testId=\{`([\w-]+)\$\{""")
+_SCRIPT_XPATH = re.compile(r"""locator\(['"]xpath=([^'"]+)['"]\)""")
+# Fields of the arrays the templated test ids are rendered from
+_FAQ_ENTRY = re.compile(r"^\s*question:", re.MULTILINE)
+_NAME_FIELD = re.compile(r"""\bname:\s*["']([^"']+)["']""")
+_ID_FIELD = re.compile(r"""\bid:\s*["']([\w-]+)["']""")
+_URL_FIELD = re.compile(r"""\burl:\s*["']#([\w-]+)["']""")
+
+
+def normalize_xpath(xpath: str) -> str:
+    """Drop ``[1]`` steps: the recorder emits ``div`` and ``div[1]`` interchangeably."""
+    if xpath.startswith("xpath="):
+        xpath = xpath[len("xpath="):]
+    return _FIRST_STEP.sub("", xpath.lstrip("/"))
+
+
+def _recorded_xpaths() -> dict[str, str]:
+    banner = "html/body/div/div/div[5]/div/div/div/div[2]"
+    modal = "html/body/div/div/div[6]/div"
+    form = "html/body/div/div/section[12]/div/div[2]/form"
+    nav = "html/body/div/div/div[3]/div[3]/div/nav"
+    xpaths = {
+        f"{banner}/button[1]": COOKIE_PREFERENCES,
+        f"{banner}/button[2]": COOKIE_DECLINE,
+        f"{banner}/button[3]": COOKIE_ACCEPT_ALL,
+        f"{modal}/div[1]/button": COOKIE_PREFERENCES_CLOSE,
+        f"{modal}/div[3]/button[1]": COOKIE_PREFERENCES_CANCEL,
+        f"{modal}/div[3]/button[2]": COOKIE_PREFERENCES_SAVE,
+        f"{form}/div[1]/input": CONTACT_NAME,
+        f"{form}/div[2]/input": CONTACT_EMAIL,
+        f"{form}/div[3]/input": CONTACT_COMPANY,
+        f"{form}/div[4]/textarea": CONTACT_MESSAGE,
+        f"{form}/button": CONTACT_SUBMIT,
+        "html/body/div/div/div[3]/div[1]/button[1]": NAV_LOGIN,
+        "html/body/div/div/div[3]/div[1]/button[2]": NAV_SIGNUP,
+        "html/body/div/div/div[3]/div[2]/button": NAV_MOBILE_TOGGLE,
+        f"{nav}/div/div[1]/div": NAV_SOLUTIONS,
+    }
+    for n, kind in enumerate(COOKIE_KINDS, 1):
+        xpaths[f"{modal}/div[2]/div[{n}]/div/label/input"] = cookie_toggle(kind)
+    for n, plan in enumerate(PRICING_PLANS, 1):
+        xpaths[f"html/body/div/div/section[10]/div/div[2]/div[{n}]/button"] = pricing_cta(plan)
+    # FAQ.tsx renders seven questions
+    for n in range(1, 8):
+        xpaths[f"html/body/div/div/section[11]/div/div[2]/div[{n}]/button"] = faq_question(n - 1)
+    for n, section in enumerate(NAV_DIRECT_LINKS, 1):
+        xpaths[f"{nav}/a[{n}]"] = nav_link(section)
+    # The Solutions dropdown lists its links in two columns of four
+    for n, section in enumerate(NAV_SOLUTION_LINKS):
+        column, row = divmod(n, 4)
+        xpaths[f"{nav}/div/div[1]/div[2]/div/div/div[{column + 1}]/div/div/a[{row + 1}]"] = nav_menu_link(section)
+    return {normalize_xpath(xpath): testid for xpath, testid in xpaths.items()}
+
+
+# Recorded absolute XPath (``[1]`` steps dropped) -> data-testid
+RECORDED_XPATHS: dict[str, str] = _recorded_xpaths()
+
+
+def scan_testids(sources: tuple[Path, ...] = TESTID_SOURCES) -> tuple[set[str], set[str]]:
+    """(literal test ids, template prefixes) declared in the component sources."""
+    literals: set[str] = set()
+    prefixes: set[str] = set()
+    for path in sources:
+        text = path.read_text(encoding="utf-8")
+        literals.update(_LITERAL_TESTID.findall(text))
+        prefixes.update(_TEMPLATE_TESTID.findall(text))
+        prefixes.update(_TEMPLATE_PROP.findall(text))
+    return literals, prefixes
+
+
+def template_ids(components_dir: Path = COMPONENTS_DIR) -> set[str]:
+    """Concrete ids the templated ``data-testid``s render, read from the data each one maps over."""
+    def read(name: str) -> str:
+        return (components_dir / name).read_text(encoding="utf-8")
+
+    ids: set[str] = set()
+    for index in range(len(_FAQ_ENTRY.findall(read("FAQ.tsx")))):
+        ids.update((faq_question(index), faq_answer(index)))
+    for name in _NAME_FIELD.findall(read("Pricing.tsx")):
+        ids.update((pricing_plan(name.lower()), pricing_cta(name.lower())))
+    ids.update(cookie_toggle(kind) for kind in _ID_FIELD.findall(read("CookieConsent.tsx")))
+    for section in _URL_FIELD.findall(read("ui/tubelight-navbar.tsx")):
+        ids.update((nav_link(section), nav_menu_link(section), nav_mobile_link(section)))
+    return ids
+
+
+@dataclass
+class Validation:
+    """Outcome of checking the registry against sources and scripts."""
+
+    stale: dict[str, str] = field(default_factory=dict)
+    unmapped: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.stale
+
+    def format(self) -> str:
+        lines = []
+        for xpath, testid in sorted(self.stale.items()):
+            lines.append(f"stale: {testid!r} (for {xpath}) is not declared in the component sources")
+        for xpath, uses in sorted(self.unmapped.items(), key=lambda item: -item[1]):
+            lines.append(f"unmapped: {xpath} (used {uses}x)")
+        return "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=None)
+def validate(tests_dir: Path = TESTS_DIR, sources: tuple[Path, ...] = TESTID_SOURCES,
+             components_dir: Path = COMPONENTS_DIR) -> Validation:
+    """Find mapped test ids ``sources`` do not render and script XPaths with no mapping.
+
+    Cached: ``cmd_run`` reports the result and the runner builds its index
+    from the same scan.
+    """
+    literals, prefixes = scan_testids(sources)
+    rendered = template_ids(components_dir)
+    result = Validation()
+    for xpath, testid in RECORDED_XPATHS.items():
+        templated = testid in rendered and any(testid.startswith(prefix) for prefix in prefixes)
+        if testid not in literals and not templated:
+            result.stale[xpath] = testid
+    for script in sorted(tests_dir.glob("TC*.py")):
+        for xpath in _SCRIPT_XPATH.findall(script.read_text(encoding="utf-8")):
+            key = normalize_xpath(xpath)
+            if key not in RECORDED_XPATHS:
+                result.unmapped[key] = result.unmapped.get(key, 0) + 1
+    return result
+
+
+class SelectorIndex:
+    """Rewrites recorded XPaths to test id selectors, memoising lookups."""
+
+    def __init__(self, xpaths: dict[str, str]):
+        self.xpaths = xpaths
+        self._resolved: dict[str, str] = {}
+
+    @classmethod
+    def build(cls, validation: Validation | None = None) -> "SelectorIndex":
+        """Index over ``RECORDED_XPATHS`` minus anything ``validation`` found stale."""
+        stale = validation.stale if validation is not None else {}
+        return cls({xpath: testid for xpath, testid in RECORDED_XPATHS.items() if xpath not in stale})
+
+    def resolve(self, selector: str) -> str:
+        resolved = self._resolved.get(selector)
+        if resolved is None:
+            resolved = selector
+            if selector.startswith("xpath="):
+                testid = self.xpaths.get(normalize_xpath(selector))
+                if testid is not None:
+                    resolved = by_testid(testid)
+            self._resolved[selector] = resolved
+        return resolved
@@ -0,0 +1,270 @@
+"""Production build served from the harness process.
+
+The TC scripts were recorded against the Vite dev server (unbundled ESM,
+HMR), whose timings say little about what visitors get.  Unless a
+``--base-url`` is given, the entry points build ``dist/`` once (``npm run
+build`` with ``LEADQ_ANALYZE=1``, skipped while it is newer than every
+input) and serve it from a ``ThreadingHTTPServer`` on a free local port:
+
+* every file is read and precompressed once at start-up, gzip and, with
+  the optional ``brotli`` package, brotli; responses pick the best
+  encoding ``Accept-Encoding`` allows and say ``Vary: Accept-Encoding``;
+* hashed files under ``assets/`` are ``immutable`` for a year, everything
+  else (``index.html``, ``public/`` files) is ``no-cache`` and revalidated
+  with an ``ETag``;
+* extensionless paths fall back to ``index.html``, like a static host
+  configured for a single-page app;
+* the manifest and hidden sourcemaps ``LEADQ_ANALYZE`` adds for
+  ``bundle.py`` and ``impact.py`` are read from disk, never served.
+
+``serve`` yields the config with ``base_url`` pointing at the server once
+a readiness probe has fetched the app shell.  Worker processes inherit
+that URL, so one server handles a sharded run.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import posixpath
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import unquote, urlsplit
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from .config import PROJECT_DIR, HarnessConfig
+
+DIST_DIR = PROJECT_DIR / "dist"
+
+# Files whose change makes dist/ stale
+BUILD_INPUTS = ("src", "public", "index.html", "vite.config.ts", "tailwind.config.js", "postcss.config.js",
+                "package.json", "package-lock.json")
+
+# Written only by an analysis build (LEADQ_ANALYZE=1 in vite.config.ts)
+ANALYSIS_MANIFEST = Path(".vite") / "manifest.json"
+
+COMPRESSIBLE = {".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".xml", ".webmanifest"}
+# Smaller bodies fit in one packet either way
+MIN_COMPRESS_BYTES = 1024
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# The app shell, as opposed to an error page or another server's index
+READY_MARKER = b'<div id="root">'
+
+mimetypes.add_type("text/javascript", ".js")
+mimetypes.add_type("text/javascript", ".mjs")
+mimetypes.add_type("font/woff2", ".woff2")
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+
+
+@dataclass
+class Asset:
+    content_type: str
+    cache_control: str
+    etag: str
+    # Body per content coding; "identity" is always present
+    bodies: dict[str, bytes]
+
+
+def load_assets(dist_dir: Path) -> dict[str, Asset]:
+    """Every file under ``dist_dir`` keyed by URL path (no leading slash), precompressed."""
+    assets: dict[str, Asset] = {}
+    for path in sorted(dist_dir.rglob("*")):
+        key = path.relative_to(dist_dir).as_posix()
+        # A production host has neither
+        if not path.is_file() or path.suffix == ".map" or key.startswith(".vite/"):
+            continue
+        body = path.read_bytes()
+        bodies = {"identity": body}
+        if path.suffix in COMPRESSIBLE and len(body) >= MIN_COMPRESS_BYTES:
+            bodies["gzip"] = gzip.compress(body, 9, mtime=0)
+            if brotli is not None:
+                bodies["br"] = brotli.compress(body, quality=11)
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/json", "image/svg+xml"):
+            content_type += "; charset=utf-8"
+        assets[key] = Asset(
+            content_type,
+            IMMUTABLE if key.startswith("assets/") else REVALIDATE,
+            hashlib.sha256(body).hexdigest()[:16],
+            bodies,
+        )
+    return assets
+
+
+def negotiate(accept_encoding: str, available: dict[str, bytes]) -> str:
+    """Best coding in ``available`` that ``accept_encoding`` allows (br, then gzip)."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in ("br", "gzip"):
+        if coding in available and accepted.get(coding, accepted.get("*", 0)) > 0:
+            return coding
+    return "identity"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "PreviewServer"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self._respond(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._respond(send_body=False)
+
+    def log_message(self, format: str, *args) -> None:
+        # Playwright's request log is the place to look
+        return None
+
+    def _respond(self, send_body: bool) -> None:
+        asset = self.server.lookup(urlsplit(self.path).path)
+        if asset is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        coding = negotiate(self.headers.get("Accept-Encoding", ""), asset.bodies)
+        etag = f'"{asset.etag}-{coding}"' if coding != "identity" else f'"{asset.etag}"'
+        if etag in (self.headers.get("If-None-Match") or ""):
+            self.send_response(304)
+            self._common_headers(asset, etag)
+            self.end_headers()
+            return
+        body = asset.bodies[coding]
+        self.send_response(200)
+        self._common_headers(asset, etag)
+        self.send_header("Content-Type", asset.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if coding != "identity":
+            self.send_header("Content-Encoding", coding)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _common_headers(self, asset: Asset, etag: str) -> None:
+        self.send_header("Cache-Control", asset.cache_control)
+        self.send_header("ETag", etag)
+        if len(asset.bodies) > 1:
+            self.send_header("Vary", "Accept-Encoding")
+
+
+class PreviewServer(ThreadingHTTPServer):
+    """Serves a loaded ``dist/`` from a background thread."""
+
+    daemon_threads = True
+
+    def __init__(self, dist_dir: Path = DIST_DIR, host: str = "127.0.0.1", port: int = 0):
+        if not (dist_dir / "index.html").exists():
+            raise FileNotFoundError(f"no build in {dist_dir}; run `npm run build`")
+        self.assets = load_assets(dist_dir)
+        super().__init__((host, port), _Handler)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def lookup(self, url_path: str) -> Asset | None:
+        key = posixpath.normpath(unquote(url_path)).lstrip("/")
+        if key in ("", "."):
+            key = "index.html"
+        if key.startswith(".."):
+            return None
+        asset = self.assets.get(key) or self.assets.get(posixpath.join(key, "index.html"))
+        if asset is None and not posixpath.splitext(key)[1]:
+            asset = self.assets.get("index.html")
+        return asset
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.serve_forever, name="preview-server", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def is_stale(dist_dir: Path = DIST_DIR, project_dir: Path = PROJECT_DIR) -> bool:
+    """True when ``dist/`` is missing, not an analysis build or older than any build input."""
+    built = dist_dir / "index.html"
+    if not built.exists() or not (dist_dir / ANALYSIS_MANIFEST).exists():
+        return True
+    built_at = built.stat().st_mtime
+    for name in BUILD_INPUTS:
+        root = project_dir / name
+        paths = root.rglob("*") if root.is_dir() else [root]
+        if any(path.is_file() and path.stat().st_mtime > built_at for path in paths):
+            return True
+    return False
+
+
+def ensure_build(dist_dir: Path = DIST_DIR) -> bool:
+    """Run ``npm run build`` with ``LEADQ_ANALYZE=1`` if ``dist/`` is stale; True when it built."""
+    if not is_stale(dist_dir):
+        return False
+    try:
+        subprocess.run(["npm", "run", "build"], cwd=PROJECT_DIR, check=True, env={**os.environ, "LEADQ_ANALYZE": "1"})
+    except FileNotFoundError as exc:
+        raise RuntimeError("npm is not installed; build dist/ first or pass --base-url") from exc
+    except subprocess.CalledProcessError as exc:
+        raise RuntimeError(f"`npm run build` failed with exit code {exc.returncode}") from exc
+    return True
+
+
+def wait_ready(url: str, timeout: float = 10.0) -> None:
+    """Poll ``url`` until it serves the app shell."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200 and READY_MARKER in response.read():
+                    return
+        except (urllib.error.URLError, OSError):
+            pass
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"{url} did not serve the app shell within {timeout:.0f}s")
+        time.sleep(0.05)
+
+
+@contextmanager
+def serve(config: HarnessConfig, port: int = 0) -> Iterator[HarnessConfig]:
+    """``config`` as is when it names a ``base_url``, else pointed at a served build."""
+    if config.base_url:
+        yield config
+        return
+    if config.build:
+        ensure_build()
+    server = PreviewServer(port=port)
+    server.start()
+    try:
+        wait_ready(server.url)
+        yield replace(config, base_url=server.url)
+    finally:
+        server.stop()
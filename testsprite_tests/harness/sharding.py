@@ -0,0 +1,78 @@
+"""Split the suite across worker processes, each with its own browser.
+
+Shards are balanced with the longest-processing-time-first heuristic using
+the mean durations recorded in the run history; tests with no history are
+weighted with the median of the known durations.  Workers run their shard
+through the normal ``SuiteRunner`` and send plain result dicts back, which
+are merged into a single list in plan order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import multiprocessing
+import statistics
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+
+from .config import HarnessConfig
+from .loader import TestCase, discover
+from .report import ERROR, TestResult
+from .runner import run_suite
+
+# Weight used for every test when there is no history at all
+DEFAULT_DURATION = 30.0
+
+
+@dataclass
+class Shard:
+    index: int
+    test_ids: list[str]
+    expected_duration: float
+
+
+def plan_shards(cases: list[TestCase], workers: int, durations: dict[str, float]) -> list[Shard]:
+    """Assign ``cases`` to at most ``workers`` shards of similar total duration."""
+    fallback = statistics.median(durations.values()) if durations else DEFAULT_DURATION
+    weighted = sorted(
+        ((durations.get(case.id, fallback), case.id) for case in cases),
+        key=lambda item: (-item[0], item[1]),
+    )
+    shards = [Shard(index, [], 0.0) for index in range(max(1, min(workers, len(cases))))]
+    heap = [(0.0, shard.index) for shard in shards]
+    for duration, test_id in weighted:
+        load, index = heapq.heappop(heap)
+        shards[index].test_ids.append(test_id)
+        shards[index].expected_duration = load + duration
+        heapq.heappush(heap, (load + duration, index))
+    return [shard for shard in shards if shard.test_ids]
+
+
+def _run_shard(shard: Shard, config: HarnessConfig) -> list[dict]:
+    # Runs in a worker process: discover again rather than pickling scripts
+    shard_config = replace(config, output_dir=config.output_dir / f"shard-{shard.index}")
+    cases = discover(ids=shard.test_ids)
+    results = asyncio.run(run_suite(cases, shard_config))
+    return [result.to_dict() for result in results]
+
+
+def run_sharded(cases: list[TestCase], config: HarnessConfig, workers: int, durations: dict[str, float]) -> list[TestResult]:
+    """Run ``cases`` in ``workers`` processes and merge their results."""
+    shards = plan_shards(cases, workers, durations)
+    # Playwright's driver does not survive fork(); always start fresh interpreters
+    context = multiprocessing.get_context("spawn")
+    titles = {case.id: case.title for case in cases}
+    merged: list[TestResult] = []
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=context) as pool:
+        futures = [(shard, pool.submit(_run_shard, shard, config)) for shard in shards]
+        for shard, future in futures:
+            try:
+                merged.extend(TestResult(**row) for row in future.result())
+            except Exception:
+                # A crashed worker fails its whole shard without hiding the others
+                message = f"shard {shard.index} crashed:\n{traceback.format_exc()}"
+                merged.extend(TestResult(test_id, titles[test_id], ERROR, 0.0, message) for test_id in shard.test_ids)
+    order = {case.id: position for position, case in enumerate(cases)}
+    return sorted(merged, key=lambda result: order.get(result.test_id, len(order)))
@@ -0,0 +1,658 @@
+"""Snapshot once, assert many: read-only content tests without a browser.
+
+TC012, TC013, TC015 and TC025 (``HarnessConfig.snapshot_tests``) only
+check static content, yet each one would load the SPA and dismiss the
+cookie banner in a browser of its own.  Instead the runner renders the
+page once in a consent-seeded context, scrolls through it so every lazy
+section mounts and every ``whileInView`` reveal fires, and captures the
+final DOM (CDP ``DOMSnapshot.captureSnapshot``, with layout boxes and
+``visibility``) and accessibility tree (``Accessibility.getFullAXTree``)
+to ``<output-dir>/snapshot.json``.
+
+The scripts then run against a ``SnapshotSession``: pages, locators and
+``expect`` are answered in Python from that snapshot, so all of them are
+evaluated concurrently in milliseconds.  Visibility follows Playwright's
+rule (non-empty box, not ``visibility: hidden``), ``text=`` selectors
+match the smallest element containing the text, and XPath, simple CSS,
+``role=`` and ``>>`` chains are supported.  Actions such as clicks are
+recorded and skipped: on a fully rendered page they only navigate.  Their
+target must still be there, and visible unless Playwright would not wait
+for that, or the action times out as it would live.
+
+A script that needs anything else (``evaluate``, the mouse, a custom
+viewport, a navigation off the app) raises ``SnapshotUnsupported`` and is
+run live in the browser instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import time
+import traceback
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Callable
+
+from playwright import async_api
+
+from .loader import LoadedScript, TestCase
+from .netcache import CacheStats
+from .pool import consent_storage_state, origin_of
+from .report import ERROR, FAILED, PASSED, TIMEOUT, TestResult
+from .selectors import SelectorIndex
+
+# Scrolls down half a viewport at a time until the (growing) page ends
+REVEAL_SCRIPT = """
+async (stepDelay) => {
+  const step = Math.max(1, Math.floor(window.innerHeight / 2));
+  for (let y = 0; y <= document.documentElement.scrollHeight; y += step) {
+    window.scrollTo({ top: y, behavior: 'instant' });
+    await new Promise((resolve) => setTimeout(resolve, stepDelay));
+  }
+  window.scrollTo({ top: 0, behavior: 'instant' });
+}
+"""
+
+# Finite CSS/WAAPI animations; framer-motion's JS tweens are covered by the settle wait
+ANIMATIONS_DONE_SCRIPT = """
+(timeout) => Promise.race([
+  Promise.all(document.getAnimations()
+    .filter((animation) => animation.effect && animation.effect.getComputedTiming().iterations !== Infinity)
+    .map((animation) => animation.finished.catch(() => null))),
+  new Promise((resolve) => setTimeout(resolve, timeout)),
+])
+"""
+
+ELEMENT_NODE = 1
+TEXT_NODE = 3
+
+# Elements whose text is never rendered
+NO_TEXT = {"script", "style", "noscript", "template"}
+
+ACTIONS = {
+    "check", "click", "dblclick", "fill", "focus", "hover", "press", "press_sequentially",
+    "scroll_into_view_if_needed", "select_option", "set_checked", "tap", "type", "uncheck",
+}
+# Actions Playwright runs on an attached element whether it is visible or not
+ATTACHED_ACTIONS = {"focus", "scroll_into_view_if_needed"}
+
+_CSS_COMPOUND = re.compile(r"^(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<rest>(?:#[\w-]+|\.[\w-]+|\[[^\]]+\])*)$")
+_CSS_PART = re.compile(r"#([\w-]+)|\.([\w-]+)|\[\s*([\w-]+)\s*(?:([~^$*]?=)\s*(\"[^\"]*\"|'[^']*'|[^\]\s]*))?\s*\]")
+_ROLE_SELECTOR = re.compile(r"^(?P<role>[\w-]+)(?:\[name=(?P<quote>[\"'])(?P<name>.*?)(?P=quote)(?P<flag>[is]?)\])?$")
+
+
+class SnapshotUnsupported(Exception):
+    """The script needs a live page; it is run in the browser instead."""
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+class Snapshot:
+    """The rendered page as an ``ElementTree`` plus visibility and ARIA roles."""
+
+    def __init__(self, capture: dict[str, Any]):
+        self.url: str = capture["url"]
+        self.title: str = capture["title"]
+        self.root: ET.Element | None = None
+        self.visible: set[ET.Element] = set()
+        self.roles: dict[ET.Element, tuple[str, str]] = {}
+        self._build(capture["dom"], capture["ax"])
+        if self.root is None:
+            raise ValueError("snapshot has no document element")
+        body = self.root.find("body")
+        self.body = body if body is not None else self.root
+        self.order = {element: index for index, element in enumerate(self.root.iter())}
+        self._text: dict[ET.Element, str] = {}
+        self._normalized: dict[ET.Element, str] = {}
+
+    def _build(self, dom: dict[str, Any], ax: dict[str, Any]) -> None:
+        strings = dom["strings"]
+        document = dom["documents"][0]
+        nodes = document["nodes"]
+        layout = document["layout"]
+        visibility = {
+            index: (bounds, styles)
+            for index, bounds, styles in zip(layout["nodeIndex"], layout["bounds"], layout["styles"])
+        }
+        elements: dict[int, ET.Element] = {}
+        by_backend: dict[int, ET.Element] = {}
+        for index, (parent, node_type) in enumerate(zip(nodes["parentIndex"], nodes["nodeType"])):
+            parent_element = elements.get(parent)
+            if node_type == ELEMENT_NODE:
+                raw = nodes["attributes"][index]
+                attributes = {strings[raw[i]]: strings[raw[i + 1]] for i in range(0, len(raw), 2)}
+                tag = strings[nodes["nodeName"][index]].lower()
+                element = ET.Element(tag, attributes) if parent_element is None else ET.SubElement(parent_element, tag, attributes)
+                if parent_element is None and self.root is None:
+                    self.root = element
+                elements[index] = element
+                by_backend[nodes["backendNodeId"][index]] = element
+                box = visibility.get(index)
+                if box is not None:
+                    bounds, styles = box
+                    hidden = styles and strings[styles[0]] == "hidden"
+                    if len(bounds) == 4 and bounds[2] > 0 and bounds[3] > 0 and not hidden:
+                        self.visible.add(element)
+            elif node_type == TEXT_NODE and parent_element is not None and parent_element.tag not in NO_TEXT:
+                value = strings[nodes["nodeValue"][index]]
+                if len(parent_element):
+                    last = parent_element[-1]
+                    last.tail = (last.tail or "") + value
+                else:
+                    parent_element.text = (parent_element.text or "") + value
+        for node in ax.get("nodes", []):
+            element = by_backend.get(node.get("backendDOMNodeId"))
+            if element is None or node.get("ignored"):
+                continue
+            role = node.get("role", {}).get("value", "")
+            name = node.get("name", {}).get("value", "")
+            if role and role not in ("generic", "none", "StaticText", "InlineTextBox"):
+                self.roles[element] = (role, name)
+
+    @classmethod
+    def load(cls, path: Path) -> "Snapshot":
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    # -- text -------------------------------------------------------------
+
+    def raw_text(self, element: ET.Element) -> str:
+        cached = self._text.get(element)
+        if cached is None:
+            parts = [element.text or ""]
+            for child in element:
+                parts.append(self.raw_text(child))
+                parts.append(child.tail or "")
+            cached = self._text[element] = "".join(parts)
+        return cached
+
+    def text(self, element: ET.Element) -> str:
+        cached = self._normalized.get(element)
+        if cached is None:
+            cached = self._normalized[element] = normalize_text(self.raw_text(element))
+        return cached
+
+    # -- queries ----------------------------------------------------------
+
+    def query(self, selector: str, scopes: list[ET.Element] | None = None) -> list[ET.Element]:
+        """Elements matching a Playwright selector, in document order."""
+        matches = scopes
+        for part in selector.split(">>"):
+            matches = self._query_one(part.strip(), matches)
+        return matches or []
+
+    def _query_one(self, selector: str, scopes: list[ET.Element] | None) -> list[ET.Element]:
+        scopes = scopes if scopes is not None else [self.root]
+        found: dict[ET.Element, None] = {}
+        for scope in scopes:
+            for element in self._match(selector, scope):
+                found[element] = None
+        return sorted(found, key=self.order.__getitem__)
+
+    def _descendants(self, scope: ET.Element) -> list[ET.Element]:
+        start = self.body if scope is self.root else scope
+        return [element for element in start.iter() if element is not scope]
+
+    def _match(self, selector: str, scope: ET.Element) -> list[ET.Element]:
+        if selector.startswith("xpath="):
+            return self._xpath(selector[len("xpath="):], scope)
+        if selector.startswith(("/", "(")) or selector.startswith(".."):
+            return self._xpath(selector, scope)
+        if selector.startswith("text="):
+            return self.by_text(selector[len("text="):], scope)
+        if selector.startswith("role="):
+            match = _ROLE_SELECTOR.match(selector[len("role="):])
+            if match is None:
+                raise SnapshotUnsupported(f"role selector {selector!r}")
+            exact = match.group("flag") == "s"
+            return self.by_role(match.group("role"), match.group("name"), exact, scope)
+        if selector.startswith("css="):
+            selector = selector[len("css="):]
+        return self._css(selector, scope)
+
+    def _xpath(self, xpath: str, scope: ET.Element) -> list[ET.Element]:
+        # ElementTree's XPath subset: child steps, //, positional and [@attr='v'] predicates
+        if xpath.startswith("//"):
+            base, path = scope, "." + xpath
+        elif xpath.startswith("/") or xpath.split("/", 1)[0] == "html":
+            steps = xpath.lstrip("/").split("/", 1)
+            if steps[0] != "html":
+                raise SnapshotUnsupported(f"XPath {xpath!r}")
+            if len(steps) == 1:
+                return [self.root]
+            base, path = self.root, "./" + steps[1]
+        else:
+            base, path = scope, "./" + xpath
+        try:
+            return base.findall(path)
+        except (SyntaxError, KeyError, TypeError) as exc:
+            raise SnapshotUnsupported(f"XPath {xpath!r}") from exc
+
+    def by_text(self, text: str, scope: ET.Element, exact: bool = False) -> list[ET.Element]:
+        """Smallest elements whose text matches, like Playwright's text engine."""
+        if len(text) > 1 and text[0] == text[-1] and text[0] in "\"'":
+            wanted = normalize_text(text[1:-1])
+            matches: Callable[[str], bool] = lambda value: value == wanted
+        elif len(text) > 1 and text.startswith("/") and text.rfind("/") > 0:
+            end = text.rfind("/")
+            pattern = re.compile(text[1:end], re.IGNORECASE if "i" in text[end + 1:] else 0)
+            matches = lambda value: pattern.search(value) is not None
+        elif exact:
+            wanted = normalize_text(text)
+            matches = lambda value: value == wanted
+        else:
+            wanted = normalize_text(text).lower()
+            matches = lambda value: wanted in value.lower()
+        hits = []
+        for element in self._descendants(scope):
+            if element.tag in NO_TEXT or not matches(self.text(element)):
+                continue
+            if not any(matches(self.text(child)) for child in element):
+                hits.append(element)
+        return hits
+
+    def by_role(self, role: str, name: str | None, exact: bool, scope: ET.Element) -> list[ET.Element]:
+        hits = []
+        for element in self._descendants(scope):
+            element_role, element_name = self.roles.get(element, ("", ""))
+            if element_role != role:
+                continue
+            if name is not None:
+                if exact and element_name != name:
+                    continue
+                if not exact and normalize_text(name).lower() not in normalize_text(element_name).lower():
+                    continue
+            hits.append(element)
+        return hits
+
+    def _css(self, selector: str, scope: ET.Element) -> list[ET.Element]:
+        candidates = [scope]
+        for compound in selector.split():
+            test = self._compound(compound)
+            candidates = [
+                element
+                for element in dict.fromkeys(d for c in candidates for d in self._descendants(c))
+                if test(element)
+            ]
+        return candidates
+
+    def _compound(self, compound: str) -> Callable[[ET.Element], bool]:
+        match = _CSS_COMPOUND.match(compound)
+        if match is None or not compound:
+            raise SnapshotUnsupported(f"CSS selector {compound!r}")
+        checks: list[Callable[[ET.Element], bool]] = []
+        tag = match.group("tag")
+        if tag and tag != "*":
+            checks.append(lambda element, tag=tag.lower(): element.tag == tag)
+        for part in _CSS_PART.finditer(match.group("rest")):
+            element_id, class_name, attribute, operator, value = part.groups()
+            if element_id:
+                checks.append(lambda element, value=element_id: element.get("id") == value)
+            elif class_name:
+                checks.append(lambda element, value=class_name: value in element.get("class", "").split())
+            else:
+                value = value.strip("\"'") if value is not None else None
+                checks.append(_attribute_check(attribute, operator, value))
+        return lambda element: all(check(element) for check in checks)
+
+
+def _attribute_check(name: str, operator: str | None, value: str | None) -> Callable[[ET.Element], bool]:
+    tests: dict[str | None, Callable[[str, str], bool]] = {
+        None: lambda actual, _: True,
+        "=": lambda actual, wanted: actual == wanted,
+        "~=": lambda actual, wanted: wanted in actual.split(),
+        "^=": lambda actual, wanted: actual.startswith(wanted),
+        "$=": lambda actual, wanted: actual.endswith(wanted),
+        "*=": lambda actual, wanted: wanted in actual,
+    }
+    test = tests[operator]
+    return lambda element: element.get(name) is not None and test(element.get(name), value or "")
+
+
+async def capture(browser: async_api.Browser, url: str, path: Path, net_cache: Any = None,
+                  step_delay_ms: float = 120, settle_ms: float = 1000) -> Snapshot:
+    """Render ``url`` once, reveal every section and write the snapshot to ``path``."""
+    context = await browser.new_context(
+        viewport={"width": 1280, "height": 720},
+        storage_state=consent_storage_state([url]),
+    )
+    try:
+        if net_cache is not None:
+            stats = CacheStats()
+
+            async def handle(route: async_api.Route, request: async_api.Request) -> None:
+                await net_cache.handle(route, request, stats)
+
+            await context.route(net_cache.wants, handle)
+        page = await context.new_page()
+        await page.goto(url, wait_until="load")
+        await page.evaluate(REVEAL_SCRIPT, step_delay_ms)
+        await page.evaluate(ANIMATIONS_DONE_SCRIPT, settle_ms * 3)
+        await page.wait_for_timeout(settle_ms)
+        cdp = await context.new_cdp_session(page)
+        dom = await cdp.send("DOMSnapshot.captureSnapshot", {"computedStyles": ["visibility"]})
+        ax = await cdp.send("Accessibility.getFullAXTree")
+        data = {"url": page.url, "title": await page.title(), "dom": dom, "ax": ax}
+    finally:
+        await context.close()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return Snapshot(data)
+
+
+class SnapshotSession:
+    """Session handing loaded scripts a page backed by a ``Snapshot``."""
+
+    def __init__(self, snapshot: Snapshot, selectors: SelectorIndex | None = None):
+        self.snapshot = snapshot
+        self.selectors = selectors
+        self.skipped_actions = 0
+        self.assertions = 0
+        self.page = SnapshotPage(self)
+
+    async def new_context(self, **kwargs: Any) -> "SnapshotContext":
+        if kwargs:
+            raise SnapshotUnsupported(f"new_context({', '.join(kwargs)})")
+        return SnapshotContext(self)
+
+    def patch_namespace(self, namespace: dict[str, Any]) -> None:
+        namespace["expect"] = lambda target, *args, **kwargs: SnapshotExpect(self, target)
+        namespace["asyncio"] = _InstantAsyncio()
+
+    def resolve(self, selector: str) -> str:
+        return self.selectors.resolve(selector) if self.selectors is not None else selector
+
+
+class _InstantAsyncio:
+    async def sleep(self, delay: float, result: Any = None) -> Any:
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(asyncio, name)
+
+
+class _Unsupported:
+    _kind = "object"
+
+    def __getattr__(self, name: str) -> Any:
+        raise SnapshotUnsupported(f"{self._kind}.{name}")
+
+
+class SnapshotContext(_Unsupported):
+    _kind = "context"
+
+    def __init__(self, session: SnapshotSession):
+        self._session = session
+
+    async def new_page(self) -> "SnapshotPage":
+        return self._session.page
+
+    @property
+    def pages(self) -> list["SnapshotPage"]:
+        return [self._session.page]
+
+    def set_default_timeout(self, timeout: float) -> None:
+        return None
+
+    def set_default_navigation_timeout(self, timeout: float) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+class SnapshotPage(_Unsupported):
+    _kind = "page"
+
+    def __init__(self, session: SnapshotSession):
+        self._session = session
+
+    @property
+    def url(self) -> str:
+        return self._session.snapshot.url
+
+    @property
+    def frames(self) -> list["SnapshotPage"]:
+        return [self]
+
+    @property
+    def main_frame(self) -> "SnapshotPage":
+        return self
+
+    async def goto(self, url: str, **kwargs: Any) -> None:
+        # Every path of the SPA renders the same page
+        if origin_of(url) != origin_of(self._session.snapshot.url):
+            raise SnapshotUnsupported(f"goto({url!r})")
+
+    async def wait_for_load_state(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    async def wait_for_timeout(self, timeout: float) -> None:
+        return None
+
+    def set_default_timeout(self, timeout: float) -> None:
+        return None
+
+    def set_default_navigation_timeout(self, timeout: float) -> None:
+        return None
+
+    async def title(self) -> str:
+        return self._session.snapshot.title
+
+    async def close(self) -> None:
+        return None
+
+    def locator(self, selector: str, **kwargs: Any) -> "SnapshotLocator":
+        return SnapshotLocator(self._session, selector, lambda: None).locator(selector, **kwargs)
+
+    def get_by_text(self, text: str, exact: bool = False) -> "SnapshotLocator":
+        snapshot = self._session.snapshot
+        return SnapshotLocator(self._session, f"text={text}", lambda: snapshot.by_text(text, snapshot.root, exact))
+
+    def get_by_role(self, role: str, name: str | None = None, exact: bool = False, **kwargs: Any) -> "SnapshotLocator":
+        if kwargs:
+            raise SnapshotUnsupported(f"get_by_role({', '.join(kwargs)})")
+        snapshot = self._session.snapshot
+        return SnapshotLocator(self._session, f"role={role}", lambda: snapshot.by_role(role, name, exact, snapshot.root))
+
+
+class SnapshotLocator(_Unsupported):
+    _kind = "locator"
+
+    def __init__(self, session: SnapshotSession, description: str,
+                 resolve: Callable[[], list[ET.Element] | None]):
+        self._session = session
+        self._description = description
+        self._resolve = resolve
+
+    def __repr__(self) -> str:
+        return f"<SnapshotLocator {self._description}>"
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ACTIONS:
+            return lambda *args, **kwargs: self._skip(name)
+        return super().__getattr__(name)
+
+    async def _skip(self, action: str) -> None:
+        found = self._require()
+        if action not in ATTACHED_ACTIONS and found[0] not in self._session.snapshot.visible:
+            raise async_api.TimeoutError(f"locator.{action}: {self._description} is not visible in the snapshot")
+        self._session.skipped_actions += 1
+
+    def all(self) -> list[ET.Element]:
+        return self._resolve() or []
+
+    def _derive(self, suffix: str, pick: Callable[[list[ET.Element]], list[ET.Element]]) -> "SnapshotLocator":
+        return SnapshotLocator(self._session, self._description + suffix, lambda: pick(self.all()))
+
+    def nth(self, index: int) -> "SnapshotLocator":
+        return self._derive(f" >> nth={index}", lambda found: found[index:index + 1] if index >= 0 else found[index:][:1])
+
+    @property
+    def first(self) -> "SnapshotLocator":
+        return self.nth(0)
+
+    @property
+    def last(self) -> "SnapshotLocator":
+        return self.nth(-1)
+
+    def locator(self, selector: str, has_text: str | None = None, **kwargs: Any) -> "SnapshotLocator":
+        if kwargs:
+            raise SnapshotUnsupported(f"locator({', '.join(kwargs)})")
+        snapshot = self._session.snapshot
+        resolved = self._session.resolve(selector)
+        outer = self._resolve
+
+        def resolve() -> list[ET.Element]:
+            found = snapshot.query(resolved, outer())
+            if has_text is not None:
+                wanted = normalize_text(has_text).lower()
+                found = [element for element in found if wanted in snapshot.text(element).lower()]
+            return found
+
+        description = selector if self._description == selector else f"{self._description} >> {selector}"
+        return SnapshotLocator(self._session, description, resolve)
+
+    async def count(self) -> int:
+        return len(self.all())
+
+    async def is_visible(self, **kwargs: Any) -> bool:
+        found = self.all()
+        return bool(found) and found[0] in self._session.snapshot.visible
+
+    async def is_hidden(self, **kwargs: Any) -> bool:
+        return not await self.is_visible()
+
+    async def text_content(self, **kwargs: Any) -> str | None:
+        found = self.all()
+        return self._session.snapshot.raw_text(found[0]) if found else None
+
+    async def inner_text(self, **kwargs: Any) -> str:
+        found = self._require()
+        return self._session.snapshot.text(found[0])
+
+    async def all_text_contents(self) -> list[str]:
+        return [self._session.snapshot.raw_text(element) for element in self.all()]
+
+    async def all_inner_texts(self) -> list[str]:
+        return [self._session.snapshot.text(element) for element in self.all()]
+
+    async def get_attribute(self, name: str, **kwargs: Any) -> str | None:
+        return self._require()[0].get(name)
+
+    async def wait_for(self, state: str = "visible", **kwargs: Any) -> None:
+        found = self.all()
+        visible = bool(found) and found[0] in self._session.snapshot.visible
+        if (state == "visible" and not visible) or (state == "attached" and not found) \
+                or (state == "hidden" and visible) or (state == "detached" and found):
+            raise async_api.TimeoutError(f"locator.wait_for: {self._description} never became {state} in the snapshot")
+
+    def _require(self) -> list[ET.Element]:
+        found = self.all()
+        if not found:
+            raise async_api.TimeoutError(f"{self._description} matches nothing in the snapshot")
+        return found
+
+
+class SnapshotExpect(_Unsupported):
+    """``expect(locator)`` evaluated against the snapshot."""
+
+    _kind = "expect"
+
+    def __init__(self, session: SnapshotSession, locator: Any):
+        if not isinstance(locator, SnapshotLocator):
+            raise SnapshotUnsupported(f"expect({type(locator).__name__})")
+        self._session = session
+        self._locator = locator
+
+    def _check(self, passed: bool, expectation: str, actual: Any) -> None:
+        self._session.assertions += 1
+        if not passed:
+            raise AssertionError(
+                f"Locator expected {expectation}\nActual value: {actual}\nSelector: {self._locator._description} (snapshot)"
+            )
+
+    async def to_be_visible(self, visible: bool = True, **kwargs: Any) -> None:
+        actual = await self._locator.is_visible()
+        self._check(actual == visible, "to be visible" if visible else "to be hidden", "visible" if actual else "hidden")
+
+    async def not_to_be_visible(self, **kwargs: Any) -> None:
+        await self.to_be_visible(False)
+
+    async def to_be_hidden(self, **kwargs: Any) -> None:
+        await self.to_be_visible(False)
+
+    async def to_be_attached(self, attached: bool = True, **kwargs: Any) -> None:
+        actual = bool(self._locator.all())
+        self._check(actual == attached, "to be attached" if attached else "to be detached",
+                    "attached" if actual else "detached")
+
+    async def to_have_count(self, count: int, **kwargs: Any) -> None:
+        actual = await self._locator.count()
+        self._check(actual == count, f"to have count {count}", actual)
+
+    async def _texts(self) -> list[str]:
+        return await self._locator.all_inner_texts()
+
+    async def to_have_text(self, expected: Any, **kwargs: Any) -> None:
+        texts = await self._texts()
+        wanted = expected if isinstance(expected, list) else [expected]
+        passed = len(texts) == len(wanted) and all(_text_matches(text, value, full=True) for text, value in zip(texts, wanted))
+        self._check(passed, f"to have text {expected!r}", texts[0] if len(texts) == 1 else texts)
+
+    async def to_contain_text(self, expected: Any, **kwargs: Any) -> None:
+        texts = await self._texts()
+        wanted = expected if isinstance(expected, list) else [expected]
+        passed = bool(texts) and all(any(_text_matches(text, value, full=False) for text in texts) for value in wanted)
+        self._check(passed, f"to contain text {expected!r}", texts[0] if len(texts) == 1 else texts)
+
+    async def to_have_attribute(self, name: str, value: Any, **kwargs: Any) -> None:
+        found = self._locator.all()
+        actual = found[0].get(name) if found else None
+        passed = actual is not None and _text_matches(actual, value, full=True, normalize=False)
+        self._check(passed, f"to have attribute {name}={value!r}", actual)
+
+
+def _text_matches(text: str, expected: Any, full: bool, normalize: bool = True) -> bool:
+    if isinstance(expected, re.Pattern):
+        return expected.search(text) is not None
+    wanted = normalize_text(expected) if normalize else expected
+    return text == wanted if full else wanted in text
+
+
+async def run_offline(runner: Any, cases: list[TestCase]) -> list[TestResult]:
+    """Results for the ``cases`` that ran against one snapshot; others are left out to run live."""
+    config = runner.config
+    started = time.perf_counter()
+    snapshot = await capture(runner.browser, config.base_url, config.output_dir / "snapshot.json", runner.net_cache)
+    capture_s = time.perf_counter() - started
+    scripts = [LoadedScript(case, config.base_url, config.optimize_steps) for case in cases]
+    outcomes = await asyncio.gather(*(_evaluate(script, snapshot, runner.selectors, config.test_timeout) for script in scripts))
+    results = [result for result in outcomes if result is not None]
+    for result in results:
+        result.metrics["snapshot"]["capture_s"] = round(capture_s, 2)
+    return results
+
+
+async def _evaluate(script: LoadedScript, snapshot: Snapshot, selectors: SelectorIndex | None,
+                    timeout: float) -> TestResult | None:
+    case = script.case
+    session = SnapshotSession(snapshot, selectors)
+    started = time.perf_counter()
+    status, message = PASSED, ""
+    try:
+        await asyncio.wait_for(script.bind(session)(), timeout=timeout)
+    except SnapshotUnsupported:
+        return None
+    except AssertionError as exc:
+        status, message = FAILED, str(exc)
+    except asyncio.TimeoutError:
+        status, message = TIMEOUT, f"exceeded {timeout:.0f}s"
+    except Exception:
+        status, message = ERROR, traceback.format_exc()
+    result = TestResult(case.id, case.title, status, time.perf_counter() - started, message)
+    result.metrics["snapshot"] = {"assertions": session.assertions, "skipped_actions": session.skipped_actions}
+    return result
@@ -0,0 +1,69 @@
+"""Positions in the served build mapped back to project source files.
+
+The Vite dev server serves one URL per module (``/src/components/Hero.tsx``),
+which is all the trace and timer owners used to need.  A production build
+serves hashed chunks instead, so ``SourceMaps`` reads the hidden sourcemap
+an analysis build (``LEADQ_ANALYZE=1``, see ``server.py``) writes next to
+each chunk in ``dist/`` and answers which source file a generated position
+came from.  URLs that are not chunks of that build resolve to nothing and
+keep their own name.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import urlsplit
+
+from .bundle import decode_vlq, normalize_source
+from .server import DIST_DIR
+
+
+def segments(sourcemap: dict) -> Iterator[tuple[int, int, str, int]]:
+    """(generated line, column, source, 1-based source line) per mapping segment."""
+    root = sourcemap.get("sourceRoot") or ""
+    sources = [normalize_source(root + source) for source in sourcemap.get("sources", [])]
+    source = source_line = 0
+    for number, mappings in enumerate(sourcemap.get("mappings", "").split(";")):
+        column = 0
+        for segment in filter(None, mappings.split(",")):
+            fields = decode_vlq(segment)
+            column += fields[0]
+            if len(fields) >= 4:
+                source += fields[1]
+                source_line += fields[2]
+                yield number, column, sources[source], source_line + 1
+
+
+class SourceMaps:
+    """Source file lookups in the chunks of one build, each map read on first use."""
+
+    def __init__(self, dist_dir: Path = DIST_DIR):
+        self.dist_dir = dist_dir
+        # URL path -> generated line -> (segment columns, their sources)
+        self._chunks: dict[str, dict[int, tuple[list[int], list[str]]] | None] = {}
+
+    def source_at(self, url: str, line: int, column: int) -> str | None:
+        """Project-relative source of a 0-based ``line``/``column`` in the chunk at ``url``."""
+        lines = self._chunk(urlsplit(url).path)
+        if lines is None or line not in lines:
+            return None
+        columns, sources = lines[line]
+        index = bisect.bisect_right(columns, column) - 1
+        return sources[index] if index >= 0 else None
+
+    def _chunk(self, url_path: str) -> dict[int, tuple[list[int], list[str]]] | None:
+        if url_path not in self._chunks:
+            path = self.dist_dir / url_path.lstrip("/")
+            sourcemap = path.with_name(path.name + ".map")
+            lines: dict[int, tuple[list[int], list[str]]] | None = None
+            if path.suffix == ".js" and sourcemap.is_file():
+                lines = {}
+                for number, column, source, _ in segments(json.loads(sourcemap.read_text(encoding="utf-8"))):
+                    columns, sources = lines.setdefault(number, ([], []))
+                    columns.append(column)
+                    sources.append(source)
+            self._chunks[url_path] = lines
+        return self._chunks[url_path]
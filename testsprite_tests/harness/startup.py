@@ -0,0 +1,114 @@
+"""What the first screen of the landing page costs a mobile visitor.
+
+Each sample loads the page in a fresh context with a phone viewport and a
+throttled CPU (``Emulation.setCPUThrottlingRate``), traces the load and
+then stays at the top for a quiet window, so only what the first screen
+pulls in is counted:
+
+* ``initial_js_bytes`` / ``initial_js_transfer_bytes``: decoded and
+  on-the-wire size of every script fetched (Resource Timing);
+* ``compile_ms``: V8 parse/compile time on the renderer main thread;
+* ``eval_ms``: script and module evaluation on the main thread;
+* ``lcp_ms`` and ``cls`` from the ``vitals`` observers.
+
+Sections behind ``LazySection`` are only fetched once scrolled near, so
+comparing a build before and after splitting (``--target before=...
+--target after=...``) shows what moved out of the initial load.  Runs are
+also recorded as the ``startup`` suite and compared with its baseline.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from playwright import async_api
+
+from .config import HarnessConfig
+from .tracing import PageTrace, load_trace, main_thread_ms
+from .vitals import VITALS_INIT_SCRIPT
+
+# Lower is better for every metric
+METRICS = ("initial_js_bytes", "initial_js_transfer_bytes", "compile_ms", "eval_ms", "lcp_ms", "cls")
+
+TRACE_CATEGORIES = ["devtools.timeline", "v8", "v8.execute", "disabled-by-default-v8.compile", "loading"]
+
+COMPILE_EVENTS = {"v8.compile", "v8.compileModule", "V8.CompileCode"}
+EVAL_EVENTS = {"EvaluateScript", "v8.evaluateModule"}
+
+# Mid-range phone
+MOBILE = {
+    "viewport": {"width": 390, "height": 844},
+    "device_scale_factor": 3,
+    "is_mobile": True,
+    "has_touch": True,
+}
+
+# Dev server modules (.tsx, .ts) count as scripts too
+INITIAL_JS_SCRIPT = """
+() => performance.getEntriesByType('resource')
+  .filter((entry) => /\\.(m?js|jsx|tsx?)$/.test(new URL(entry.name).pathname))
+  .reduce((total, entry) => ({
+    decoded: total.decoded + (entry.decodedBodySize || 0),
+    transfer: total.transfer + (entry.transferSize || 0),
+  }), { decoded: 0, transfer: 0 })
+"""
+
+
+async def measure_startup(browser: async_api.Browser, url: str, trace_path: Path, cpu_slowdown: float = 4,
+                          settle_ms: float = 3000) -> dict[str, float]:
+    """Load ``url`` once in a fresh mobile context and return one sample."""
+    context = await browser.new_context(**MOBILE)
+    try:
+        await context.add_init_script(VITALS_INIT_SCRIPT)
+        page = await context.new_page()
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Emulation.setCPUThrottlingRate", {"rate": cpu_slowdown})
+        trace = PageTrace(context, page, TRACE_CATEGORIES)
+        await trace.started
+        await page.goto(url, wait_until="load")
+        await page.wait_for_timeout(settle_ms)
+        vitals = await page.evaluate("window.__leadqVitals.load()")
+        scripts = await page.evaluate(INITIAL_JS_SCRIPT)
+        events = load_trace(await trace.stop(trace_path))
+    finally:
+        await context.close()
+    return {
+        "initial_js_bytes": float(scripts["decoded"]),
+        "initial_js_transfer_bytes": float(scripts["transfer"]),
+        "compile_ms": main_thread_ms(events, COMPILE_EVENTS),
+        "eval_ms": main_thread_ms(events, EVAL_EVENTS),
+        "lcp_ms": float(vitals["lcp_ms"]),
+        "cls": float(vitals["cls"]),
+    }
+
+
+async def run_startup(browser: async_api.Browser, targets: dict[str, str], runs: int, trace_dir: Path,
+                      cpu_slowdown: float = 4, settle_ms: float = 3000) -> dict[str, dict[str, list[float]]]:
+    """``runs`` samples per target; the last trace of each target is kept in ``trace_dir``."""
+    trace_dir.mkdir(parents=True, exist_ok=True)
+    samples: dict[str, dict[str, list[float]]] = {}
+    for name, url in targets.items():
+        series: dict[str, list[float]] = {metric: [] for metric in METRICS}
+        for _ in range(runs):
+            sample = await measure_startup(browser, url, trace_dir / f"{name}.trace.json", cpu_slowdown, settle_ms)
+            for metric in METRICS:
+                series[metric].append(sample[metric])
+        samples[name] = series
+    return samples
+
+
+async def collect(config: HarnessConfig, targets: dict[str, str], runs: int, cpu_slowdown: float = 4,
+                  settle_ms: float = 3000) -> dict[str, dict[str, list[float]]]:
+    """Launch a browser and measure every target."""
+    async with async_api.async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=config.headless, args=config.browser_args)
+        try:
+            return await run_startup(browser, targets, runs, config.ensure_output_dir() / "startup",
+                                     cpu_slowdown, settle_ms)
+        finally:
+            await browser.close()
+
+
+def default_targets(config: HarnessConfig) -> dict[str, str]:
+    # Chunks only exist in a production build
+    return {"preview": config.base_url}
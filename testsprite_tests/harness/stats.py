@@ -0,0 +1,95 @@
+"""Small statistics helpers shared by the benchmarks."""
+
+from __future__ import annotations
+
+import math
+import statistics
+from dataclasses import dataclass
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def slope(values: list[float]) -> float:
+    """Least-squares growth of ``values`` per step (0 for fewer than two)."""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    variance = sum((x - mean_x) ** 2 for x in range(n))
+    return covariance / variance
+
+
+def mann_whitney_z(baseline: list[float], current: list[float]) -> float:
+    """One-sided Mann-Whitney U statistic as a z-score.
+
+    Positive values mean ``current`` tends to be larger than ``baseline``.
+    Uses the normal approximation with a tie correction, which is adequate
+    for the handful of samples a benchmark run produces.
+    """
+    n1, n2 = len(baseline), len(current)
+    if not n1 or not n2:
+        return 0.0
+    pooled = sorted([(value, 0) for value in baseline] + [(value, 1) for value in current])
+    ranks = [0.0] * len(pooled)
+    tie_term = 0.0
+    start = 0
+    while start < len(pooled):
+        end = start
+        while end + 1 < len(pooled) and pooled[end + 1][0] == pooled[start][0]:
+            end += 1
+        for index in range(start, end + 1):
+            ranks[index] = (start + end) / 2 + 1
+        tied = end - start + 1
+        tie_term += tied**3 - tied
+        start = end + 1
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, pooled) if group == 1)
+    u = rank_sum - n2 * (n2 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 0.0
+    return (u - n1 * n2 / 2) / math.sqrt(variance)
+
+
+@dataclass
+class Comparison:
+    metric: str
+    baseline_median: float
+    current_median: float
+    relative_change: float
+    z: float
+    regressed: bool
+
+    def describe(self) -> str:
+        flag = "REGRESSED" if self.regressed else "ok"
+        return (
+            f"{self.metric:<22} {self.baseline_median:10.2f} -> {self.current_median:10.2f} "
+            f"({self.relative_change:+.1%}, z={self.z:+.2f}) {flag}"
+        )
+
+
+def compare(metric: str, baseline: list[float], current: list[float], z_threshold: float = 1.96,
+            min_relative_change: float = 0.05) -> Comparison:
+    """Flag ``current`` as a regression of ``baseline`` (higher is worse).
+
+    Both conditions must hold: the shift is statistically significant at
+    ``z_threshold`` and the medians differ by at least ``min_relative_change``.
+    """
+    base_median = statistics.median(baseline) if baseline else 0.0
+    current_median = statistics.median(current) if current else 0.0
+    if base_median:
+        change = (current_median - base_median) / abs(base_median)
+    else:
+        change = 0.0 if not current_median else math.inf
+    z = mann_whitney_z(baseline, current)
+    regressed = bool(baseline) and z >= z_threshold and change >= min_relative_change
+    return Comparison(metric, base_median, current_median, change, z, regressed)
@@ -0,0 +1,324 @@
+"""Actionability-driven steps in place of the generator's fixed sleeps.
+
+The recorded scripts put ``await page.wait_for_timeout(3000)`` in front of
+every ``click``/``fill``.  When auto-wait is enabled the loader swaps each
+sleep that directly precedes one of the ``ACTIONS`` for a
+``SKIPPED_SLEEP`` call that only records it (see
+``compiler.skip_action_sleeps``); every other sleep still runs.  The
+scripts get proxied pages and locators, and each action first waits until
+its target is
+
+* visible and enabled,
+* stable (same bounding box for a few consecutive animation frames, which
+  is how ``framer-motion`` springs and ``whileInView`` reveals show up),
+* free of finite Web Animations on itself or its ancestors, and
+* not covered by a fixed overlay such as the ``CookieConsent`` backdrop,
+
+and then acts immediately.  Every step's wait and action latency is
+recorded so the run can print a histogram.  Recorded absolute XPaths that
+``selectors.py`` maps to a ``data-testid`` are looked up by test id instead.
+A target that is not in the DOM yet may sit in a lazily mounted section
+(``LazySection.tsx``); the pending placeholders are scrolled through once
+so their chunks load before the wait starts.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from playwright import async_api
+
+from .selectors import SelectorIndex
+from .stats import percentile
+
+# Resolves once the element has settled, or reports why it did not
+SETTLE_SCRIPT = """
+async (el, opts) => {
+  const deadline = performance.now() + opts.timeout;
+  const nextFrame = () => new Promise((resolve) => requestAnimationFrame(() => resolve()));
+  const box = () => {
+    const r = el.getBoundingClientRect();
+    return [r.x, r.y, r.width, r.height].map((v) => Math.round(v * 2) / 2).join(',');
+  };
+  const animating = () => {
+    for (let node = el; node; node = node.parentElement) {
+      for (const animation of node.getAnimations()) {
+        const timing = animation.effect && animation.effect.getComputedTiming();
+        if (animation.playState === 'running' && timing && Number.isFinite(timing.endTime)) {
+          return true;
+        }
+      }
+    }
+    return false;
+  };
+  const coveredBy = () => {
+    const r = el.getBoundingClientRect();
+    const hit = document.elementFromPoint(r.x + r.width / 2, r.y + r.height / 2);
+    if (!hit || hit === el || el.contains(hit) || hit.contains(el)) return null;
+    for (let node = hit; node; node = node.parentElement) {
+      if (getComputedStyle(node).position === 'fixed') {
+        return node.tagName.toLowerCase() + (node.className ? '.' + String(node.className).split(' ').join('.') : '');
+      }
+    }
+    return null;
+  };
+  let last = box();
+  let still = 0;
+  let reason = 'timeout';
+  while (performance.now() < deadline) {
+    await nextFrame();
+    const current = box();
+    still = current === last ? still + 1 : 0;
+    last = current;
+    if (el.disabled || el.getAttribute('aria-disabled') === 'true') { reason = 'disabled'; continue; }
+    if (still < opts.frames) { reason = 'moving'; continue; }
+    if (animating()) { reason = 'animating'; continue; }
+    const cover = coveredBy();
+    if (cover) { reason = 'covered by ' + cover; continue; }
+    return { settled: true, reason: '' };
+  }
+  return { settled: false, reason };
+}
+"""
+
+# Scrolls through LazySection placeholders until they mount, then scrolls back;
+# resolves to the number still pending
+MOUNT_LAZY_SCRIPT = """
+async (timeout) => {
+  const pending = () => document.querySelector('section[aria-busy="true"]');
+  const deadline = performance.now() + timeout;
+  const { scrollX, scrollY } = window;
+  const pause = () => new Promise((resolve) => setTimeout(resolve, 50));
+  for (let placeholder = pending(); placeholder && performance.now() < deadline; placeholder = pending()) {
+    placeholder.scrollIntoView({ block: 'start', behavior: 'instant' });
+    await pause();
+  }
+  window.scrollTo({ left: scrollX, top: scrollY, behavior: 'instant' });
+  return document.querySelectorAll('section[aria-busy="true"]').length;
+}
+"""
+
+# Upper bounds of the histogram buckets, in milliseconds
+HISTOGRAM_BOUNDS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Locator methods routed through the actionability wait
+ACTIONS = frozenset({"click", "dblclick", "fill", "press", "type", "check", "uncheck", "hover", "select_option"})
+
+# Name a loaded script calls, in place of a sleep before an action, with its length in ms
+SKIPPED_SLEEP = "__skipped_sleep__"
+
+
+@dataclass
+class StepTiming:
+    action: str
+    selector: str
+    wait_ms: float
+    action_ms: float
+    settled: bool
+    reason: str = ""
+
+    @property
+    def total_ms(self) -> float:
+        return self.wait_ms + self.action_ms
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of step latencies."""
+
+    def __init__(self, bounds_ms: tuple[int, ...] = HISTOGRAM_BOUNDS_MS):
+        self.bounds_ms = bounds_ms
+        self.counts = [0] * (len(bounds_ms) + 1)
+
+    def add(self, value_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds_ms, value_ms)] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+    def labels(self) -> list[str]:
+        labels = [f"<= {bound} ms" for bound in self.bounds_ms]
+        labels.append(f"> {self.bounds_ms[-1]} ms")
+        return labels
+
+    def to_dict(self) -> dict[str, int]:
+        return dict(zip(self.labels(), self.counts))
+
+    def format(self, width: int = 40) -> str:
+        peak = max(self.counts) or 1
+        lines = []
+        for label, count in zip(self.labels(), self.counts):
+            bar = "#" * round(width * count / peak)
+            lines.append(f"{label:>12}  {count:5d}  {bar}")
+        return "\n".join(lines)
+
+
+class StepEngine:
+    """Wraps a test's contexts so actions wait on actionability, not sleeps."""
+
+    def __init__(self, settle_frames: int = 3, settle_timeout_ms: float = 1500, action_timeout_ms: float = 5000):
+        self.settle_frames = settle_frames
+        self.settle_timeout_ms = settle_timeout_ms
+        self.action_timeout_ms = action_timeout_ms
+        self.steps: list[StepTiming] = []
+        self.skipped_sleep_ms = 0.0
+        # Clicks on these selectors are recorded but not performed
+        self.skip_clicks: list[re.Pattern] = []
+        # Maps recorded XPaths to data-testid selectors (see selectors.py)
+        self.selectors: SelectorIndex | None = None
+        self._proxies: dict[int, Any] = {}
+        self._locators: dict[tuple[int, str], tuple[async_api.Page, _LocatorProxy]] = {}
+
+    # -- wrapping ---------------------------------------------------------
+
+    def wrap_context(self, context: async_api.BrowserContext) -> "_ContextProxy":
+        return self._proxy(context, _ContextProxy)
+
+    def wrap_page(self, page: async_api.Page) -> "_PageProxy":
+        return self._proxy(page, _PageProxy)
+
+    def wrap_locator(self, locator: async_api.Locator, selector: str) -> "_LocatorProxy":
+        return _LocatorProxy(self, locator, selector)
+
+    def locate(self, page: async_api.Page, selector: str, **kwargs: Any) -> "_LocatorProxy":
+        """``page.locator(selector)`` with recorded XPaths swapped for test ids."""
+        resolved = self.selectors.resolve(selector) if self.selectors is not None else selector
+        if kwargs:
+            return self.wrap_locator(page.locator(resolved, **kwargs), selector)
+        key = (id(page), selector)
+        cached = self._locators.get(key)
+        if cached is None or cached[0] is not page:
+            cached = self._locators[key] = (page, self.wrap_locator(page.locator(resolved), selector))
+        return cached[1]
+
+    def _proxy(self, target: Any, proxy_type: type) -> Any:
+        proxy = self._proxies.get(id(target))
+        if proxy is None or proxy._target is not target:
+            proxy = self._proxies[id(target)] = proxy_type(self, target)
+        return proxy
+
+    def patch_namespace(self, namespace: dict[str, Any]) -> None:
+        """Adjust a loaded script's globals to work with the proxies."""
+        original_expect = namespace.get("expect", async_api.expect)
+        namespace["expect"] = lambda target, *args, **kwargs: original_expect(unwrap(target), *args, **kwargs)
+        namespace[SKIPPED_SLEEP] = self.skip_sleep
+
+    # -- stepping ---------------------------------------------------------
+
+    async def perform(self, proxy: "_LocatorProxy", action: str, *args: Any, **kwargs: Any) -> Any:
+        locator = proxy._target
+        if action == "click" and any(pattern.match(proxy._selector) for pattern in self.skip_clicks):
+            self.steps.append(StepTiming(action, proxy._selector, 0.0, 0.0, True, "skipped"))
+            return None
+        timeout = kwargs.get("timeout") or self.action_timeout_ms
+        started = time.perf_counter()
+        settled, reason = False, ""
+        acting = started
+        try:
+            if not await locator.count():
+                await locator.page.evaluate(MOUNT_LAZY_SCRIPT, timeout)
+            await locator.wait_for(state="visible", timeout=timeout)
+            await locator.scroll_into_view_if_needed(timeout=timeout)
+            outcome = await locator.evaluate(
+                SETTLE_SCRIPT,
+                {"frames": self.settle_frames, "timeout": self.settle_timeout_ms},
+            )
+            # An unsettled target is still handed to Playwright, whose own
+            # actionability checks decide whether the action can proceed
+            settled, reason = bool(outcome["settled"]), outcome["reason"]
+            acting = time.perf_counter()
+            return await getattr(locator, action)(*args, **kwargs)
+        except async_api.Error as exc:
+            if acting == started:
+                # Failed while waiting: attribute the whole step to the wait
+                acting = time.perf_counter()
+            reason = reason or str(exc).splitlines()[0]
+            raise
+        finally:
+            done = time.perf_counter()
+            self.steps.append(
+                StepTiming(action, proxy._selector, (acting - started) * 1000, (done - acting) * 1000, settled, reason)
+            )
+
+    def skip_sleep(self, timeout_ms: float) -> None:
+        self.skipped_sleep_ms += timeout_ms
+
+    # -- reporting --------------------------------------------------------
+
+    def histogram(self) -> LatencyHistogram:
+        histogram = LatencyHistogram()
+        for step in self.steps:
+            histogram.add(step.total_ms)
+        return histogram
+
+    def summary(self) -> dict[str, Any]:
+        total_ms = sum(step.total_ms for step in self.steps)
+        # Time the browser took to perform the actions, without the waits before them
+        action_ms = [step.action_ms for step in self.steps if step.reason != "skipped"]
+        return {
+            "count": len(self.steps),
+            "total_ms": round(total_ms, 1),
+            "skipped_sleep_ms": round(self.skipped_sleep_ms, 1),
+            "unsettled": sum(1 for step in self.steps if not step.settled),
+            "skipped": sum(1 for step in self.steps if step.reason == "skipped"),
+            "histogram": self.histogram().counts,
+            "action_p50_ms": round(percentile(action_ms, 50), 1),
+            "action_p95_ms": round(percentile(action_ms, 95), 1),
+        }
+
+
+def unwrap(target: Any) -> Any:
+    """Return the Playwright object behind a step proxy (or ``target`` itself)."""
+    return getattr(target, "_target", target)
+
+
+class _Proxy:
+    def __init__(self, engine: StepEngine, target: Any):
+        self._engine = engine
+        self._target = target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target, name)
+
+
+class _ContextProxy(_Proxy):
+    async def new_page(self) -> "_PageProxy":
+        return self._engine.wrap_page(await self._target.new_page())
+
+    @property
+    def pages(self) -> list["_PageProxy"]:
+        return [self._engine.wrap_page(page) for page in self._target.pages]
+
+
+class _PageProxy(_Proxy):
+    def locator(self, selector: str, **kwargs: Any) -> "_LocatorProxy":
+        return self._engine.locate(self._target, selector, **kwargs)
+
+
+class _LocatorProxy(_Proxy):
+    def __init__(self, engine: StepEngine, target: async_api.Locator, selector: str):
+        super().__init__(engine, target)
+        self._selector = selector
+
+    def nth(self, index: int) -> "_LocatorProxy":
+        return _LocatorProxy(self._engine, self._target.nth(index), self._selector)
+
+    @property
+    def first(self) -> "_LocatorProxy":
+        return _LocatorProxy(self._engine, self._target.first, self._selector)
+
+    @property
+    def last(self) -> "_LocatorProxy":
+        return _LocatorProxy(self._engine, self._target.last, self._selector)
+
+    def locator(self, selector: str, **kwargs: Any) -> "_LocatorProxy":
+        return _LocatorProxy(self._engine, self._target.locator(selector, **kwargs), f"{self._selector} >> {selector}")
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ACTIONS:
+            return lambda *args, **kwargs: self._engine.perform(self, name, *args, **kwargs)
+        return getattr(self._target, name)
@@ -0,0 +1,29 @@
+from harness.bundle import UNMAPPED, attribute, decode_vlq
+
+
+def test_decode_vlq_single_digits():
+    assert decode_vlq("AAAA") == [0, 0, 0, 0]
+    assert decode_vlq("C") == [1]
+    assert decode_vlq("D") == [-1]
+
+
+def test_decode_vlq_continuation():
+    # 16 needs a second digit: "g" carries the low bits with the continuation flag
+    assert decode_vlq("gB") == [16]
+    assert decode_vlq("hB") == [-16]
+    assert decode_vlq("2H") == [123]
+
+
+def test_decode_vlq_mixed_segment():
+    assert decode_vlq("SAAgBC") == [9, 0, 0, 16, 1]
+
+
+def test_attribute_splits_a_line_between_sources():
+    sourcemap = {"sources": ["a.ts", "b.ts"], "mappings": "AAAA,KCAA"}
+    assert attribute("aaaaabbb", sourcemap) == {"a.ts": 5, "b.ts": 3}
+
+
+def test_attribute_counts_unmapped_code_and_newlines():
+    sourcemap = {"sources": ["a.ts"], "mappings": "EAAA;A"}
+    # "xx" before the first segment, "y" under a segment without a source, one newline
+    assert attribute("xxaa\ny", sourcemap) == {UNMAPPED: 4, "a.ts": 2}
@@ -0,0 +1,67 @@
+import asyncio
+from types import SimpleNamespace
+
+from harness import report
+from harness.clock import DEMO_CLICK_BINDING, STAGE_TIMELINES, VirtualTime
+
+
+class _Session:
+    # Hashed by identity, like runner.TestSession
+    def __init__(self, case):
+        self.case = case
+
+
+class _Page:
+    def __init__(self):
+        self.now = 1000
+        self.clock = SimpleNamespace(run_for=self.run_for)
+
+    async def run_for(self, ms):
+        self.now += ms
+
+    async def evaluate(self, expression):
+        return self.now if expression == "Date.now()" else True
+
+
+class _Context:
+    def __init__(self):
+        self.bindings = {}
+        self.scripts = []
+        self.clock = SimpleNamespace(install=self.install)
+        self.installed = False
+
+    async def install(self):
+        self.installed = True
+
+    async def expose_binding(self, name, callback):
+        self.bindings[name] = callback
+
+    async def add_init_script(self, script):
+        self.scripts.append(script)
+
+
+def test_a_clicked_demo_jumps_to_its_last_stage():
+    plugin = VirtualTime(("TC008",))
+    session = _Session(SimpleNamespace(id="TC008"))
+    context = _Context()
+    page = _Page()
+    result = report.TestResult("TC008", "", report.PASSED, 1.0)
+
+    async def scenario():
+        await plugin.on_context(context, session)
+        await context.bindings[DEMO_CLICK_BINDING]({"page": page}, "email-draft")
+        await plugin.on_finish(session, result)
+
+    asyncio.run(scenario())
+    assert context.installed
+    assert page.now == 1000 + STAGE_TIMELINES["email-draft"]["complete"] + 1
+    assert result.metrics["virtual_time"]["skipped_ms"] == STAGE_TIMELINES["email-draft"]["complete"]
+
+
+def test_stops_and_other_tests_are_left_alone():
+    plugin = VirtualTime(("TC009",), stops={"profile-research": "enriching"})
+    assert plugin.stop_for("profile-research") == "enriching"
+    assert plugin.stop_for("bookings-meeting") == "finished"
+    context = _Context()
+    asyncio.run(plugin.on_context(context, _Session(SimpleNamespace(id="TC008"))))
+    assert not context.installed and not context.bindings
@@ -0,0 +1,141 @@
+import ast
+import textwrap
+
+from harness.compiler import optimize, optimize_steps, rebuild, skip_action_sleeps, split_steps
+from harness.steps import SKIPPED_SLEEP
+
+PRICING = "xpath=html/body/div/div/div[3]/div[3]/div/nav/a"
+TOGGLE = "xpath=html/body/div/div/div[3]/div/button"
+
+
+def _steps(source: str, trailing: bool = False):
+    body = ast.parse(textwrap.dedent(source)).body
+    steps = split_steps(body)
+    optimize_steps(steps, trailing)
+    return steps
+
+
+def _dropped(steps):
+    return [(step.describe(), step.dropped) for step in steps if step.dropped]
+
+
+def test_split_steps_groups_setup_and_sleeps_with_their_action():
+    steps = _steps(f"""
+        await page.wait_for_timeout(3000)
+        frame = context.pages[-1]
+        elem = frame.locator('{PRICING}').nth(0)
+        await elem.click(timeout=5000)
+        await asyncio.sleep(5)
+    """)
+    assert [step.kind for step in steps] == ["click", "wait"]
+    assert len(steps[0].statements) == 4
+    assert steps[0].target == "testid=nav-link-pricing.nth(0)"
+    assert steps[0].seconds == 3.2
+
+
+def test_goto_followed_by_another_goto_is_superseded():
+    steps = _steps("""
+        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
+        await page.wait_for_timeout(3000)
+        await page.goto("http://localhost:5173/", wait_until="commit", timeout=10000)
+        await page.mouse.wheel(0, 400)
+        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
+    """)
+    # The second goto is followed by another action, not a goto, so it stays
+    assert _dropped(steps) == [("goto http://localhost:5173", "superseded goto")]
+
+
+def test_fill_overwritten_before_anything_else_happens_is_dropped():
+    steps = _steps("""
+        elem = frame.locator('#email').nth(0)
+        await elem.fill('a@example.com')
+        elem = frame.locator('#email').nth(0)
+        await elem.fill('b@example.com')
+    """)
+    assert _dropped(steps) == [("fill('a@example.com') on #email.nth(0)", "overwritten fill")]
+
+
+def test_refill_with_the_same_value_is_dropped_unless_a_submit_came_between():
+    same = _steps("""
+        elem = frame.locator('#email').nth(0)
+        await elem.fill('a@example.com')
+        elem = frame.locator('#name').nth(0)
+        await elem.fill('Ada')
+        elem = frame.locator('#email').nth(0)
+        await elem.fill('a@example.com')
+    """)
+    assert _dropped(same) == [("fill('a@example.com') on #email.nth(0)", "refill with the same value")]
+    after_submit = _steps("""
+        elem = frame.locator('#email').nth(0)
+        await elem.fill('a@example.com')
+        elem = frame.locator('#submit').nth(0)
+        await elem.click()
+        elem = frame.locator('#email').nth(0)
+        await elem.fill('a@example.com')
+    """)
+    assert _dropped(after_submit) == []
+
+
+def test_repeated_idempotent_click_is_dropped_but_a_toggle_is_not():
+    idempotent = _steps(f"""
+        elem = frame.locator('{PRICING}').nth(0)
+        await elem.click(timeout=5000)
+        elem = frame.locator('{PRICING}').nth(0)
+        await elem.click(timeout=5000)
+    """)
+    assert _dropped(idempotent) == [("click on testid=nav-link-pricing.nth(0)", "repeated click")]
+    toggle = _steps(f"""
+        elem = frame.locator('{TOGGLE}').nth(0)
+        await elem.click(timeout=5000)
+        elem = frame.locator('{TOGGLE}').nth(0)
+        await elem.click(timeout=5000)
+    """)
+    assert _dropped(toggle) == []
+
+
+def test_rebuild_keeps_the_setup_of_a_dropped_step_that_later_statements_read():
+    steps = _steps("""
+        frame = context.pages[-1]
+        probe = frame.locator('#unused')
+        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
+        await page.goto("http://localhost:5173/", wait_until="commit", timeout=10000)
+        await expect(frame.locator('#hero')).to_be_visible()
+    """)
+    source = "\n".join(ast.unparse(statement) for statement in rebuild(steps))
+    assert "frame = context.pages[-1]" in source
+    assert "probe" not in source
+    assert source.count("goto") == 1
+
+
+def test_optimize_drops_the_trailing_sleep_of_run_test_only():
+    tree = ast.parse(textwrap.dedent("""
+        async def run_test():
+            await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
+            await asyncio.sleep(5)
+
+        async def helper():
+            await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
+            await asyncio.sleep(5)
+    """))
+    report = optimize(tree, "TC000")
+    assert [step.dropped for step in report.dropped] == ["trailing sleep"]
+    assert "sleep" not in ast.unparse(tree.body[0])
+    assert "sleep" in ast.unparse(tree.body[1])
+
+
+def test_only_sleeps_right_before_an_action_are_skipped():
+    tree = ast.parse(textwrap.dedent(f"""
+        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
+        await page.wait_for_timeout(3000)
+        await page.mouse.wheel(0, 400)
+        await page.wait_for_timeout(3000)
+        frame = context.pages[-1]
+        elem = frame.locator('{PRICING}').nth(0)
+        await elem.click(timeout=5000)
+        await asyncio.sleep(5)
+    """))
+    skip_action_sleeps(tree)
+    lines = ast.unparse(tree).splitlines()
+    assert lines[1] == "await page.wait_for_timeout(3000)"
+    assert lines[3] == f"{SKIPPED_SLEEP}(3000.0)"
+    assert lines[-1] == "await asyncio.sleep(5)"
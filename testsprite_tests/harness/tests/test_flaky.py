@@ -0,0 +1,62 @@
+from harness.flaky import MAX_RETRIES, Attempt, stability
+from harness.report import FAILED, PASSED
+
+
+def _runs(*verdicts: str) -> list[Attempt]:
+    """One run per string, one attempt per letter: "FP" failed once, then passed on the retry."""
+    attempts = []
+    for started_at, letters in enumerate(verdicts):
+        for number, letter in enumerate(letters):
+            attempts.append(Attempt(float(started_at), number, PASSED if letter == "P" else FAILED, 10.0))
+    return attempts
+
+
+def test_clean_record_is_neither_retried_nor_quarantined():
+    stat = stability("TC001", _runs(*"PPPPP"))
+    assert (stat.runs, stat.failures, stat.flaky_failures) == (5, 0, 0)
+    assert stat.p_flaky < 0.3
+    assert stat.retries == 0
+    assert not stat.quarantined
+
+
+def test_failure_passing_on_retry_is_flaky_and_wastes_the_failed_attempts():
+    stat = stability("TC001", _runs("P", "FFP", "P"))
+    assert (stat.runs, stat.attempts, stat.failures) == (3, 5, 2)
+    assert (stat.flaky_failures, stat.flaky_runs) == (2, 1)
+    assert stat.wasted_s == 20.0
+
+
+def test_pass_fail_pass_flip_is_flaky_and_wastes_the_whole_run():
+    stat = stability("TC001", _runs("P", "FF", "P"))
+    assert (stat.flaky_failures, stat.flaky_runs) == (2, 1)
+    assert stat.wasted_s == 20.0
+
+
+def test_consistent_or_latest_failures_are_real():
+    red = stability("TC001", _runs(*"FFFF"))
+    assert red.failures == 4
+    assert red.flaky_failures == 0
+    assert red.retries == 0
+    # The last run has no later run to flip back to
+    latest = stability("TC001", _runs("P", "P", "F"))
+    assert latest.flaky_failures == 0
+
+
+def test_occasional_flake_is_retried_within_the_limit():
+    stat = stability("TC001", _runs(*"PPPPPPPPP", "FP"))
+    assert not stat.quarantined
+    assert stat.p_flaky >= 0.3
+    assert 1 <= stat.retries <= MAX_RETRIES
+
+
+def test_frequent_flips_quarantine_instead_of_retrying():
+    stat = stability("TC001", _runs("P", "F", "P", "F", "P", "FP"))
+    assert stat.flaky_runs == 3
+    assert stat.quarantined
+    assert stat.retries == 0
+
+
+def test_too_few_runs_are_never_quarantined():
+    stat = stability("TC001", _runs("P", "FP", "P", "FP"))
+    assert stat.score < 0.8
+    assert not stat.quarantined
@@ -0,0 +1,115 @@
+from harness import impact
+from harness.impact import WHOLE_FILE, ImpactMap, changed_lines, select
+
+DIFF = """\
+diff --git a/src/components/Hero.tsx b/src/components/Hero.tsx
+index 1111111..2222222 100644
+--- a/src/components/Hero.tsx
++++ b/src/components/Hero.tsx
+@@ -10,2 +10,3 @@ export function Hero() {
+@@ -40,0 +42 @@ export function Hero() {
+diff --git a/src/components/Old.tsx b/src/components/New.tsx
+similarity index 90%
+diff --git a/src/lib/gone.ts b/src/lib/gone.ts
+deleted file mode 100644
+"""
+
+
+def _fake_git(monkeypatch, diff=DIFF, untracked=""):
+    def git(*args):
+        return diff if args[0] == "diff" else untracked
+    monkeypatch.setattr(impact, "_git", git)
+
+
+def test_changed_lines_reads_the_old_side_of_each_hunk(monkeypatch):
+    _fake_git(monkeypatch)
+    changes = changed_lines("abc123")
+    # Two changed lines, then a pure insertion between lines 40 and 41
+    assert changes["src/components/Hero.tsx"] == {10, 11, 40, 41}
+
+
+def test_changed_lines_renames_deletions_and_untracked_files_are_whole(monkeypatch):
+    _fake_git(monkeypatch, untracked="src/components/Draft.tsx\n")
+    changes = changed_lines("abc123")
+    assert changes["src/components/Old.tsx"] is None
+    assert changes["src/components/New.tsx"] is None
+    assert changes["src/lib/gone.ts"] is None
+    assert changes["src/components/Draft.tsx"] is None
+
+
+GRAPH = {
+    "src/main.tsx": {"src/App.tsx"},
+    "src/App.tsx": {"src/components/Hero.tsx", "src/components/Pricing.tsx"},
+    "src/components/Hero.tsx": set(),
+    "src/components/Pricing.tsx": {"src/components/PriceTag.tsx"},
+    "src/components/PriceTag.tsx": set(),
+}
+
+MAP = ImpactMap(
+    files={
+        "src/App.tsx": {"TC001": [[WHOLE_FILE, WHOLE_FILE]], "TC010": [[1, 50]]},
+        "src/components/Hero.tsx": {"TC004": [[1, 20]], "TC005": [[30, 60]]},
+        "src/components/Pricing.tsx": {"TC010": [[1, 80]]},
+    },
+    mapped={"src/components/Hero.tsx": [[1, 25], [30, 60]]},
+)
+IDS = ["TC001", "TC004", "TC005", "TC010", "TC020"]
+
+
+def test_select_uses_the_covered_lines():
+    selection = select({"src/components/Hero.tsx": {12}}, MAP, IDS, GRAPH)
+    assert not selection.full
+    assert selection.tests == {"TC004"}
+
+
+def test_select_takes_every_test_of_the_file_for_a_line_without_code():
+    selection = select({"src/components/Hero.tsx": {27}}, MAP, IDS, GRAPH)
+    assert selection.tests == {"TC004", "TC005"}
+
+
+def test_select_falls_back_to_the_importers_of_an_uncovered_file():
+    selection = select({"src/components/PriceTag.tsx": {3}}, MAP, IDS, GRAPH)
+    assert selection.tests == {"TC010"}
+
+
+def test_select_ignores_unreachable_sources_and_docs():
+    selection = select({"src/components/Workflow.tsx": None, "README.md": None}, MAP, IDS, GRAPH)
+    assert selection.tests == set()
+    assert selection.ignored == ["README.md", "src/components/Workflow.tsx"]
+
+
+def test_select_runs_a_changed_script_and_everything_for_the_harness():
+    selection = select({"testsprite_tests/TC020_Pricing_toggle.py": {5}}, MAP, IDS, GRAPH)
+    assert selection.tests == {"TC020"}
+    selection = select({"testsprite_tests/harness/runner.py": {5}}, MAP, IDS, GRAPH)
+    assert selection.full
+    assert selection.tests == set(IDS)
+
+
+def test_changed_lines_against_a_target_reads_its_side(monkeypatch):
+    _fake_git(monkeypatch, untracked="src/components/Draft.tsx\n")
+    changes = changed_lines("abc123", "c0ffee")
+    assert changes["src/components/Hero.tsx"] == {10, 11, 12, 42}
+    assert changes["src/components/New.tsx"] is None
+    assert "src/components/Draft.tsx" not in changes
+
+
+def test_plan_adds_the_changes_since_ref_read_at_the_commit_of_the_map(monkeypatch, tmp_path):
+    path = tmp_path / impact.IMPACT_FILE
+    ImpactMap(MAP.files, MAP.mapped, commit="c0ffee").save(path)
+    diffed = []
+
+    def git(*args):
+        if args[0] == "diff":
+            diffed.append(args[4:-1])
+            return ""
+        return "feed42\n" if args[0] == "rev-parse" else ""
+    monkeypatch.setattr(impact, "_git", git)
+    selection = impact.plan("HEAD", path, IDS, full_every=0)
+    assert diffed == [("c0ffee",), ("HEAD", "c0ffee")]
+    assert selection.base == "c0ffee"
+
+
+def test_merge_changes_keeps_whole_files_whole():
+    merged = impact.merge_changes({"a.ts": {1}, "b.ts": None}, {"a.ts": {3}, "b.ts": {2}, "c.ts": None})
+    assert merged == {"a.ts": {1, 3}, "b.ts": None, "c.ts": None}
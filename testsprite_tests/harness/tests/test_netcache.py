@@ -0,0 +1,41 @@
+import asyncio
+from types import SimpleNamespace
+
+from harness import report
+from harness.netcache import NetworkCache
+
+
+class _Session:
+    # Hashed by identity, like runner.TestSession
+    def __init__(self, case):
+        self.case = case
+
+
+class _Context:
+    def __init__(self):
+        self.handler = None
+
+    async def route(self, matcher, handler):
+        self.handler = handler
+
+
+def test_variants_of_one_case_keep_their_own_stats(tmp_path):
+    cache = NetworkCache(tmp_path, ["http://127.0.0.1:4173"])
+    case = SimpleNamespace(id="TC001")
+    sessions = {name: _Session(case) for name in ("desktop", "fold")}
+    contexts = {name: _Context() for name in sessions}
+
+    async def scenario():
+        for name, session in sessions.items():
+            await cache.on_context(contexts[name], session)
+        # Only the desktop run makes third-party requests
+        cache._stats[sessions["desktop"]].cache_hits += 3
+        results = {name: report.TestResult(f"TC001@{name}", "", report.PASSED, 1.0) for name in sessions}
+        for name, session in sessions.items():
+            await cache.on_finish(session, results[name])
+        return results
+
+    results = asyncio.run(scenario())
+    assert results["desktop"].metrics["netcache"]["cache_hits"] == 3
+    assert "netcache" not in results["fold"].metrics
+    assert cache._stats == {}
@@ -0,0 +1,48 @@
+import asyncio
+from types import SimpleNamespace
+
+from harness import report
+from harness.perf import ScrollBudgetCheck
+
+# Ten frames 16 ms apart, then one 100 ms frame
+PROBE = {"frames": [16.0 * i for i in range(11)] + [260.0], "longTasks": [], "layoutShift": 0.0, "durationMs": 260.0}
+
+
+class _Page:
+    def __init__(self, probe):
+        self.probe = probe
+
+    def is_closed(self):
+        return False
+
+    async def evaluate(self, script, arg=None):
+        return self.probe
+
+
+def _session(test_id, probe=PROBE):
+    context = SimpleNamespace(pages=[_Page(probe)])
+    return SimpleNamespace(case=SimpleNamespace(id=test_id), contexts=[context])
+
+
+def _finish(check, session, status=report.PASSED, message=""):
+    result = report.TestResult(session.case.id, "", status, 1.0, message)
+    asyncio.run(check.on_finish(session, result))
+    return result
+
+
+def test_a_scroll_over_budget_fails_a_passing_test():
+    result = _finish(ScrollBudgetCheck(("TC010",)), _session("TC010"))
+    assert result.status == report.FAILED
+    assert result.message.startswith("Performance budget exceeded")
+    assert result.metrics["scroll"]["frame_count"] == 11
+
+
+def test_a_failed_test_keeps_its_own_message_first():
+    result = _finish(ScrollBudgetCheck(("TC024",)), _session("TC024"), report.FAILED, "no confirmation text")
+    assert result.message.splitlines()[0] == "no confirmation text"
+    assert "Performance budget exceeded" in result.message
+
+
+def test_tests_without_a_scenario_are_not_measured():
+    result = _finish(ScrollBudgetCheck(("TC010", "TC001")), _session("TC001"))
+    assert result.ok and "scroll" not in result.metrics
@@ -0,0 +1,38 @@
+import json
+
+from harness.sourcemaps import SourceMaps
+from harness.tracing import frame_url
+
+
+def _dist(tmp_path):
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    (assets / "index-abc.js").write_text("aaaaabbbbb\ncc", encoding="utf-8")
+    sourcemap = {
+        "sources": ["../../src/components/Hero.tsx", "../../node_modules/framer-motion/dist/es/index.mjs"],
+        "mappings": "AAAA,KCAA;ADCA",
+    }
+    (assets / "index-abc.js.map").write_text(json.dumps(sourcemap), encoding="utf-8")
+    return SourceMaps(tmp_path)
+
+
+def test_source_at_picks_the_segment_at_or_before_the_column(tmp_path):
+    sources = _dist(tmp_path)
+    url = "http://127.0.0.1:4173/assets/index-abc.js"
+    assert sources.source_at(url, 0, 0) == "src/components/Hero.tsx"
+    assert sources.source_at(url, 0, 7) == "node_modules/framer-motion/dist/es/index.mjs"
+    assert sources.source_at(url, 1, 1) == "src/components/Hero.tsx"
+    assert sources.source_at(url, 5, 0) is None
+
+
+def test_urls_outside_the_build_resolve_to_nothing(tmp_path):
+    sources = _dist(tmp_path)
+    assert sources.source_at("http://localhost:5173/src/App.tsx", 0, 0) is None
+    frame = {"url": "http://localhost:5173/src/App.tsx", "lineNumber": 3, "columnNumber": 0}
+    assert frame_url(frame, sources) == frame["url"]
+
+
+def test_frame_url_names_the_source(tmp_path):
+    frame = {"url": "http://127.0.0.1:4173/assets/index-abc.js", "lineNumber": 0, "columnNumber": 2}
+    assert frame_url(frame, _dist(tmp_path)) == "/src/components/Hero.tsx"
+
@@ -0,0 +1,21 @@
+import json
+
+from harness.sourcemaps import SourceMaps
+from harness.timers import resolve_owner
+
+
+def test_timer_owner_prefers_a_component_anywhere_on_the_stack(tmp_path):
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    (assets / "index-abc.js").write_text("aaaaabbbbb", encoding="utf-8")
+    sourcemap = {
+        "sources": ["../../src/components/Hero.tsx", "../../node_modules/framer-motion/dist/es/index.mjs"],
+        "mappings": "AAAA,KCAA",
+    }
+    (assets / "index-abc.js.map").write_text(json.dumps(sourcemap), encoding="utf-8")
+    sources = SourceMaps(tmp_path)
+    # 1-based stack positions: framer-motion first, Hero further down
+    assert resolve_owner("/assets/index-abc.js:1:8 /assets/index-abc.js:1:1", sources) == "Hero"
+    assert resolve_owner("/assets/index-abc.js:1:8", sources) == "framer-motion"
+    assert resolve_owner("/assets/other.js:1:1", sources) == "/assets/other.js:1:1"
+    assert resolve_owner("Hero", sources) == "Hero"
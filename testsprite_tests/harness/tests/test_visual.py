@@ -0,0 +1,88 @@
+import random
+import struct
+import zlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from harness.visual import (  # noqa: E402
+    PNG_SIGNATURE,
+    BaselineStore,
+    Capture,
+    check,
+    decode_png,
+    encode_png,
+    format_table,
+)
+
+
+def _paeth(a: int, b: int, c: int) -> int:
+    estimate = a + b - c
+    pa, pb, pc = abs(estimate - a), abs(estimate - b), abs(estimate - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def _png(pixels, filters: list[int], color: int = 6, interlace: int = 0) -> bytes:
+    """Reference encoder: each row filtered with its own type, byte by byte as the spec says."""
+    height, width, channels = pixels.shape
+    rows = [bytes(pixels[y].reshape(-1)) for y in range(height)]
+    raw = bytearray()
+    for y, kind in enumerate(filters):
+        row, up = rows[y], rows[y - 1] if y else bytes(len(rows[y]))
+        raw.append(kind)
+        for x, value in enumerate(row):
+            a = row[x - channels] if x >= channels else 0
+            b = up[x]
+            c = up[x - channels] if x >= channels else 0
+            predicted = (0, a, b, (a + b) // 2, _paeth(a, b, c))[kind]
+            raw.append((value - predicted) % 256)
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color, 0, 0, interlace)
+    return PNG_SIGNATURE + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(bytes(raw))) + chunk(b"IEND", b"")
+
+
+def _pixels(height: int, width: int, channels: int = 4):
+    generator = random.Random(height * 1000 + width)
+    data = [generator.randrange(256) for _ in range(height * width * channels)]
+    return np.array(data, dtype=np.uint8).reshape(height, width, channels)
+
+
+@pytest.mark.parametrize("kind", [0, 1, 2, 3, 4])
+def test_decode_png_undoes_every_filter_type(kind):
+    pixels = _pixels(5, 7)
+    assert np.array_equal(decode_png(_png(pixels, [kind] * 5)), pixels)
+
+
+def test_decode_png_mixed_filters_and_rgb():
+    pixels = _pixels(9, 6, channels=3)
+    filters = [1, 0, 1, 2, 3, 1, 4, 0, 2]
+    assert np.array_equal(decode_png(_png(pixels, filters, color=2)), pixels)
+
+
+def test_encode_png_round_trips():
+    pixels = _pixels(4, 3)
+    assert np.array_equal(decode_png(encode_png(pixels)), pixels)
+
+
+def test_decode_png_rejects_what_it_cannot_read():
+    with pytest.raises(ValueError, match="not a PNG"):
+        decode_png(b"GIF89a")
+    with pytest.raises(ValueError, match="interlace"):
+        decode_png(_png(_pixels(2, 2), [0, 0], interlace=1))
+
+
+def test_check_reports_captures_without_a_baseline(tmp_path):
+    store = BaselineStore(tmp_path / "baselines")
+    capture = Capture("hero@1280x720", encode_png(_pixels(4, 3)), [])
+    results = check([capture], store, tmp_path / "diffs")
+    assert [(result.key, result.new_baseline, result.ok) for result in results] == [("hero@1280x720", True, True)]
+    assert "new baseline" in format_table(results)
+    assert store.get("hero@1280x720") == capture.png
+    # The next run finds it
+    assert check([capture], BaselineStore(tmp_path / "baselines"), tmp_path / "diffs")[0].identical
@@ -0,0 +1,247 @@
+"""Census of the timers a page keeps alive.
+
+``TIMER_CENSUS_SCRIPT`` runs before any page script and wraps
+``setTimeout``/``setInterval``/``requestAnimationFrame`` and their
+``clear``/``cancel`` counterparts.  Every timer is tagged with its owner,
+taken from the creating stack: the first ``src/components`` module on it
+(``BookingsMeeting``), else the first dependency (``framer-motion``), else
+the top frame.  A production build has no module URLs, so there the owner
+is the stack's chunk positions (``/assets/index-Ab12.js:1:2345 ...``) and
+``TimerCensus.resolve`` applies the same rule to the sources the build's
+sourcemaps give for them.  Timers created from an event handler also remember the
+section (or other landmark) around the event's target; one still pending
+after that element left the document is an orphan, i.e. it survived the
+unmount of the UI that scheduled it.  The target itself is too short-lived
+an anchor: a demo may replace the button that started it on its first tick.
+
+``census(page)`` snapshots the live timers at any point of a test and
+``fire_rates(page)`` measures callbacks per second by owner.  With
+``--timers`` the runner installs the script in every context and attaches
+the final census of each test to its result.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from playwright import async_api
+
+from .bundle import package_of
+from .report import TestResult
+from .sourcemaps import SourceMaps
+from .steps import unwrap
+
+# Chunk positions kept per stack on a production build
+MAX_CHUNK_FRAMES = 12
+
+_CHUNK_FRAME = re.compile(r"^(/assets/.+\.js):(\d+):(\d+)$")
+_COMPONENT_SOURCE = re.compile(r"^src/(?:[\w-]+/)*([\w-]+)\.[jt]sx?$")
+
+TIMER_CENSUS_SCRIPT = """
+(() => {
+  if (window.__leadqTimers) return;
+  const native = {
+    setTimeout: window.setTimeout.bind(window),
+    clearTimeout: window.clearTimeout.bind(window),
+    setInterval: window.setInterval.bind(window),
+    clearInterval: window.clearInterval.bind(window),
+    requestAnimationFrame: window.requestAnimationFrame.bind(window),
+    cancelAnimationFrame: window.cancelAnimationFrame.bind(window),
+  };
+  const COMPONENT = /\\/src\\/(?:[\\w-]+\\/)*([\\w-]+)\\.[jt]sx?/;
+  const DEPENDENCY = /\\/node_modules\\/(?:\\.vite\\/deps\\/([\\w-]+?)(?:_[\\w-]+)?\\.js|(@[\\w.-]+\\/[\\w.-]+|[\\w.-]+)\\/)/;
+  const FRAME = /(https?:\\/\\/[^\\s)]+:\\d+:\\d+)/;
+  const MAX_CHUNK_FRAMES = %d;
+  const live = new Map();
+  const fired = new Map();
+  let orphanFires = 0;
+
+  const ownerOf = (stack) => {
+    // Drop the Error line and this wrapper's own frame
+    const frames = String(stack || '').split('\\n').slice(2);
+    for (const line of frames) {
+      const match = COMPONENT.exec(line);
+      if (match) return match[1];
+    }
+    for (const line of frames) {
+      const match = DEPENDENCY.exec(line);
+      if (match) return match[1] || match[2];
+    }
+    const located = frames.map((line) => FRAME.exec(line)).filter(Boolean).map((match) => match[1].replace(location.origin, ''));
+    // Bundled code: resolved through the sourcemaps on the Python side
+    const chunks = located.filter((frame) => frame.startsWith('/assets/'));
+    if (chunks.length) return chunks.slice(0, MAX_CHUNK_FRAMES).join(' ');
+    return located.length ? located[0] : 'unknown';
+  };
+
+  // The section around the event target: demos swap out the very button that
+  // started them (ProfileResearch's Start button) while their timers run on
+  const anchorOf = () => {
+    const event = window.event;
+    if (!event || !(event.target instanceof Element)) return null;
+    return new WeakRef(event.target.closest('section[id], footer, nav, header') || event.target);
+  };
+
+  const track = (kind, handler, delay, schedule) => {
+    const record = {
+      kind, delay: Number(delay) || 0, owner: ownerOf(new Error().stack),
+      created: performance.now(), anchor: anchorOf(), fires: 0, id: 0,
+    };
+    const key = () => kind + ':' + record.id;
+    const callback = typeof handler !== 'function' ? handler : function (...args) {
+      record.fires += 1;
+      fired.set(record.owner, (fired.get(record.owner) || 0) + 1);
+      const anchor = record.anchor && record.anchor.deref();
+      if (record.anchor && (!anchor || !anchor.isConnected)) orphanFires += 1;
+      if (kind !== 'interval') live.delete(key());
+      return handler.apply(this, args);
+    };
+    record.id = schedule(callback);
+    live.set(key(), record);
+    return record.id;
+  };
+
+  window.setTimeout = (handler, delay, ...args) =>
+    track('timeout', handler, delay, (callback) => native.setTimeout(callback, delay, ...args));
+  window.setInterval = (handler, delay, ...args) =>
+    track('interval', handler, delay, (callback) => native.setInterval(callback, delay, ...args));
+  window.requestAnimationFrame = (handler) =>
+    track('raf', handler, 0, (callback) => native.requestAnimationFrame(callback));
+  window.clearTimeout = (id) => { live.delete('timeout:' + id); native.clearTimeout(id); };
+  window.clearInterval = (id) => { live.delete('interval:' + id); native.clearInterval(id); };
+  window.cancelAnimationFrame = (id) => { live.delete('raf:' + id); native.cancelAnimationFrame(id); };
+
+  window.__leadqTimers = {
+    snapshot() {
+      const now = performance.now();
+      const timers = [];
+      for (const record of live.values()) {
+        const anchor = record.anchor && record.anchor.deref();
+        timers.push({
+          kind: record.kind, owner: record.owner, delay: record.delay, fires: record.fires,
+          age_ms: now - record.created,
+          orphaned: Boolean(record.anchor) && (!anchor || !anchor.isConnected),
+        });
+      }
+      return { at_ms: now, timers, fired: Object.fromEntries(fired), orphan_fires: orphanFires };
+    },
+  };
+})();
+""" % MAX_CHUNK_FRAMES
+
+
+@dataclass
+class TimerCensus:
+    """Live timers of one page at one moment."""
+
+    at_ms: float
+    timers: list[dict[str, Any]]
+    fired: dict[str, int] = field(default_factory=dict)
+    orphan_fires: int = 0
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict[str, Any]) -> "TimerCensus":
+        return cls(snapshot["at_ms"], snapshot["timers"], snapshot["fired"], snapshot["orphan_fires"])
+
+    def resolve(self, sources: SourceMaps) -> "TimerCensus":
+        """This census with chunk-position owners replaced by the component or package they map to."""
+        owners: dict[str, str] = {}
+
+        def owner(name: str) -> str:
+            if name not in owners:
+                owners[name] = resolve_owner(name, sources)
+            return owners[name]
+
+        fired: dict[str, int] = {}
+        for name, count in self.fired.items():
+            fired[owner(name)] = fired.get(owner(name), 0) + count
+        timers = [{**timer, "owner": owner(timer["owner"])} for timer in self.timers]
+        return TimerCensus(self.at_ms, timers, fired, self.orphan_fires)
+
+    def live(self) -> Counter:
+        """Live timer count by (kind, owner)."""
+        return Counter((timer["kind"], timer["owner"]) for timer in self.timers)
+
+    def orphans(self) -> list[dict[str, Any]]:
+        return [timer for timer in self.timers if timer["orphaned"]]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "live": len(self.timers),
+            "by_owner": {f"{kind}:{owner}": count for (kind, owner), count in self.live().most_common()},
+            "orphans": len(self.orphans()),
+            "orphan_fires": self.orphan_fires,
+            "fired": dict(sorted(self.fired.items(), key=lambda item: -item[1])),
+        }
+
+    def format(self, limit: int = 10) -> str:
+        lines = [f"{len(self.timers)} live timers, {len(self.orphans())} orphaned, "
+                 f"{self.orphan_fires} orphan callbacks fired"]
+        for (kind, owner), count in self.live().most_common(limit):
+            lines.append(f"  {count:5d}  {kind:<8} {owner}")
+        return "\n".join(lines)
+
+
+def resolve_owner(owner: str, sources: SourceMaps) -> str:
+    """Component, else package, for an owner made of chunk positions; other owners as they are."""
+    located = [_CHUNK_FRAME.match(frame) for frame in owner.split(" ")]
+    if not located or not all(located):
+        return owner
+    # Stack traces count lines and columns from 1, sourcemaps from 0
+    found = [sources.source_at(match[1], int(match[2]) - 1, int(match[3]) - 1) for match in located]
+    for source in found:
+        match = _COMPONENT_SOURCE.match(source or "")
+        if match:
+            return match[1]
+    for source in found:
+        if source and source.startswith("node_modules/"):
+            return package_of(source)
+    return owner.split(" ", 1)[0]
+
+
+async def install(context: async_api.BrowserContext) -> None:
+    """Instrument every page ``context`` opens from now on."""
+    await context.add_init_script(TIMER_CENSUS_SCRIPT)
+
+
+async def census(page: Any, sources: SourceMaps | None = None) -> TimerCensus:
+    snapshot = await unwrap(page).evaluate("window.__leadqTimers.snapshot()")
+    found = TimerCensus.from_snapshot(snapshot)
+    return found.resolve(sources) if sources is not None else found
+
+
+async def fire_rates(page: Any, window_ms: float = 1000, sources: SourceMaps | None = None) -> dict[str, float]:
+    """Timer callbacks per second by owner over ``window_ms`` of the page at rest."""
+    page = unwrap(page)
+    before = await census(page, sources)
+    await page.wait_for_timeout(window_ms)
+    after = await census(page, sources)
+    seconds = (after.at_ms - before.at_ms) / 1000 or 1.0
+    rates = {owner: (count - before.fired.get(owner, 0)) / seconds for owner, count in after.fired.items()}
+    return dict(sorted(((owner, rate) for owner, rate in rates.items() if rate), key=lambda item: -item[1]))
+
+
+class TimerCensusRecorder:
+    """Runner plugin instrumenting every test and recording its final census."""
+
+    def __init__(self, sources: SourceMaps | None = None):
+        self.sources = sources or SourceMaps()
+
+    def install(self, runner: Any) -> None:
+        runner.context_hooks.append(self.on_context)
+        runner.finish_hooks.append(self.on_finish)
+
+    async def on_context(self, context: async_api.BrowserContext, session: Any) -> None:
+        await install(context)
+
+    async def on_finish(self, session: Any, result: TestResult) -> None:
+        pages = [page for context in session.contexts for page in context.pages if not page.is_closed()]
+        if not pages:
+            return
+        try:
+            result.metrics["timers"] = (await census(pages[0], self.sources)).to_dict()
+        except async_api.Error as exc:
+            result.metrics["timers_error"] = str(exc).splitlines()[0]
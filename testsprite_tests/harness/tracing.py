@@ -0,0 +1,347 @@
+"""Opt-in Chrome DevTools Protocol tracing around each test's user flow.
+
+When enabled, every page a test opens gets a CDP ``Tracing`` session that
+runs until the test finishes.  The raw trace is saved next to the other
+reports and summarised in Python:
+
+* JS self time per function, taken from the V8 CPU profile samples in the
+  trace, and per component (samples are charged to the nearest
+  ``src/components/*.tsx`` frame on the stack, or to the npm package that
+  owns the leaf frame when no component is on the stack);
+* style recalculation, layout and paint totals on the renderer main
+  thread, with layout and paint charged to the landing page section
+  (``Hero``, ``LeadCaptureStream``, ...) containing the node they touched.
+
+Component attribution needs source paths.  The Vite dev server serves
+one URL per module; against the harness's production build every frame
+in a chunk is looked up in the build's hidden sourcemaps
+(``sourcemaps.SourceMaps``) and charged as if it came from that module's
+dev-server URL.  Top functions are listed under their source file too.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import re
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from playwright import async_api
+
+from .report import TestResult
+from .sections import CLOSEST_SECTION_FUNCTION, component_for
+from .sourcemaps import SourceMaps
+
+CATEGORIES = [
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame",
+    "v8.execute",
+    "disabled-by-default-v8.cpu_profiler",
+    "blink.user_timing",
+    "loading",
+]
+
+STYLE_EVENTS = {"UpdateLayoutTree", "RecalculateStyles"}
+LAYOUT_EVENTS = {"Layout"}
+PAINT_EVENTS = {"Paint"}
+SCRIPT_EVENTS = {"FunctionCall", "EvaluateScript", "TimerFire", "FireAnimationFrame", "EventDispatch", "v8.compile"}
+
+# CPU profile pseudo-frames that are not JavaScript
+_PSEUDO_FRAMES = {"(idle)", "(program)", "(root)", "(garbage collector)"}
+
+_COMPONENT_URL = re.compile(r"/src/components/(?:ui/)?([\w.-]+)\.tsx")
+_PACKAGE_URL = re.compile(r"/node_modules/(?:\.vite/deps/)?(@[\w.-]+/[\w.-]+|@?[\w.-]+?)(?:[_/.]|$)")
+
+
+@dataclass
+class FunctionCost:
+    name: str
+    url: str
+    self_ms: float
+
+
+@dataclass
+class TraceSummary:
+    main_thread_ms: float = 0.0
+    script_ms: float = 0.0
+    style_ms: float = 0.0
+    layout_ms: float = 0.0
+    paint_ms: float = 0.0
+    gc_ms: float = 0.0
+    top_functions: list[FunctionCost] = field(default_factory=list)
+    # component -> {"js": ms, "layout": ms, "paint": ms}
+    components: dict[str, dict[str, float]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TraceSummary":
+        functions = [FunctionCost(**fn) for fn in data.get("top_functions", [])]
+        return cls(**{**data, "top_functions": functions})
+
+    def format(self, limit: int = 8) -> str:
+        lines = [
+            f"main thread {self.main_thread_ms:.0f} ms: script {self.script_ms:.0f}, style {self.style_ms:.0f}, "
+            f"layout {self.layout_ms:.0f}, paint {self.paint_ms:.0f}, gc {self.gc_ms:.0f}"
+        ]
+        ranked = sorted(self.components.items(), key=lambda item: -sum(item[1].values()))
+        for name, costs in ranked[:limit]:
+            lines.append(
+                f"  {name:<22} js {costs.get('js', 0):7.1f}  layout {costs.get('layout', 0):6.1f}  paint {costs.get('paint', 0):6.1f} ms"
+            )
+        for fn in self.top_functions[:limit]:
+            lines.append(f"  {fn.self_ms:7.1f} ms  {fn.name}  {fn.url}")
+        return "\n".join(lines)
+
+
+def owner_of_url(url: str) -> str | None:
+    """Component or npm package a script URL belongs to."""
+    match = _COMPONENT_URL.search(url)
+    if match:
+        return match.group(1)
+    match = _PACKAGE_URL.search(url)
+    if match:
+        return match.group(1)
+    return None
+
+
+def frame_url(frame: dict, sources: SourceMaps | None = None) -> str:
+    """URL of a CPU profile call frame, as ``/<source>`` when a sourcemap knows it."""
+    url = frame.get("url", "")
+    if sources is not None and url:
+        source = sources.source_at(url, frame.get("lineNumber", 0), frame.get("columnNumber", 0))
+        if source is not None:
+            return "/" + source
+    return url
+
+
+def load_trace(path: Path) -> list[dict]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return data["traceEvents"] if isinstance(data, dict) else data
+
+
+def _main_thread(events: list[dict]) -> tuple[int, int] | None:
+    # The traced page's renderer is the CrRendererMain thread doing the most work
+    renderer_threads = {
+        (e["pid"], e["tid"]) for e in events
+        if e.get("ph") == "M" and e.get("name") == "thread_name" and e.get("args", {}).get("name") == "CrRendererMain"
+    }
+    busy: dict[tuple[int, int], float] = defaultdict(float)
+    for e in events:
+        key = (e.get("pid"), e.get("tid"))
+        if e.get("ph") == "X" and key in renderer_threads:
+            busy[key] += e.get("dur", 0)
+    return max(busy, key=busy.get) if busy else None
+
+
+def _node_ids(event: dict) -> list[int]:
+    args = event.get("args", {})
+    if event["name"] in PAINT_EVENTS:
+        node_id = args.get("data", {}).get("nodeId")
+        return [node_id] if node_id else []
+    roots = args.get("endData", {}).get("layoutRoots", [])
+    return [root["nodeId"] for root in roots if root.get("nodeId")]
+
+
+def trace_node_ids(events: list[dict]) -> set[int]:
+    """DOM node ids referenced by layout and paint events."""
+    ids: set[int] = set()
+    for e in events:
+        if e.get("ph") == "X" and e.get("name") in PAINT_EVENTS | LAYOUT_EVENTS:
+            ids.update(_node_ids(e))
+    return ids
+
+
+def _profile_costs(events: list[dict], thread: tuple[int, int]) -> tuple[dict[int, dict], dict[int, float]]:
+    """Merge the thread's CPU profile chunks into nodes and per-node self time (ms)."""
+    nodes: dict[int, dict] = {}
+    self_us: dict[int, float] = defaultdict(float)
+    for e in events:
+        if e.get("name") != "ProfileChunk" or e.get("pid") != thread[0]:
+            continue
+        data = e.get("args", {}).get("data", {})
+        profile = data.get("cpuProfile", {})
+        for node in profile.get("nodes", []):
+            nodes[node["id"]] = node
+        for node_id, delta in zip(profile.get("samples", []), data.get("timeDeltas", [])):
+            self_us[node_id] += max(delta, 0)
+    return nodes, {node_id: us / 1000 for node_id, us in self_us.items()}
+
+
+def main_thread_ms(events: list[dict], names: set[str]) -> float:
+    """Renderer main-thread time inside ``names`` slices; nested slices count once."""
+    thread = _main_thread(events)
+    if thread is None:
+        return 0.0
+    total = 0.0
+    open_until = -1.0
+    for e in sorted((e for e in events if e.get("ph") == "X" and (e.get("pid"), e.get("tid")) == thread
+                     and e.get("name") in names), key=lambda e: e["ts"]):
+        end = e["ts"] + e.get("dur", 0)
+        if end > open_until:
+            total += end - max(e["ts"], open_until)
+            open_until = end
+    return total / 1000
+
+
+def summarize(events: list[dict], node_sections: dict[int, str | None] | None = None, top: int = 15,
+              sources: SourceMaps | None = None) -> TraceSummary:
+    """Reduce a trace to main-thread costs per function and per component.
+
+    With ``sources``, frames in built chunks are attributed through the sourcemaps.
+    """
+    summary = TraceSummary()
+    thread = _main_thread(events)
+    if thread is None:
+        return summary
+    node_sections = node_sections or {}
+    components: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    # Only top-level slices count towards the main thread and script totals
+    open_until = script_until = -1.0
+    for e in sorted((e for e in events if e.get("ph") == "X" and (e.get("pid"), e.get("tid")) == thread), key=lambda e: e["ts"]):
+        dur_ms = e.get("dur", 0) / 1000
+        name = e["name"]
+        if e["ts"] >= open_until:
+            summary.main_thread_ms += dur_ms
+            open_until = e["ts"] + e.get("dur", 0)
+        if name in SCRIPT_EVENTS:
+            if e["ts"] >= script_until:
+                summary.script_ms += dur_ms
+                script_until = e["ts"] + e.get("dur", 0)
+        elif name in STYLE_EVENTS:
+            summary.style_ms += dur_ms
+        elif name in LAYOUT_EVENTS or name in PAINT_EVENTS:
+            kind = "layout" if name in LAYOUT_EVENTS else "paint"
+            setattr(summary, f"{kind}_ms", getattr(summary, f"{kind}_ms") + dur_ms)
+            ids = _node_ids(e)
+            owners = {component_for(node_sections.get(node_id)) for node_id in ids} or {"(page)"}
+            for owner in owners:
+                components[owner][kind] += dur_ms / len(owners)
+
+    nodes, self_ms = _profile_costs(events, thread)
+    per_function: dict[tuple[str, str], float] = defaultdict(float)
+    for node_id, ms in self_ms.items():
+        frame = nodes.get(node_id, {}).get("callFrame", {})
+        name = frame.get("functionName") or "(anonymous)"
+        if name == "(garbage collector)":
+            summary.gc_ms += ms
+            continue
+        if name in _PSEUDO_FRAMES:
+            continue
+        url = frame_url(frame, sources)
+        per_function[(name, url)] += ms
+        owner = None
+        cursor = node_id
+        while cursor is not None and owner is None:
+            match = _COMPONENT_URL.search(frame_url(nodes.get(cursor, {}).get("callFrame", {}), sources))
+            owner = match.group(1) if match else None
+            cursor = nodes.get(cursor, {}).get("parent")
+        components[owner or owner_of_url(url) or "(other js)"]["js"] += ms
+
+    summary.top_functions = [
+        FunctionCost(name, url, ms)
+        for (name, url), ms in sorted(per_function.items(), key=lambda item: -item[1])[:top]
+    ]
+    summary.components = {name: dict(costs) for name, costs in components.items()}
+    return summary
+
+
+class PageTrace:
+    """CDP trace of one page, started as soon as the object is created."""
+
+    def __init__(self, context: async_api.BrowserContext, page: async_api.Page,
+                 categories: list[str] = CATEGORIES):
+        self.context = context
+        self.page = page
+        self.categories = categories
+        self.cdp: async_api.CDPSession | None = None
+        self.started = asyncio.ensure_future(self._start())
+
+    async def _start(self) -> None:
+        self.cdp = await self.context.new_cdp_session(self.page)
+        await self.cdp.send(
+            "Tracing.start",
+            {"traceConfig": {"includedCategories": self.categories}, "transferMode": "ReturnAsStream"},
+        )
+
+    async def stop(self, path: Path) -> Path:
+        await self.started
+        assert self.cdp is not None
+        complete: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.cdp.on("Tracing.tracingComplete", lambda params: complete.done() or complete.set_result(params))
+        await self.cdp.send("Tracing.end")
+        stream = (await complete)["stream"]
+        with path.open("wb") as fh:
+            while True:
+                chunk = await self.cdp.send("IO.read", {"handle": stream})
+                data = chunk["data"]
+                fh.write(base64.b64decode(data) if chunk.get("base64Encoded") else data.encode("utf-8"))
+                if chunk.get("eof"):
+                    break
+        await self.cdp.send("IO.close", {"handle": stream})
+        return path
+
+    async def resolve_sections(self, node_ids: set[int]) -> dict[int, str | None]:
+        """Map backend DOM node ids to the id of their enclosing section."""
+        assert self.cdp is not None
+        sections: dict[int, str | None] = {}
+        await self.cdp.send("DOM.getDocument", {"depth": 0})
+        for node_id in node_ids:
+            try:
+                remote = await self.cdp.send("DOM.resolveNode", {"backendNodeId": node_id})
+                found = await self.cdp.send(
+                    "Runtime.callFunctionOn",
+                    {"objectId": remote["object"]["objectId"], "functionDeclaration": CLOSEST_SECTION_FUNCTION, "returnByValue": True},
+                )
+                sections[node_id] = found["result"].get("value")
+            except async_api.Error:
+                # Node was removed before the test finished
+                sections[node_id] = None
+        return sections
+
+
+class TraceRecorder:
+    """Runner plugin that traces the pages of every test it sees."""
+
+    def __init__(self, output_dir: Path, sources: SourceMaps | None = None):
+        self.output_dir = output_dir / "traces"
+        self.sources = sources or SourceMaps()
+        # Per test session, so the variants of one case keep their own pages
+        self._traces: dict[Any, list[PageTrace]] = defaultdict(list)
+
+    def install(self, runner: Any) -> None:
+        runner.context_hooks.append(self.on_context)
+        runner.finish_hooks.append(self.on_finish)
+
+    async def on_context(self, context: async_api.BrowserContext, session: Any) -> None:
+        traces = self._traces[session]
+        context.on("page", lambda page: traces.append(PageTrace(context, page)))
+
+    async def on_finish(self, session: Any, result: TestResult) -> None:
+        traces = self._traces.pop(session, [])
+        if not traces:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Scripts drive a single page; later pages are popups and are ignored
+        trace = traces[0]
+        for extra in traces[1:]:
+            extra.started.cancel()
+        try:
+            path = await trace.stop(self.output_dir / f"{result.test_id}.trace.json")
+            events = load_trace(path)
+            node_sections = await trace.resolve_sections(trace_node_ids(events))
+        except async_api.Error as exc:
+            result.metrics["trace_error"] = str(exc).splitlines()[0]
+            return
+        summary = summarize(events, node_sections, sources=self.sources)
+        summary_path = self.output_dir / f"{result.test_id}.summary.json"
+        summary_path.write_text(json.dumps(summary.to_dict(), indent=2), encoding="utf-8")
+        result.artifacts.extend([str(path), str(summary_path)])
+        result.metrics["trace"] = summary.to_dict()
@@ -0,0 +1,486 @@
+"""Visual regression checks: per-section screenshots against stored baselines.
+
+The animation tests (TC004 hero, TC006 feature cards) assert on text the
+page never renders, so they pass or fail for the wrong reasons.  ``visual``
+gives pixel evidence instead: every section is parked in the viewport at
+every breakpoint, its reveal animations are allowed to finish and it is
+captured over CDP.  Comparing one capture against its baseline is
+
+* free when the PNG bytes are identical (baselines are addressed by
+  their SHA-256, so that is a hash lookup);
+* otherwise a vectorised decode into NumPy arrays plus a structural
+  similarity (SSIM) score of the luma channel for every ``TILE``-pixel
+  tile whose pixels differ at all.
+  Tiles under ``SSIM_THRESHOLD`` are changes, merged into boxes and
+  painted red onto a diff image.
+
+Tiles over known-animated regions are masked out: elements matching
+``ANIMATED_SELECTORS`` (Tailwind ``animate-*`` utilities, canvases), plus
+whatever differs between two captures taken ``PROBE_MS`` apart, which
+catches ``framer-motion`` loops the selectors cannot name.
+
+Captures ask Chromium for its fast PNG encoding (``optimizeForSpeed``),
+whose cheap scanline filters decode as whole-array operations; the
+Average and Paeth filters, which depend on the pixel to their left, are
+decoded pixel by pixel.  Baselines are committed with the tests, in
+``BASELINE_DIR`` (``testsprite_tests/visual_baselines``): PNG objects under
+``objects/`` named by hash and ``index.json`` mapping
+``section@WIDTHxHEIGHT`` to a hash.  Diff images are reports and go to
+``<output-dir>/visual/diffs``.  Needs the optional ``numpy`` package.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import struct
+import time
+import zlib
+from base64 import b64decode
+from dataclasses import dataclass, field
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from playwright import async_api
+
+from .config import TESTS_DIR, HarnessConfig
+from .idle import PARK_SCRIPT
+from .pool import consent_storage_state
+from .sections import component_for, nav_section_ids
+from .snapshot import ANIMATIONS_DONE_SCRIPT
+
+# Tracked with the tests, so every checkout compares against the same captures
+BASELINE_DIR = TESTS_DIR / "visual_baselines"
+
+# Width x height of the viewports every section is captured at
+BREAKPOINTS: dict[str, tuple[int, int]] = {
+    "mobile": (390, 844),
+    "tablet": (768, 1024),
+    "desktop": (1280, 720),
+}
+
+TILE = 16
+SSIM_THRESHOLD = 0.98
+# Gap between the two captures whose differences are masked as animated
+PROBE_MS = 400
+
+# Elements that never hold still
+ANIMATED_SELECTORS = (
+    ".animate-ping", ".animate-pulse", ".animate-spin", ".animate-spin-slow", ".animate-marquee",
+    ".animate-gradient", ".animate-glow-pulse", ".animate-glow-pulse-amber", "canvas", "video",
+)
+
+# Page rect of a section and, relative to it, the rects of animated elements inside
+REGIONS_SCRIPT = """
+([id, selectors]) => {
+  const section = document.getElementById(id);
+  if (!section) return null;
+  const box = section.getBoundingClientRect();
+  const rect = (r) => ({ x: r.x - box.x, y: r.y - box.y, width: r.width, height: r.height });
+  const masks = [];
+  for (const element of section.querySelectorAll(selectors.join(','))) masks.push(rect(element.getBoundingClientRect()));
+  for (const animation of document.getAnimations()) {
+    const target = animation.effect && animation.effect.target;
+    const timing = animation.effect && animation.effect.getComputedTiming();
+    if (target && section.contains(target) && timing && timing.iterations === Infinity) {
+      masks.push(rect(target.getBoundingClientRect()));
+    }
+  }
+  return {
+    section: { x: box.x + window.scrollX, y: box.y + window.scrollY, width: box.width, height: box.height },
+    masks,
+  };
+}
+"""
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Samples per pixel by PNG colour type (8-bit only)
+_CHANNELS = {0: 1, 2: 3, 4: 2, 6: 4}
+
+_C1 = (0.01 * 255) ** 2
+_C2 = (0.03 * 255) ** 2
+
+
+def require_numpy() -> None:
+    """Raise ``RuntimeError`` when the optional ``numpy`` package is missing."""
+    if np is None:
+        raise RuntimeError("visual comparison needs numpy: pip install numpy")
+
+
+# -- PNG --------------------------------------------------------------------
+
+
+def decode_png(data: bytes) -> "np.ndarray":
+    """Pixels of an 8-bit, non-interlaced PNG as a (height, width, channels) uint8 array."""
+    require_numpy()
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("not a PNG")
+    offset = len(PNG_SIGNATURE)
+    idat = []
+    width = height = channels = 0
+    while offset < len(data):
+        length, kind = struct.unpack(">I4s", data[offset:offset + 8])
+        body = data[offset + 8:offset + 8 + length]
+        offset += 12 + length
+        if kind == b"IHDR":
+            width, height, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", body)
+            if depth != 8 or color not in _CHANNELS or interlace:
+                raise ValueError(f"unsupported PNG: depth {depth}, colour type {color}, interlace {interlace}")
+            channels = _CHANNELS[color]
+        elif kind == b"IDAT":
+            idat.append(body)
+        elif kind == b"IEND":
+            break
+    stride = width * channels
+    raw = np.frombuffer(zlib.decompress(b"".join(idat)), dtype=np.uint8).reshape(height, stride + 1)
+    filters = raw[:, 0]
+    rows = raw[:, 1:]
+    out = np.empty((height, stride), dtype=np.uint8)
+    row = 0
+    while row < height:
+        kind = filters[row]
+        if kind in (0, 1):
+            # A run of None/Sub rows needs nothing from the row above
+            end = row + 1
+            while end < height and filters[end] in (0, 1):
+                end += 1
+            block = rows[row:end].reshape(end - row, width, channels).copy()
+            sub = filters[row:end] == 1
+            if sub.all():
+                np.cumsum(block, axis=1, dtype=np.uint8, out=block)
+            elif sub.any():
+                block[sub] = np.cumsum(block[sub], axis=1, dtype=np.uint8)
+            out[row:end] = block.reshape(end - row, stride)
+            row = end
+            continue
+        previous = out[row - 1] if row else np.zeros(stride, dtype=np.uint8)
+        if kind == 2:
+            out[row] = rows[row] + previous
+        elif kind in (3, 4):
+            out[row] = _unfilter_sequential(kind, rows[row], previous, channels)
+        else:
+            raise ValueError(f"bad PNG filter type {kind} in row {row}")
+        row += 1
+    return out.reshape(height, width, channels)
+
+
+def _unfilter_sequential(kind: int, line: "np.ndarray", previous: "np.ndarray", channels: int) -> "np.ndarray":
+    # Average and Paeth: each pixel depends on the decoded one to its left
+    line = line.astype(np.int16).reshape(-1, channels)
+    up = previous.astype(np.int16).reshape(-1, channels)
+    out = np.zeros_like(line)
+    left = np.zeros(channels, dtype=np.int16)
+    upper_left = np.zeros(channels, dtype=np.int16)
+    for x in range(line.shape[0]):
+        if kind == 3:
+            predicted = (left + up[x]) >> 1
+        else:
+            estimate = left + up[x] - upper_left
+            pa, pb, pc = np.abs(estimate - left), np.abs(estimate - up[x]), np.abs(estimate - upper_left)
+            predicted = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up[x], upper_left))
+        out[x] = (line[x] + predicted) & 0xFF
+        left, upper_left = out[x], up[x]
+    return out.astype(np.uint8).reshape(-1)
+
+
+def encode_png(pixels: "np.ndarray") -> bytes:
+    """An RGB or RGBA uint8 array as a PNG (no filtering)."""
+    require_numpy()
+    height, width, channels = pixels.shape
+    color = {3: 2, 4: 6}[channels]
+    raw = np.concatenate([np.zeros((height, 1), dtype=np.uint8), pixels.reshape(height, -1)], axis=1)
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color, 0, 0, 0)
+    return PNG_SIGNATURE + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw.tobytes(), 1)) + chunk(b"IEND", b"")
+
+
+def luma(pixels: "np.ndarray") -> "np.ndarray":
+    """Rec. 601 luma of ``[..., channels]`` pixels as float32; alpha is ignored."""
+    if pixels.shape[-1] < 3:
+        return pixels[..., 0].astype(np.float32)
+    return pixels[..., :3].astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+# -- comparison -------------------------------------------------------------
+
+
+def _blocks(pixels: "np.ndarray", tile: int) -> "np.ndarray":
+    # (rows, cols, tile, tile, channels) view, the last row/column padded by repetition
+    height, width = pixels.shape[:2]
+    rows, cols = -(-height // tile), -(-width // tile)
+    if rows * tile != height or cols * tile != width:
+        pixels = np.pad(pixels, ((0, rows * tile - height), (0, cols * tile - width), (0, 0)), mode="edge")
+    return pixels.reshape(rows, tile, cols, tile, pixels.shape[2]).swapaxes(1, 2)
+
+
+def block_ssim(a: "np.ndarray", b: "np.ndarray") -> "np.ndarray":
+    """SSIM of each (tile, tile) luma block in two (n, tile, tile) stacks."""
+    mean_a, mean_b = a.mean(axis=(1, 2)), b.mean(axis=(1, 2))
+    var_a = (a * a).mean(axis=(1, 2)) - mean_a ** 2
+    var_b = (b * b).mean(axis=(1, 2)) - mean_b ** 2
+    cov = (a * b).mean(axis=(1, 2)) - mean_a * mean_b
+    return ((2 * mean_a * mean_b + _C1) * (2 * cov + _C2)) / ((mean_a ** 2 + mean_b ** 2 + _C1) * (var_a + var_b + _C2))
+
+
+def tile_scores(before: "np.ndarray", after: "np.ndarray", tile: int = TILE) -> "np.ndarray":
+    """Per-tile SSIM of two same-sized images; tiles with equal pixels score 1 without computing it."""
+    a, b = _blocks(before, tile), _blocks(after, tile)
+    touched = (a != b).any(axis=(2, 3, 4))
+    scores = np.ones(touched.shape, dtype=np.float32)
+    if touched.any():
+        scores[touched] = block_ssim(luma(a[touched]), luma(b[touched]))
+    return scores
+
+
+def tile_mask(shape: tuple[int, int], rects: list[dict], tile: int = TILE) -> "np.ndarray":
+    """Tiles of a ``shape`` image that any of ``rects`` overlaps."""
+    rows, cols = -(-shape[0] // tile), -(-shape[1] // tile)
+    mask = np.zeros((rows, cols), dtype=bool)
+    for rect in rects:
+        top, left = max(0, int(rect["y"] // tile)), max(0, int(rect["x"] // tile))
+        bottom = min(rows, int(-(-(rect["y"] + rect["height"]) // tile)))
+        right = min(cols, int(-(-(rect["x"] + rect["width"]) // tile)))
+        if bottom > top and right > left:
+            mask[top:bottom, left:right] = True
+    return mask
+
+
+def changed_boxes(changed: "np.ndarray", tile: int = TILE) -> list[tuple[int, int, int, int]]:
+    """Connected groups of changed tiles as pixel boxes (x, y, width, height)."""
+    seen = np.zeros_like(changed)
+    boxes = []
+    for row, col in zip(*np.nonzero(changed)):
+        if seen[row, col]:
+            continue
+        seen[row, col] = True
+        stack, cells = [(row, col)], []
+        while stack:
+            r, c = stack.pop()
+            cells.append((r, c))
+            for nr, nc in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+                if 0 <= nr < changed.shape[0] and 0 <= nc < changed.shape[1] and changed[nr, nc] and not seen[nr, nc]:
+                    seen[nr, nc] = True
+                    stack.append((nr, nc))
+        rs, cs = [r for r, _ in cells], [c for _, c in cells]
+        boxes.append((int(min(cs)) * tile, int(min(rs)) * tile,
+                      int(max(cs) - min(cs) + 1) * tile, int(max(rs) - min(rs) + 1) * tile))
+    return boxes
+
+
+@dataclass
+class Comparison:
+    key: str
+    identical: bool = False
+    size_changed: bool = False
+    min_ssim: float = 1.0
+    changed_tiles: int = 0
+    masked_tiles: int = 0
+    boxes: list[tuple[int, int, int, int]] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+    diff_png: bytes = b""
+    # No baseline to compare with: the capture was stored as one
+    new_baseline: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.size_changed and not self.changed_tiles
+
+
+def compare(key: str, baseline: bytes, current: bytes, masks: list[dict] | None = None,
+            extra_mask: "np.ndarray | None" = None) -> Comparison:
+    """Per-tile SSIM of ``current`` against ``baseline`` outside the masked tiles."""
+    started = time.perf_counter()
+    if baseline == current:
+        return Comparison(key, identical=True, elapsed_ms=(time.perf_counter() - started) * 1000)
+    require_numpy()
+    before, after = decode_png(baseline), decode_png(current)
+    result = Comparison(key, size_changed=before.shape[:2] != after.shape[:2])
+    height, width = min(before.shape[0], after.shape[0]), min(before.shape[1], after.shape[1])
+    channels = min(before.shape[2], after.shape[2])
+    scores = tile_scores(before[:height, :width, :channels], after[:height, :width, :channels])
+    masked = tile_mask((height, width), masks or [])
+    if extra_mask is not None:
+        masked |= extra_mask[:masked.shape[0], :masked.shape[1]]
+    changed = (scores < SSIM_THRESHOLD) & ~masked
+    result.min_ssim = float(scores[~masked].min()) if (~masked).any() else 1.0
+    result.changed_tiles = int(changed.sum())
+    result.masked_tiles = int(masked.sum())
+    result.boxes = changed_boxes(changed)
+    result.elapsed_ms = (time.perf_counter() - started) * 1000
+    if result.changed_tiles:
+        result.diff_png = encode_png(_overlay(after[:height, :width], changed, masked, result.boxes))
+    return result
+
+
+def _overlay(pixels: "np.ndarray", changed: "np.ndarray", masked: "np.ndarray",
+             boxes: list[tuple[int, int, int, int]], margin: int = 4 * TILE) -> "np.ndarray":
+    # The changed part of the capture, dimmed, with changed tiles in red and masked ones in blue
+    top = max(0, min(y for _, y, _, _ in boxes) - margin)
+    bottom = min(pixels.shape[0], max(y + h for _, y, _, h in boxes) + margin)
+    rgb = pixels[top:bottom, :, :3] if pixels.shape[2] >= 3 else np.repeat(pixels[top:bottom, :, :1], 3, axis=2)
+    out = (rgb.astype(np.float32) * 0.5).astype(np.uint8)
+    height, width = out.shape[:2]
+    for grid, color in ((masked, (0, 0, 160)), (changed, (255, 0, 0))):
+        full = np.repeat(np.repeat(grid, TILE, axis=0), TILE, axis=1)[top:bottom][:height, :width]
+        out[full] = (out[full] * 0.4 + np.array(color) * 0.6).astype(np.uint8)
+    return out
+
+
+# -- baselines --------------------------------------------------------------
+
+
+class BaselineStore:
+    """Content-addressed PNG baselines keyed by ``section@WIDTHxHEIGHT``."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.index_path = root / "index.json"
+        self.index: dict[str, str] = json.loads(self.index_path.read_text()) if self.index_path.exists() else {}
+
+    def _object(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.png"
+
+    def get(self, key: str) -> bytes | None:
+        digest = self.index.get(key)
+        if digest is None or not self._object(digest).exists():
+            return None
+        return self._object(digest).read_bytes()
+
+    def put(self, key: str, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        self.index[key] = digest
+        return digest
+
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_path.write_text(json.dumps(self.index, indent=1, sort_keys=True), encoding="utf-8")
+        # Objects no key points at any more
+        live = set(self.index.values())
+        for path in (self.root / "objects").glob("*/*.png"):
+            if path.stem not in live:
+                path.unlink()
+
+
+# -- capture ----------------------------------------------------------------
+
+
+@dataclass
+class Capture:
+    key: str
+    png: bytes
+    masks: list[dict]
+    # Tiles that moved between the two probe captures
+    volatile: "np.ndarray | None" = None
+
+
+async def _screenshot(cdp: async_api.CDPSession, clip: dict) -> bytes:
+    shot = await cdp.send("Page.captureScreenshot", {
+        "format": "png",
+        "clip": {**clip, "scale": 1},
+        "captureBeyondViewport": True,
+        "optimizeForSpeed": True,
+    })
+    return b64decode(shot["data"])
+
+
+async def capture_sections(browser: async_api.Browser, url: str, sections: list[str],
+                           breakpoints: dict[str, tuple[int, int]], settle_ms: float = 800) -> tuple[list[Capture], list[str]]:
+    """Captures of ``sections`` at every breakpoint, plus the sections the page does not have."""
+    captures: list[Capture] = []
+    missing: list[str] = []
+    for width, height in breakpoints.values():
+        context = await browser.new_context(
+            viewport={"width": width, "height": height},
+            storage_state=consent_storage_state([url]),
+        )
+        try:
+            page = await context.new_page()
+            cdp = await context.new_cdp_session(page)
+            await page.goto(url, wait_until="load")
+            for section in sections:
+                if not await page.evaluate(PARK_SCRIPT, section):
+                    if section not in missing:
+                        missing.append(section)
+                    continue
+                await page.evaluate(ANIMATIONS_DONE_SCRIPT, settle_ms * 3)
+                await page.wait_for_timeout(settle_ms)
+                regions = await page.evaluate(REGIONS_SCRIPT, [section, list(ANIMATED_SELECTORS)])
+                if regions is None or not regions["section"]["height"]:
+                    continue
+                first = await _screenshot(cdp, regions["section"])
+                await page.wait_for_timeout(PROBE_MS)
+                second = await _screenshot(cdp, regions["section"])
+                volatile = None
+                if first != second and np is not None:
+                    before, after = decode_png(first), decode_png(second)
+                    if before.shape == after.shape:
+                        volatile = tile_scores(before, after) < SSIM_THRESHOLD
+                captures.append(Capture(f"{section}@{width}x{height}", second, regions["masks"], volatile))
+        finally:
+            await context.close()
+    return captures, missing
+
+
+async def collect(config: HarnessConfig, sections: list[str] | None,
+                  breakpoints: dict[str, tuple[int, int]]) -> tuple[list[Capture], list[str]]:
+    """Launch a browser and capture ``sections`` (default: the nav targets plus the hero)."""
+    sections = sections or ["main-content", *nav_section_ids()]
+    async with async_api.async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=config.headless, args=config.browser_args)
+        try:
+            return await capture_sections(browser, config.base_url, sections, breakpoints)
+        finally:
+            await browser.close()
+
+
+def check(captures: list[Capture], store: BaselineStore, diff_dir: Path, update: bool = False) -> list[Comparison]:
+    """Compare ``captures`` with their baselines; new keys (or all, with ``update``) become baselines."""
+    require_numpy()
+    results = []
+    for capture in captures:
+        started = time.perf_counter()
+        if not update and store.index.get(capture.key) == hashlib.sha256(capture.png).hexdigest():
+            results.append(Comparison(capture.key, identical=True, elapsed_ms=(time.perf_counter() - started) * 1000))
+            continue
+        baseline = None if update else store.get(capture.key)
+        if baseline is None:
+            store.put(capture.key, capture.png)
+            results.append(Comparison(capture.key, new_baseline=True, elapsed_ms=(time.perf_counter() - started) * 1000))
+            continue
+        result = compare(capture.key, baseline, capture.png, capture.masks, capture.volatile)
+        if result.diff_png:
+            diff_dir.mkdir(parents=True, exist_ok=True)
+            (diff_dir / f"{capture.key}.png").write_bytes(result.diff_png)
+        results.append(result)
+    store.save()
+    return results
+
+
+def format_table(results: list[Comparison]) -> str:
+    lines = [f"{'capture':<30}{'component':<20}{'min SSIM':>10}{'changed':>9}{'masked':>8}{'ms':>8}  result"]
+    for result in sorted(results, key=lambda result: (result.ok, result.key)):
+        section = result.key.split("@", 1)[0]
+        if result.new_baseline:
+            verdict = "new baseline"
+        elif result.identical:
+            verdict = "same bytes"
+        else:
+            verdict = "ok" if result.ok else "size changed" if result.size_changed else "CHANGED"
+        lines.append(
+            f"{result.key:<30}{component_for(section):<20}{result.min_ssim:>10.3f}{result.changed_tiles:>9}"
+            f"{result.masked_tiles:>8}{result.elapsed_ms:>8.1f}  {verdict}"
+        )
+        for x, y, width, height in result.boxes[:5]:
+            lines.append(f"    changed region {width}x{height} at ({x}, {y})")
+    return "\n".join(lines)
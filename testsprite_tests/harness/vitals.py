@@ -0,0 +1,217 @@
+"""Core Web Vitals benchmark over the landing page.
+
+Each sample is one page load in a fresh page.  ``cold`` samples use a new
+browser context per load (empty HTTP cache and storage); ``warm`` samples
+reuse one context that has already loaded the page once.  After the load
+settles, a short scripted interaction sequence (cookie banner, FAQ toggle,
+keyboard focus) feeds the Event Timing API so INP can be estimated.
+
+Samples are stored in the run history and compared with the baseline run
+(the latest run marked ``--set-baseline``, else the previous run).  A
+metric regresses when its shift is statistically significant *and* larger
+than a minimum relative change; see ``stats.compare``.
+"""
+
+from __future__ import annotations
+
+import statistics
+import urllib.error
+import urllib.request
+
+from playwright import async_api
+
+from .config import RECORDED_BASE_URL, HarnessConfig
+from .stats import Comparison, compare
+
+MODES = ("cold", "warm")
+
+# Lower is better for every metric
+METRICS = ("fcp_ms", "lcp_ms", "cls", "inp_ms", "tbt_ms", "js_heap_bytes", "transfer_bytes")
+
+# Installed before any page script runs so no entry is missed
+VITALS_INIT_SCRIPT = """
+(() => {
+  const state = { fcp: 0, lcp: 0, cls: 0, longTasks: [], interactions: new Map() };
+  const observe = (type, sink, options = {}) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(sink))
+        .observe({ type, buffered: true, ...options });
+    } catch (error) {
+      // Entry type not supported by this engine
+    }
+  };
+  observe('paint', (entry) => { if (entry.name === 'first-contentful-paint') state.fcp = entry.startTime; });
+  observe('largest-contentful-paint', (entry) => { state.lcp = entry.startTime; });
+  observe('layout-shift', (entry) => { if (!entry.hadRecentInput) state.cls += entry.value; });
+  observe('longtask', (entry) => state.longTasks.push({ start: entry.startTime, duration: entry.duration }));
+  observe('event', (entry) => {
+    if (!entry.interactionId) return;
+    const previous = state.interactions.get(entry.interactionId) || 0;
+    state.interactions.set(entry.interactionId, Math.max(previous, entry.duration));
+  }, { durationThreshold: 16 });
+  window.__leadqVitals = {
+    load() {
+      const blocking = state.longTasks
+        .filter((task) => task.start >= state.fcp)
+        .reduce((total, task) => total + Math.max(0, task.duration - 50), 0);
+      const resources = performance.getEntriesByType('resource');
+      const navigation = performance.getEntriesByType('navigation')[0];
+      const transferred = resources.reduce((total, entry) => total + (entry.transferSize || 0),
+        navigation ? navigation.transferSize || 0 : 0);
+      return { fcp_ms: state.fcp, lcp_ms: state.lcp, cls: state.cls, tbt_ms: blocking, transfer_bytes: transferred };
+    },
+    inp() {
+      const durations = [...state.interactions.values()].sort((a, b) => b - a);
+      // With fewer than 50 interactions INP is the worst one
+      return durations.length ? durations[0] : 0;
+    },
+  };
+})();
+"""
+
+
+async def _interact(page: async_api.Page) -> None:
+    """Scripted interactions that exercise the page's main input handlers."""
+    accept = page.get_by_role("button", name="Accept All")
+    try:
+        await accept.click(timeout=2000)
+    except async_api.Error:
+        # Banner already dismissed in this context
+        pass
+    question = page.locator("#faq button").first
+    await question.scroll_into_view_if_needed()
+    await question.click()
+    await question.click()
+    await page.keyboard.press("Tab")
+
+
+async def measure_load(context: async_api.BrowserContext, url: str, settle_ms: int = 2000) -> dict[str, float]:
+    """Load ``url`` in a new page of ``context`` and return one vitals sample."""
+    page = await context.new_page()
+    try:
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Performance.enable")
+        await page.goto(url, wait_until="load")
+        # Fixed quiet window: late LCP candidates and post-load long tasks count
+        await page.wait_for_timeout(settle_ms)
+        sample = await page.evaluate("window.__leadqVitals.load()")
+        await _interact(page)
+        await page.wait_for_timeout(300)
+        sample["inp_ms"] = await page.evaluate("window.__leadqVitals.inp()")
+        metrics = {m["name"]: m["value"] for m in (await cdp.send("Performance.getMetrics"))["metrics"]}
+        sample["js_heap_bytes"] = metrics.get("JSHeapUsedSize", 0)
+        return sample
+    finally:
+        await page.close()
+
+
+async def _new_context(browser: async_api.Browser) -> async_api.BrowserContext:
+    context = await browser.new_context(viewport={"width": 1280, "height": 720})
+    await context.add_init_script(VITALS_INIT_SCRIPT)
+    return context
+
+
+async def run_vitals(
+    browser: async_api.Browser,
+    targets: dict[str, str],
+    runs: int,
+    modes: tuple[str, ...] = MODES,
+) -> dict[str, dict[str, list[float]]]:
+    """Collect ``runs`` samples per target and mode, keyed ``"<target>/<mode>"``."""
+    samples: dict[str, dict[str, list[float]]] = {}
+    for name, url in targets.items():
+        for mode in modes:
+            series: dict[str, list[float]] = {metric: [] for metric in METRICS}
+            warm_context = None
+            if mode == "warm":
+                warm_context = await _new_context(browser)
+                # Prime the HTTP cache and localStorage; not recorded
+                await measure_load(warm_context, url)
+            for _ in range(runs):
+                context = warm_context or await _new_context(browser)
+                try:
+                    sample = await measure_load(context, url)
+                finally:
+                    if warm_context is None:
+                        await context.close()
+                for metric in METRICS:
+                    series[metric].append(float(sample.get(metric, 0)))
+            if warm_context is not None:
+                await warm_context.close()
+            samples[f"{name}/{mode}"] = series
+    return samples
+
+
+async def collect(config: HarnessConfig, targets: dict[str, str], runs: int,
+                  modes: tuple[str, ...] = MODES) -> dict[str, dict[str, list[float]]]:
+    """Launch a browser and run the benchmark against ``targets``."""
+    async with async_api.async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=config.headless, args=config.browser_args)
+        try:
+            return await run_vitals(browser, targets, runs, modes)
+        finally:
+            await browser.close()
+
+
+def reachable(url: str, timeout: float = 2.0) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=timeout):
+            return True
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+def default_targets(config: HarnessConfig) -> dict[str, str]:
+    # ``config.base_url`` is the harness-served build unless overridden
+    return {"dev": RECORDED_BASE_URL, "preview": config.base_url}
+
+
+def compare_runs(
+    baseline: dict[str, dict[str, list[float]]],
+    current: dict[str, dict[str, list[float]]],
+    z_threshold: float,
+    min_relative_change: float,
+) -> dict[str, list[Comparison]]:
+    """Compare every target/metric present in both runs."""
+    report: dict[str, list[Comparison]] = {}
+    for target, metrics in current.items():
+        base_metrics = baseline.get(target, {})
+        report[target] = [
+            compare(metric, base_metrics.get(metric, []), values, z_threshold, min_relative_change)
+            for metric, values in metrics.items()
+        ]
+    return report
+
+
+def format_samples(samples: dict[str, dict[str, list[float]]]) -> str:
+    lines = [f"{'target':<16}" + "".join(f"{metric:>16}" for metric in METRICS)]
+    for target, metrics in samples.items():
+        row = "".join(f"{statistics.median(metrics[m]) if metrics.get(m) else 0:16.2f}" for m in METRICS)
+        lines.append(f"{target:<16}{row}")
+    return "\n".join(lines)
+
+
+def format_medians(samples: dict[str, dict[str, list[float]]], metrics: tuple[str, ...]) -> str:
+    """Median per metric and target, with the change of the last target against the first."""
+    names = list(samples)
+    width = max(len(metric) for metric in metrics) + 2
+    lines = [f"{'metric':<{width}}" + "".join(f"{name:>16}" for name in names)]
+    for metric in metrics:
+        medians = [statistics.median(samples[name][metric]) for name in names]
+        precise = metric.endswith("cls")
+        row = f"{metric:<{width}}" + "".join(f"{value:16.3f}" if precise else f"{value:16.0f}" for value in medians)
+        if len(names) > 1 and medians[0]:
+            row += f"   {100 * (medians[-1] - medians[0]) / medians[0]:+.1f}%"
+        lines.append(row)
+    return "\n".join(lines)
+
+
+def summarize_regressions(report: dict[str, list[Comparison]]) -> tuple[str, bool]:
+    lines = []
+    regressed = False
+    for target, comparisons in report.items():
+        lines.append(target)
+        for comparison in comparisons:
+            lines.append("  " + comparison.describe())
+            regressed = regressed or comparison.regressed
+    return "\n".join(lines), regressed
@@ -2,6 +2,9 @@ import { defineConfig } from 'vite';
 import react from '@vitejs/plugin-react';
 import path from 'path';
 
+// Set by testsprite_tests/harness when it builds dist/ for its own analysis
+const analyze = process.env.LEADQ_ANALYZE === '1';
+
 // https://vitejs.dev/config/
 export default defineConfig({
   plugins: [react()],
@@ -13,4 +16,7 @@ export default defineConfig({
   optimizeDeps: {
     exclude: ['lucide-react'],
   },
+  // The manifest and hidden sourcemaps are read by the harness (bundle.py,
+  // impact.py) and never ship in a plain `npm run build`
+  build: analyze ? { manifest: true, sourcemap: 'hidden' } : {},
 });